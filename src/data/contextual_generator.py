@@ -0,0 +1,173 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.data.distributions import DISTRIBUTIONS
+
+
+class ContextualRewardGenerator:
+    """
+    Class to generate contexts and context-dependent rewards for a contextual bandit problem.
+
+    Example config:
+        features:
+          channel: {values: [web, app, phone], probs: [0.5, 0.3, 0.2]}
+          tier: {values: [free, gold], probs: [0.8, 0.2]}
+          session_length: {distribution: lognormal, params: [0.0, 0.5]}
+        model: logistic
+        arms:
+          Blue bot: {intercept: 0.8, weights: {channel=app: 0.3, tier=gold: -0.2}}
+          Red bot: {intercept: 0.6, weights: {session_length: 0.1}}
+    """
+
+    def __init__(self, config: Dict[str, Any], seed: int = 42) -> None:
+        """
+        Initialize the ContextualRewardGenerator.
+
+        Args:
+            config: A dictionary with the context 'features', the reward 'model' ('linear'
+                or 'logistic'), the 'noise' standard deviation of the linear model and the
+                'arms'. Categorical features are given by their 'values' and 'probs' and are
+                one-hot encoded as 'feature=value' columns; numeric features are given by a
+                'distribution' and 'params' from the distribution registry. Every arm has an
+                'intercept' and 'weights' per column, missing weights are zero.
+            seed: An integer seed for the random number generator for reproducibility.
+
+        Raises:
+            ValueError: If the reward model is not supported.
+            ValueError: If an arm has a weight for an unknown feature column.
+        """
+        self.features: Dict[str, Dict[str, Any]] = config["features"]
+        self.model: str = config.get("model", "linear")
+        if self.model not in ("linear", "logistic"):
+            raise ValueError(f"Unsupported reward model: '{self.model}'")
+        self.noise: float = config.get("noise", 0.0)
+        self.arm_configs: Dict[str, Dict[str, Any]] = config["arms"]
+        self.arm_ids: List[str] = list(self.arm_configs.keys())
+        self.seed: int = seed
+
+        # separate streams for contexts, arms picked in trials and reward noise
+        context_seed, arm_seed, reward_seed = np.random.SeedSequence(seed).spawn(3)
+        self.context_rng: np.random.Generator = np.random.default_rng(context_seed)
+        self.rng: np.random.Generator = np.random.default_rng(arm_seed)
+        self.reward_rng: np.random.Generator = np.random.default_rng(reward_seed)
+
+        self.feature_names: List[str] = []
+        for name, feature in self.features.items():
+            if "values" in feature:
+                self.feature_names.extend(f"{name}={value}" for value in feature["values"])
+            else:
+                self.feature_names.append(name)
+
+        column: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self.intercepts: np.ndarray = np.zeros(len(self.arm_ids))
+        self.weights: np.ndarray = np.zeros((len(self.arm_ids), len(self.feature_names)))
+        for code, arm_config in enumerate(self.arm_configs.values()):
+            self.intercepts[code] = arm_config.get("intercept", 0.0)
+            for name, weight in arm_config.get("weights", {}).items():
+                if name not in column:
+                    raise ValueError(f"Unknown feature column: '{name}'")
+                self.weights[code, column[name]] = weight
+
+    def sample_contexts(self, n: int) -> np.ndarray:
+        """
+        Draw a matrix of contexts.
+
+        Args:
+            n: The number of contexts to draw.
+
+        Returns:
+            np.ndarray: An array of shape (n, number of feature columns).
+        """
+        contexts = np.zeros((n, len(self.feature_names)))
+        offset = 0
+        for feature in self.features.values():
+            if "values" in feature:
+                codes = self.context_rng.choice(len(feature["values"]), p=feature["probs"], size=n)
+                contexts[np.arange(n), offset + codes] = 1.0
+                offset += len(feature["values"])
+            else:
+                distribution = DISTRIBUTIONS[feature["distribution"]]
+                contexts[:, offset] = distribution.sample(
+                    self.context_rng, *feature.get("params", []), size=n
+                )
+                offset += 1
+        return contexts
+
+    def expected_rewards(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Compute the expected reward of every arm for every context.
+
+        Args:
+            contexts: An array of shape (n, number of feature columns).
+
+        Returns:
+            np.ndarray: An array of shape (n, number of arms).
+        """
+        scores = contexts @ self.weights.T + self.intercepts
+        if self.model == "logistic":
+            return 1 / (1 + np.exp(-scores))
+        return scores
+
+    def best_arm(self, contexts: np.ndarray) -> np.ndarray:
+        """
+        Return the oracle arm for every context.
+
+        Args:
+            contexts: An array of shape (n, number of feature columns).
+
+        Returns:
+            np.ndarray: The codes (indices into arm_ids) of the best arms.
+        """
+        return np.argmax(self.expected_rewards(contexts), axis=1)
+
+    def rewards(self, contexts: np.ndarray, arm_codes: np.ndarray) -> np.ndarray:
+        """
+        Draw the rewards of the given arms for the given contexts.
+
+        Args:
+            contexts: An array of shape (n, number of feature columns).
+            arm_codes: The codes (indices into arm_ids) of the arms pulled, one per context.
+
+        Returns:
+            np.ndarray: An array of n rewards.
+        """
+        arm_codes = np.asarray(arm_codes)
+        means = np.einsum("ij,ij->i", contexts, self.weights[arm_codes])
+        means += self.intercepts[arm_codes]
+        if self.model == "logistic":
+            return self.reward_rng.binomial(1, 1 / (1 + np.exp(-means))).astype(float)
+        return np.round(means + self.reward_rng.normal(0, self.noise, size=len(means)), 4)
+
+    def pull_arm(self, arm_id: str, context: np.ndarray) -> float:
+        """
+        Pull an arm of the bandit for a single context and return the reward.
+
+        Args:
+            arm_id: The identifier of the arm to pull.
+            context: A single context of shape (number of feature columns,).
+
+        Returns:
+            float: The reward generated by pulling the arm.
+
+        Raises:
+            ValueError: If the arm ID is not found in the configuration.
+        """
+        if arm_id not in self.arm_configs:
+            raise ValueError(f"Arm '{arm_id}' not found in configuration")
+        return float(self.rewards(np.atleast_2d(context), [self.arm_ids.index(arm_id)])[0])
+
+    def generate_trials(self, num_trials: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Generate trials with uniformly random arms, e.g. for exploration or offline evaluation.
+
+        Args:
+            num_trials: The number of trials to generate.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: The contexts, the codes of the arms
+            pulled (indices into arm_ids) and the corresponding rewards.
+        """
+        contexts = self.sample_contexts(num_trials)
+        arm_codes = self.rng.integers(len(self.arm_ids), size=num_trials)
+        return contexts, arm_codes, self.rewards(contexts, arm_codes)
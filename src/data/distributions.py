@@ -0,0 +1,194 @@
+from typing import Any, Callable, Dict, List, Sequence
+
+import numpy as np
+
+
+class Distribution:
+    """
+    Reward distribution with a vectorized sampler and analytic moments.
+
+    Samplers are called as sampler(rng, *params, size=n) and, like the moment functions,
+    broadcast over array-valued parameters.
+    """
+
+    def __init__(
+        self,
+        sampler: Callable[..., np.ndarray],
+        mean: Callable[..., Any],
+        variance: Callable[..., Any],
+        param_names: List[str],
+        default_params: List[Any],
+    ) -> None:
+        """
+        Initialize the Distribution.
+
+        Args:
+            sampler: Function drawing an array of samples, called as sampler(rng, *params, size=n).
+            mean: Function returning the analytic mean for the given parameters.
+            variance: Function returning the analytic variance for the given parameters.
+            param_names: Human readable names of the parameters, in order.
+            default_params: Parameters used when none are configured.
+        """
+        self.sampler = sampler
+        self.mean = mean
+        self.variance = variance
+        self.param_names = param_names
+        self.default_params = default_params
+
+    def sample(self, rng: np.random.Generator, *params: Any, size: int) -> np.ndarray:
+        """
+        Draw samples from the distribution.
+
+        Args:
+            rng: The random number generator to draw from.
+            *params: The parameters of the distribution.
+            size: The number of samples to draw.
+
+        Returns:
+            np.ndarray: An array of samples.
+        """
+        return self.sampler(rng, *params, size=size)
+
+
+def _sample_categorical(
+    rng: np.random.Generator, values: Sequence[float], probs: Sequence[float], size: int
+) -> np.ndarray:
+    return np.asarray(values, dtype=float)[rng.choice(len(values), p=probs, size=size)]
+
+
+def _categorical_mean(values: Sequence[float], probs: Sequence[float]) -> float:
+    return float(np.dot(values, probs))
+
+
+def _categorical_variance(values: Sequence[float], probs: Sequence[float]) -> float:
+    values = np.asarray(values, dtype=float)
+    return float(np.dot(values**2, probs) - np.dot(values, probs) ** 2)
+
+
+def _sample_mixture(
+    rng: np.random.Generator,
+    components: List[Dict[str, Any]],
+    weights: Sequence[float],
+    size: int,
+) -> np.ndarray:
+    component_codes = rng.choice(len(components), p=weights, size=size)
+    samples = np.empty(size)
+    for code, component in enumerate(components):
+        mask = component_codes == code
+        samples[mask] = DISTRIBUTIONS[component["distribution"]].sample(
+            rng, *component.get("params", []), size=int(mask.sum())
+        )
+    return samples
+
+
+def _mixture_moments(components: List[Dict[str, Any]], weights: Sequence[float]) -> np.ndarray:
+    moments = []
+    for component in components:
+        distribution = DISTRIBUTIONS[component["distribution"]]
+        params = component.get("params", [])
+        moments.append([distribution.mean(*params), distribution.variance(*params)])
+    return np.asarray(moments, dtype=float)
+
+
+def _mixture_mean(components: List[Dict[str, Any]], weights: Sequence[float]) -> float:
+    means = _mixture_moments(components, weights)[:, 0]
+    return float(np.dot(weights, means))
+
+
+def _mixture_variance(components: List[Dict[str, Any]], weights: Sequence[float]) -> float:
+    means, variances = _mixture_moments(components, weights).T
+    mean = np.dot(weights, means)
+    return float(np.dot(weights, variances + means**2) - mean**2)
+
+
+DISTRIBUTIONS: Dict[str, Distribution] = {
+    "gauss": Distribution(
+        sampler=np.random.Generator.normal,
+        mean=lambda mu, sigma: mu,
+        variance=lambda mu, sigma: np.square(sigma),
+        param_names=["Mean", "Standard Deviation"],
+        default_params=[0.7, 0.05],
+    ),
+    "uniform": Distribution(
+        sampler=np.random.Generator.uniform,
+        mean=lambda low, high: (np.add(low, high)) / 2,
+        variance=lambda low, high: np.square(np.subtract(high, low)) / 12,
+        param_names=["Lower Bound", "Upper Bound"],
+        default_params=[0.6, 0.75],
+    ),
+    "bernoulli": Distribution(
+        sampler=lambda rng, p, size: rng.binomial(1, p, size=size).astype(float),
+        mean=lambda p: p,
+        variance=lambda p: np.multiply(p, np.subtract(1, p)),
+        param_names=["Success Probability"],
+        default_params=[0.7],
+    ),
+    "beta": Distribution(
+        sampler=np.random.Generator.beta,
+        mean=lambda a, b: np.divide(a, np.add(a, b)),
+        variance=lambda a, b: np.multiply(a, b)
+        / (np.square(np.add(a, b)) * (np.add(a, b) + 1)),
+        param_names=["Alpha", "Beta"],
+        default_params=[7.0, 3.0],
+    ),
+    "binomial": Distribution(
+        sampler=lambda rng, n, p, size: rng.binomial(n, p, size=size).astype(float),
+        mean=lambda n, p: np.multiply(n, p),
+        variance=lambda n, p: np.multiply(n, p) * np.subtract(1, p),
+        param_names=["Number of Trials", "Success Probability"],
+        default_params=[10, 0.7],
+    ),
+    "lognormal": Distribution(
+        sampler=np.random.Generator.lognormal,
+        mean=lambda mu, sigma: np.exp(np.add(mu, np.square(sigma) / 2)),
+        variance=lambda mu, sigma: np.expm1(np.square(sigma))
+        * np.exp(2 * np.asarray(mu) + np.square(sigma)),
+        param_names=["Log Mean", "Log Standard Deviation"],
+        default_params=[-0.36, 0.1],
+    ),
+    "poisson": Distribution(
+        sampler=lambda rng, lam, size: rng.poisson(lam, size=size).astype(float),
+        mean=lambda lam: lam,
+        variance=lambda lam: lam,
+        param_names=["Rate"],
+        default_params=[3.0],
+    ),
+    # ratings (e.g. 1-5 stars or a 0-10 NPS scale) given as values and their probabilities
+    "categorical": Distribution(
+        sampler=_sample_categorical,
+        mean=_categorical_mean,
+        variance=_categorical_variance,
+        param_names=["Values", "Probabilities"],
+        default_params=[[1, 2, 3, 4, 5], [0.05, 0.1, 0.2, 0.35, 0.3]],
+    ),
+    # components are arm-like configs, e.g. {"distribution": "gauss", "params": [0.7, 0.05]}
+    "mixture": Distribution(
+        sampler=_sample_mixture,
+        mean=_mixture_mean,
+        variance=_mixture_variance,
+        param_names=["Components", "Weights"],
+        default_params=[
+            [
+                {"distribution": "gauss", "params": [0.6, 0.05]},
+                {"distribution": "gauss", "params": [0.8, 0.05]},
+            ],
+            [0.5, 0.5],
+        ],
+    ),
+}
+
+
+def register_distribution(name: str, distribution: Distribution) -> None:
+    """
+    Add a distribution to the registry so it can be used in arm configurations.
+
+    Args:
+        name: The name arm configurations refer to.
+        distribution: The distribution to register.
+
+    Raises:
+        ValueError: If a distribution with this name is already registered.
+    """
+    if name in DISTRIBUTIONS:
+        raise ValueError(f"Distribution '{name}' is already registered")
+    DISTRIBUTIONS[name] = distribution
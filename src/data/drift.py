@@ -0,0 +1,138 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class DriftSchedule:
+    """
+    Class to materialize time-varying parameters of an arm.
+
+    The schedule starts from the static parameters of the arm and applies a list of drifts,
+    each one changing a single parameter:
+
+        - linear: adds slope * round.
+        - step: from each of the given rounds on, the parameter takes the matching value.
+        - sine: adds amplitude * sin(2 * pi * round / period + phase).
+        - random_walk: adds the cumulative sum of gaussian increments with the given scale.
+
+    Every drift may also clip the parameter to bounds [low, high]. Parameters are computed
+    for whole chunks of rounds at once, so sampling with them stays vectorized.
+
+    Example:
+        drift:
+          - {type: sine, param: 0, amplitude: 0.05, period: 1000}
+          - {type: step, param: 0, rounds: [5000], values: [0.6], bounds: [0, 1]}
+    """
+
+    drift_types = ("linear", "step", "sine", "random_walk")
+
+    def __init__(
+        self,
+        params: List[Any],
+        drifts: List[Dict[str, Any]],
+        seed_sequence: np.random.SeedSequence,
+        chunk_size: int = 65536,
+    ) -> None:
+        """
+        Initialize the DriftSchedule.
+
+        Args:
+            params: The static parameters of the arm.
+            drifts: The drift specifications, applied in the given order.
+            seed_sequence: Seed for the increments of random walks.
+            chunk_size: The number of rounds materialized at a time.
+
+        Raises:
+            ValueError: If a drift type is not supported or the arm has a non-scalar
+                parameter, e.g. the values of an empirical distribution.
+        """
+        for drift in drifts:
+            if drift["type"] not in self.drift_types:
+                raise ValueError(f"Unsupported drift: '{drift['type']}'")
+        non_scalar = [index for index, param in enumerate(params) if not np.isscalar(param)]
+        if non_scalar:
+            raise ValueError(
+                f"Drift is only supported for arms with scalar parameters, "
+                f"parameter {non_scalar[0]} is not a scalar"
+            )
+
+        self.params: np.ndarray = np.asarray(params, dtype=float)
+        self.drifts: List[Dict[str, Any]] = drifts
+        self.seed_sequence: np.random.SeedSequence = seed_sequence
+        self.chunk_size: int = chunk_size
+        # random walk level at the start of each materialized chunk, per drift
+        self.walk_levels: Dict[int, List[float]] = {
+            i: [0.0] for i, drift in enumerate(drifts) if drift["type"] == "random_walk"
+        }
+        self.chunk_cache: Dict[int, np.ndarray] = {}
+
+    def _walk_increments(self, drift_index: int, chunk: int) -> np.ndarray:
+        """
+        Draw the random walk increments of one chunk, reproducible for any query order.
+        """
+        rng = np.random.default_rng(
+            [self.seed_sequence.entropy, *self.seed_sequence.spawn_key, drift_index, chunk]
+        )
+        return rng.normal(0, self.drifts[drift_index]["scale"], size=self.chunk_size)
+
+    def _walk_level(self, drift_index: int, chunk: int) -> float:
+        """
+        Return the random walk level at the start of a chunk, extending the levels if needed.
+        """
+        levels = self.walk_levels[drift_index]
+        while len(levels) <= chunk:
+            levels.append(levels[-1] + self._walk_increments(drift_index, len(levels) - 1).sum())
+        return levels[chunk]
+
+    def _materialize(self, chunk: int) -> np.ndarray:
+        """
+        Compute the parameters of all rounds of a chunk.
+
+        Args:
+            chunk: The index of the chunk.
+
+        Returns:
+            np.ndarray: An array of shape (number of parameters, chunk_size).
+        """
+        rounds = np.arange(chunk * self.chunk_size, (chunk + 1) * self.chunk_size)
+        values = np.repeat(self.params[:, None], self.chunk_size, axis=1)
+
+        for i, drift in enumerate(self.drifts):
+            row = values[drift["param"]]
+            if drift["type"] == "linear":
+                row += drift["slope"] * rounds
+            elif drift["type"] == "step":
+                step = np.searchsorted(drift["rounds"], rounds, side="right")
+                step_values = np.concatenate([[np.nan], drift["values"]])[step]
+                row[:] = np.where(step > 0, step_values, row)
+            elif drift["type"] == "sine":
+                row += drift["amplitude"] * np.sin(
+                    2 * np.pi * rounds / drift["period"] + drift.get("phase", 0)
+                )
+            elif drift["type"] == "random_walk":
+                row += self._walk_level(i, chunk) + np.cumsum(self._walk_increments(i, chunk))
+            if "bounds" in drift:
+                np.clip(row, *drift["bounds"], out=row)
+
+        return values
+
+    def params_at(self, rounds: np.ndarray) -> List[np.ndarray]:
+        """
+        Return the parameters at the given rounds.
+
+        Args:
+            rounds: The rounds to query.
+
+        Returns:
+            List[np.ndarray]: One array per parameter, aligned with rounds.
+        """
+        rounds = np.asarray(rounds, dtype=np.int64)
+        values = np.empty((len(self.params), len(rounds)))
+        chunks = rounds // self.chunk_size
+        for chunk in np.unique(chunks):
+            if chunk not in self.chunk_cache:
+                # keep only the latest chunk, so memory does not grow with the horizon
+                self.chunk_cache = {chunk: self._materialize(chunk)}
+            mask = chunks == chunk
+            values[:, mask] = self.chunk_cache[chunk][:, rounds[mask] % self.chunk_size]
+        return list(values)
@@ -0,0 +1,361 @@
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+class LogReplayRewardSource:
+    """
+    Class to replay logged production decisions with the interface of RewardGenerator.
+
+    The log is read chunk by chunk: .npy files (structured arrays) through a memory map,
+    .parquet files through pyarrow record batches and .csv files through the chunked
+    pandas reader, so logs far larger than memory can be replayed.
+
+    Trials (generate_trials, iter_trials) replay the logged events in their order. Pulls of
+    an arm (pull_arm, sample) replay the logged rewards of that arm; every arm has its own
+    cursor into the log, so only one chunk per cursor is held in memory.
+
+    Every logged event is replayed at most once: the cursors share the positions of the
+    events in the log. Trials skip the events that pulls of their arm already replayed,
+    and pulls skip the events before the position up to which trials were replayed. A
+    looped replay gives the events of every pass new positions.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        arm_ids: List[str],
+        arm_column: str = "arm",
+        reward_column: str = "reward",
+        timestamp_column: Optional[str] = None,
+        context_columns: Optional[List[str]] = None,
+        chunk_size: int = 100000,
+        loop: bool = True,
+    ) -> None:
+        """
+        Initialize the LogReplayRewardSource.
+
+        Args:
+            path: The path to the .npy, .parquet or .csv event log.
+            arm_ids: The identifiers of the arms to replay; events of other arms are skipped.
+            arm_column: The column with the arm of each decision.
+            reward_column: The column with the reward of each decision.
+            timestamp_column: The optional column with the time of each decision, not read
+                if None.
+            context_columns: The optional columns with the context of each decision.
+            chunk_size: The number of events read from the log at a time.
+            loop: Whether to restart from the beginning once the log is exhausted.
+
+        Raises:
+            ValueError: If the file format is not supported.
+        """
+        self.path: Path = Path(path)
+        if self.path.suffix not in (".npy", ".parquet", ".csv"):
+            raise ValueError(f"Unsupported log format: '{self.path.suffix}'")
+
+        self.arm_ids: List[str] = list(arm_ids)
+        # arms have no distribution, the log is their source of rewards
+        self.arm_configs: Dict[str, Dict[str, Any]] = {arm_id: {} for arm_id in self.arm_ids}
+        self.arm_column: str = arm_column
+        self.reward_column: str = reward_column
+        self.timestamp_column: Optional[str] = timestamp_column
+        self.context_columns: List[str] = context_columns or []
+        self.chunk_size: int = chunk_size
+        self.loop: bool = loop
+
+        # cursors into the log: None replays all events, an arm ID only the events of that arm
+        self.cursors: Dict[Optional[str], Iterator[Dict[str, np.ndarray]]] = {}
+        self.leftovers: Dict[Optional[str], Dict[str, np.ndarray]] = {}
+        # positions consumed so far: all events before the position of the trials, and per
+        # arm every event of that arm up to its last replayed position
+        self.trial_position: int = 0
+        self.arm_positions: Dict[str, int] = {arm_id: -1 for arm_id in self.arm_ids}
+        self.round: int = 0
+
+    @property
+    def columns(self) -> List[str]:
+        """
+        The columns read from the log.
+        """
+        columns = [self.arm_column, self.reward_column, *self.context_columns]
+        if self.timestamp_column:
+            columns.append(self.timestamp_column)
+        return columns
+
+    def _read_chunks(self) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Read the log once, chunk by chunk.
+
+        Yields:
+            Dict[str, np.ndarray]: The columns of the next chunk.
+        """
+        if self.path.suffix == ".npy":
+            log = np.load(self.path, mmap_mode="r")
+            for start in range(0, len(log), self.chunk_size):
+                chunk = log[start : start + self.chunk_size]
+                yield {column: np.asarray(chunk[column]) for column in self.columns}
+        elif self.path.suffix == ".parquet":
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(self.path).iter_batches(
+                batch_size=self.chunk_size, columns=self.columns
+            )
+            for batch in batches:
+                yield {
+                    column: batch.column(column).to_numpy(zero_copy_only=False)
+                    for column in self.columns
+                }
+        else:
+            for frame in pd.read_csv(self.path, usecols=self.columns, chunksize=self.chunk_size):
+                yield {column: frame[column].to_numpy() for column in self.columns}
+
+    def _replay(self, arm_id: Optional[str]) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Replay the events of the configured arms (or of a single arm), looping if enabled.
+
+        Args:
+            arm_id: The arm to replay, or None for all configured arms.
+
+        Yields:
+            Dict[str, np.ndarray]: The columns of the next chunk of events, with the arm
+            column replaced by arm codes (indices into arm_ids), and the positions of the
+            events in the (looped) log under the key 'position'.
+
+        Raises:
+            ValueError: If the log holds no events to replay.
+        """
+        position = 0
+        while True:
+            replayed = 0
+            for chunk in self._read_chunks():
+                codes = pd.Categorical(chunk[self.arm_column], categories=self.arm_ids).codes
+                keep = codes >= 0 if arm_id is None else codes == self.arm_ids.index(arm_id)
+                if keep.any():
+                    events = {column: values[keep] for column, values in chunk.items()}
+                    events[self.arm_column] = codes[keep].astype(np.int64)
+                    events["position"] = position + np.flatnonzero(keep)
+                    replayed += int(keep.sum())
+                    yield events
+                position += len(codes)
+            if not self.loop:
+                return
+            if not replayed:
+                raise ValueError(f"No events to replay in '{self.path}'")
+
+    def _unconsumed(
+        self, arm_id: Optional[str], events: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Drop the events another cursor already replayed.
+        """
+        if arm_id is None:
+            last = np.array([self.arm_positions[arm] for arm in self.arm_ids])
+            keep = events["position"] > last[events[self.arm_column]]
+        else:
+            keep = events["position"] >= self.trial_position
+        if keep.all():
+            return events
+        return {column: values[keep] for column, values in events.items()}
+
+    def _take(self, arm_id: Optional[str], n: int) -> Dict[str, np.ndarray]:
+        """
+        Take the next n events from a cursor that no other cursor replayed yet.
+
+        Args:
+            arm_id: The arm whose cursor is used, or None for the cursor over all events.
+            n: The number of events.
+
+        Returns:
+            Dict[str, np.ndarray]: The columns of the events.
+
+        Raises:
+            ValueError: If the log is exhausted and loop is disabled.
+        """
+        if arm_id not in self.cursors:
+            self.cursors[arm_id] = self._replay(arm_id)
+
+        pieces: List[Dict[str, np.ndarray]] = []
+        taken = 0
+        leftover = self.leftovers.pop(arm_id, None)
+        while taken < n:
+            if leftover is None:
+                leftover = next(self.cursors[arm_id], None)
+                if leftover is None:
+                    raise ValueError(f"Event log '{self.path}' is exhausted")
+            leftover = self._unconsumed(arm_id, leftover)
+            size = len(leftover[self.reward_column])
+            if not size:
+                leftover = None
+                continue
+            needed = n - taken
+            pieces.append({column: values[:needed] for column, values in leftover.items()})
+            taken += min(size, needed)
+            leftover = (
+                {column: values[needed:] for column, values in leftover.items()}
+                if size > needed
+                else None
+            )
+        if leftover is not None:
+            self.leftovers[arm_id] = leftover
+
+        if not pieces:
+            events = {column: np.empty(0) for column in self.columns}
+            events[self.arm_column] = np.empty(0, dtype=np.int64)
+            return events
+        last_position = int(pieces[-1]["position"][-1])
+        if arm_id is None:
+            self.trial_position = last_position + 1
+        else:
+            self.arm_positions[arm_id] = last_position
+        return {
+            column: np.concatenate([piece[column] for piece in pieces]) for column in self.columns
+        }
+
+    def sample(self, arm_id: str, n: int) -> np.ndarray:
+        """
+        Replay the next n logged rewards of an arm.
+
+        Args:
+            arm_id: The identifier of the arm to pull.
+            n: The number of rewards to replay.
+
+        Returns:
+            np.ndarray: An array of n rewards.
+
+        Raises:
+            ValueError: If the arm ID is not found in the configuration.
+        """
+        if arm_id not in self.arm_configs:
+            raise ValueError(f"Arm '{arm_id}' not found in configuration")
+        return self._take(arm_id, n)[self.reward_column].astype(float)
+
+    def pull_arm(self, arm_id: str) -> float:
+        """
+        Replay the next logged reward of an arm.
+
+        Args:
+            arm_id: The identifier of the arm to pull.
+
+        Returns:
+            float: The reward generated by pulling the arm.
+        """
+        reward = float(self.sample(arm_id, 1)[0])
+        self.round += 1
+        return reward
+
+    def pull_arms(self, arm_ids: List[str]) -> np.ndarray:
+        """
+        Pull a sequence of arms, one per round, and return the rewards.
+
+        The pulls are grouped by arm, so every arm draws its rewards in a single batch.
+
+        Args:
+            arm_ids: The identifiers of the arms to pull, in the order of the rounds.
+
+        Returns:
+            np.ndarray: The reward of every pull.
+
+        Raises:
+            ValueError: If an arm ID is not found in the configuration.
+        """
+        if not set(arm_ids) <= set(self.arm_configs):
+            unknown = next(arm_id for arm_id in arm_ids if arm_id not in self.arm_configs)
+            raise ValueError(f"Arm '{unknown}' not found in configuration")
+
+        # a plain lookup, cheap for the short sequences of sequential strategies as well
+        index = {arm_id: code for code, arm_id in enumerate(self.arm_ids)}
+        arm_codes = np.fromiter((index[arm_id] for arm_id in arm_ids), int, len(arm_ids))
+        rewards = np.empty(len(arm_codes))
+        for code, arm_id in enumerate(self.arm_ids):
+            mask = arm_codes == code
+            if mask.any():
+                rewards[mask] = self.sample(arm_id, int(mask.sum()))
+        self.round += len(arm_codes)
+        return rewards
+
+    def pull_arm_n_times(self, arm_id: str, n_times: int) -> List[float]:
+        """
+        Replay the next logged rewards of an arm.
+
+        Args:
+            arm_id: The identifier of the arm to pull multiple times.
+            n_times: The number of times to pull the arm.
+
+        Returns:
+            List[float]: A list of rewards obtained from pulling the arm.
+        """
+        rewards = self.sample(arm_id, n_times).tolist()
+        self.round += n_times
+        return rewards
+
+    def next_events(self, n: int) -> Dict[str, np.ndarray]:
+        """
+        Replay the next n logged events with all their columns, including the timestamps
+        and contexts if configured.
+
+        Args:
+            n: The number of events.
+
+        Returns:
+            Dict[str, np.ndarray]: The columns of the events, arms given as codes.
+        """
+        events = self._take(None, n)
+        self.round += n
+        return events
+
+    def generate_trial_arrays(
+        self, num_trials: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """
+        Replay the next logged events as integer-coded arrays.
+
+        Args:
+            num_trials: The number of trials to replay.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]: The trial numbers, the codes
+            of the arms pulled, the corresponding rewards and the table mapping an arm code
+            to its identifier.
+        """
+        events = self.next_events(num_trials)
+        rewards = events[self.reward_column].astype(float)
+        return np.arange(num_trials), events[self.arm_column], rewards, list(self.arm_ids)
+
+    def generate_trials(self, num_trials: int) -> Tuple[List[int], List[str], List[float]]:
+        """
+        Replay the next logged events.
+
+        Args:
+            num_trials: The number of trials to replay.
+
+        Returns:
+            Tuple[List[int], List[str], List[float]]: Three lists, one containing the trial numbers,
+            one containing the arms pulled, and the other containing the corresponding rewards.
+        """
+        rounds, arm_codes, rewards, arm_ids = self.generate_trial_arrays(num_trials)
+        arms_pulled: np.ndarray = np.array(arm_ids, dtype=object)[arm_codes]
+
+        return rounds.tolist(), arms_pulled.tolist(), rewards.tolist()
+
+    def iter_trials(
+        self, num_trials: Optional[int] = None, chunk_size: int = 10000
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Lazily replay logged events in fixed-size chunks with constant memory.
+
+        Args:
+            num_trials: The total number of trials to replay. None replays without end.
+            chunk_size: The number of trials per chunk; the last chunk may be shorter.
+
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: The codes of the arms pulled (indices into arm_ids)
+            and the corresponding rewards.
+        """
+        remaining: float = np.inf if num_trials is None else num_trials
+        while remaining > 0:
+            size = int(min(chunk_size, remaining))
+            _, arm_codes, rewards, _ = self.generate_trial_arrays(size)
+            remaining -= size
+            yield arm_codes, rewards
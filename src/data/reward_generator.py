@@ -1,9 +1,11 @@
-import random
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
+from src.data.distributions import DISTRIBUTIONS, Distribution
+from src.data.drift import DriftSchedule
+
 
 class RewardGenerator:
     """
@@ -11,7 +13,12 @@ class RewardGenerator:
     """
 
     def __init__(
-        self, config: Dict[str, Dict[str, Any]], seed: int = 42, data: pd.Series = None
+        self,
+        config: Dict[str, Dict[str, Any]],
+        seed: int = 42,
+        data: pd.Series = None,
+        bootstrap_size: int = 100,
+        bank_size: int = 4096,
     ) -> None:
         """
         Initialize the RewardGenerator.
@@ -19,29 +26,95 @@ class RewardGenerator:
         Args:
             config: A dictionary containing configurations for each arm.
                 Each key is the arm identifier, and the value is a dictionary
-                containing 'distribution' and 'params' for that arm.
+                containing 'distribution' and 'params' for that arm and optionally
+                'drift', a list of time-varying changes of the params (see DriftSchedule).
             seed: An integer seed for the random number generator for reproducibility.
+                Every arm gets its own stream spawned from SeedSequence(seed), so rewards
+                of one arm do not depend on how often the other arms were pulled.
+            data: Optional empirical rewards. If given, every pull of an arm returns the mean
+                of a bootstrap sample of this data instead of a draw from its distribution.
+            bootstrap_size: The size of a bootstrap sample in the empirical mode.
+            bank_size: The number of bootstrap means precomputed per arm at a time
+                in the empirical mode.
         """
         self.arm_configs: Dict[str, Dict[str, Any]] = config
+        self.arm_ids: List[str] = list(config.keys())
         self.seed: int = seed
         self.data = data
-        random.seed(self.seed)
-        np.random.seed(self.seed)  # To ensure np.round also follows the same seed
-        self.distributions: Dict[str, Any] = {
-            "gauss": random.gauss,
-            "uniform": random.uniform,
-            # Add more distribution functions here as needed
+        self.bootstrap_size: int = bootstrap_size
+        self.bank_size: int = bank_size
+        if self.data is not None:
+            # contiguous copy of the data and per-arm banks of precomputed bootstrap means
+            self.data_values: np.ndarray = np.ascontiguousarray(self.data, dtype=float)
+            self.reward_banks: Dict[str, np.ndarray] = {arm_id: np.empty(0) for arm_id in config}
+            self.bank_positions: Dict[str, int] = dict.fromkeys(config, 0)
+        # first child stream picks arms for trials, the next ones belong to the arms
+        # and the last ones drive the random walks of their drift schedules
+        seed_sequences = np.random.SeedSequence(self.seed).spawn(2 * len(self.arm_configs) + 1)
+        self.rng: np.random.Generator = np.random.default_rng(seed_sequences[0])
+        self.arm_rngs: Dict[str, np.random.Generator] = {
+            arm_id: np.random.default_rng(seed_sequence)
+            for arm_id, seed_sequence in zip(self.arm_configs, seed_sequences[1:])
+        }
+        self.schedules: Dict[str, DriftSchedule] = {
+            arm_id: DriftSchedule(arm_config.get("params", []), arm_config["drift"], seed_sequence)
+            for (arm_id, arm_config), seed_sequence in zip(
+                self.arm_configs.items(), seed_sequences[len(self.arm_configs) + 1 :]
+            )
+            if arm_config.get("drift")
         }
+        # round of the next trial, drifting parameters are evaluated at it
+        self.round: int = 0
+        # register new distributions in src.data.distributions
+        self.distributions: Dict[str, Distribution] = DISTRIBUTIONS
 
-    def pull_arm(self, arm_id: str) -> float:
+    def sample(self, arm_id: str, n: int, rounds: Optional[np.ndarray] = None) -> np.ndarray:
         """
-        Pull an arm of the bandit and return the reward.
+        Pull an arm of the bandit n times at once and return the rewards.
+
+        A low-level draw: it does not advance the round, so repeated calls of drifting
+        arms sample the same rounds again. The pull methods (pull_arm, pull_arms,
+        pull_arm_n_times, iter_arm) advance it.
 
         Args:
             arm_id: The identifier of the arm to pull.
+            n: The number of rewards to draw.
+            rounds: The rounds of the pulls, used by drifting arms. Defaults to
+                the n rounds starting at the current round.
 
         Returns:
-            float: The reward generated by pulling the arm.
+            np.ndarray: An array of n rewards generated by pulling the arm.
+
+        Raises:
+            ValueError: If the arm ID is not found in the configuration.
+            ValueError: If the specified distribution is not supported.
+        """
+        if arm_id not in self.arm_configs:
+            raise ValueError(f"Arm '{arm_id}' not found in configuration")
+
+        if self.data is not None:
+            return self._sample_empirical(arm_id, n)
+
+        distribution: Distribution = self._get_distribution(arm_id)
+        params: List[Any] = self.arm_configs[arm_id].get("params", [])
+        if arm_id in self.schedules:
+            if rounds is None:
+                rounds = np.arange(self.round, self.round + n)
+            params = self.schedules[arm_id].params_at(rounds)
+        rewards: np.ndarray = np.round(
+            distribution.sample(self.arm_rngs[arm_id], *params, size=n), 4
+        )
+        return rewards
+
+    def _get_distribution(self, arm_id: str) -> Distribution:
+        """
+        Look up the distribution configured for an arm.
+
+        Args:
+            arm_id: The identifier of the arm.
+
+        Returns:
+            Distribution: The registered distribution of the arm.
 
         Raises:
             ValueError: If the arm ID is not found in the configuration.
@@ -50,23 +123,177 @@ class RewardGenerator:
         if arm_id not in self.arm_configs:
             raise ValueError(f"Arm '{arm_id}' not found in configuration")
 
-        arm_config: Dict[str, Any] = self.arm_configs[arm_id]
-        distribution_name: str = arm_config["distribution"]
+        distribution_name: str = self.arm_configs[arm_id]["distribution"]
         if distribution_name not in self.distributions:
             raise ValueError(f"Unsupported distribution: '{distribution_name}'")
+        return self.distributions[distribution_name]
+
+    def arm_mean(self, arm_id: str) -> float:
+        """
+        Return the analytic expected reward of an arm.
+
+        Args:
+            arm_id: The identifier of the arm.
+
+        Returns:
+            float: The expected reward of the arm.
+        """
+        if self.data is not None:
+            return float(np.mean(self.data_values))
+
+        params: List[Any] = self.arm_configs[arm_id].get("params", [])
+        return float(self._get_distribution(arm_id).mean(*params))
+
+    def arm_variance(self, arm_id: str) -> float:
+        """
+        Return the analytic variance of the reward of an arm.
+
+        Args:
+            arm_id: The identifier of the arm.
+
+        Returns:
+            float: The variance of the reward of the arm.
+        """
+        if self.data is not None:
+            return float(np.var(self.data_values) / self.bootstrap_size)
+
+        params: List[Any] = self.arm_configs[arm_id].get("params", [])
+        return float(self._get_distribution(arm_id).variance(*params))
+
+    def best_arm(self) -> str:
+        """
+        Return the oracle arm, i.e. the arm with the highest expected reward.
+
+        Returns:
+            str: The identifier of the best arm.
+        """
+        return max(self.arm_ids, key=self.arm_mean)
+
+    def arm_means_at(self, rounds: np.ndarray) -> np.ndarray:
+        """
+        Return the analytic expected rewards of all arms at the given rounds.
+
+        Args:
+            rounds: The rounds to query.
+
+        Returns:
+            np.ndarray: An array of shape (number of arms, number of rounds).
+        """
+        rounds = np.asarray(rounds)
+        means = np.empty((len(self.arm_ids), len(rounds)))
+        for code, arm_id in enumerate(self.arm_ids):
+            if arm_id in self.schedules:
+                params = self.schedules[arm_id].params_at(rounds)
+                means[code] = self._get_distribution(arm_id).mean(*params)
+            else:
+                means[code] = self.arm_mean(arm_id)
+        return means
+
+    def best_arm_at(self, rounds: np.ndarray) -> np.ndarray:
+        """
+        Return the oracle arm at each of the given rounds.
+
+        Args:
+            rounds: The rounds to query.
+
+        Returns:
+            np.ndarray: The codes (indices into arm_ids) of the best arms.
+        """
+        return np.argmax(self.arm_means_at(rounds), axis=0)
+
+    def _sample_empirical(self, arm_id: str, n: int) -> np.ndarray:
+        """
+        Serve n bootstrap means of the data from the bank of an arm, refilling it if needed.
+
+        Args:
+            arm_id: The identifier of the arm to pull.
+            n: The number of rewards to draw.
 
-        distribution_function: Any = self.distributions[distribution_name]
-        params: List[Any] = arm_config.get("params", [])
-        reward: float = np.round(distribution_function(*params), 4)
-        if isinstance(self.data, pd.Series):
-            reward = np.round(
-                np.mean(self.data.sample(n=100, replace=True, random_state=self.seed)), 4
+        Returns:
+            np.ndarray: An array of n rewards generated by pulling the arm.
+        """
+        bank: np.ndarray = self.reward_banks[arm_id]
+        position: int = self.bank_positions[arm_id]
+        if len(bank) - position < n:
+            bank = np.concatenate([bank[position:], self._fill_bank(arm_id, n)])
+            position = 0
+            self.reward_banks[arm_id] = bank
+
+        self.bank_positions[arm_id] = position + n
+        return bank[position : position + n].copy()
+
+    def _fill_bank(self, arm_id: str, n: int) -> np.ndarray:
+        """
+        Precompute at least n bootstrap means of the data in chunks of bank_size.
+
+        Args:
+            arm_id: The identifier of the arm whose random stream is used.
+            n: The minimal number of bootstrap means to compute.
+
+        Returns:
+            np.ndarray: An array of rounded bootstrap means.
+        """
+        rng: np.random.Generator = self.arm_rngs[arm_id]
+        num_chunks: int = max(-(-n // self.bank_size), 1)
+        chunks: List[np.ndarray] = []
+        for _ in range(num_chunks):
+            indices = rng.integers(
+                len(self.data_values), size=(self.bank_size, self.bootstrap_size)
             )
+            chunks.append(np.round(self.data_values[indices].mean(axis=1), 4))
+        return np.concatenate(chunks)
+
+    def pull_arm(self, arm_id: str) -> float:
+        """
+        Pull an arm of the bandit and return the reward.
+
+        Args:
+            arm_id: The identifier of the arm to pull.
+
+        Returns:
+            float: The reward generated by pulling the arm.
+
+        Raises:
+            ValueError: If the arm ID is not found in the configuration.
+            ValueError: If the specified distribution is not supported.
+        """
+        reward = float(self.sample(arm_id, 1)[0])
+        self.round += 1
         return reward
 
+    def pull_arms(self, arm_ids: List[str]) -> np.ndarray:
+        """
+        Pull a sequence of arms, one per round, and return the rewards.
+
+        The pulls are grouped by arm, so every arm draws its rewards in a single batch.
+
+        Args:
+            arm_ids: The identifiers of the arms to pull, in the order of the rounds.
+
+        Returns:
+            np.ndarray: The reward of every pull.
+
+        Raises:
+            ValueError: If an arm ID is not found in the configuration.
+        """
+        if not set(arm_ids) <= set(self.arm_configs):
+            unknown = next(arm_id for arm_id in arm_ids if arm_id not in self.arm_configs)
+            raise ValueError(f"Arm '{unknown}' not found in configuration")
+
+        # a plain lookup, cheap for the short sequences of sequential strategies as well
+        index = {arm_id: code for code, arm_id in enumerate(self.arm_ids)}
+        arm_codes = np.fromiter((index[arm_id] for arm_id in arm_ids), int, len(arm_ids))
+        rewards = np.empty(len(arm_codes))
+        for code, arm_id in enumerate(self.arm_ids):
+            positions = np.flatnonzero(arm_codes == code)
+            if len(positions):
+                rewards[positions] = self.sample(arm_id, len(positions), self.round + positions)
+        self.round += len(arm_codes)
+        return rewards
+
     def pull_arm_n_times(self, arm_id: str, n_times: int) -> List[float]:
         """
-        Pull a given arm multiple times and return the rewards obtained.
+        Pull a given arm multiple times, one pull per round, and return the rewards obtained.
 
         Args:
             arm_id: The identifier of the arm to pull multiple times.
@@ -78,15 +305,47 @@ class RewardGenerator:
         Raises:
             ValueError: If the arm ID is not found in the configuration.
         """
-        if arm_id not in self.arm_configs:
-            raise ValueError(f"Arm '{arm_id}' not found in configuration")
+        rewards = self.sample(arm_id, n_times).tolist()
+        self.round += n_times
+        return rewards
 
-        rewards: List[float] = []
-        for _ in range(n_times):
-            reward: float = self.pull_arm(arm_id)
-            rewards.append(reward)
+    def generate_trial_arrays(
+        self, num_trials: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """
+        Generate trials during the exploration phase as integer-coded arrays.
 
-        return rewards
+        All arms are drawn with a single call, the draws are grouped by arm and every
+        arm fills its rewards with one batch from its sampler.
+
+        Args:
+            num_trials: The number of trials to generate.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]: The trial numbers, the codes
+            of the arms pulled, the corresponding rewards and the table mapping an arm code
+            to its identifier.
+        """
+        # the narrowest integer type keeps the stable (radix) sort below cheap
+        code_dtype = np.min_scalar_type(max(len(self.arm_ids) - 1, 0))
+        arm_codes: np.ndarray = self.rng.integers(
+            len(self.arm_ids), size=num_trials, dtype=code_dtype
+        )
+        counts: np.ndarray = np.bincount(arm_codes, minlength=len(self.arm_ids))
+        order: np.ndarray = np.argsort(arm_codes, kind="stable")
+
+        arm_rounds: List[np.ndarray] = np.split(self.round + order, np.cumsum(counts)[:-1])
+
+        rewards: np.ndarray = np.empty(num_trials)
+        rewards[order] = np.concatenate(
+            [
+                self.sample(arm_id, int(count), rounds)
+                for arm_id, count, rounds in zip(self.arm_ids, counts, arm_rounds)
+            ]
+        )
+        self.round += num_trials
+
+        return np.arange(num_trials), arm_codes, rewards, list(self.arm_ids)
 
     def generate_trials(self, num_trials: int) -> Tuple[List[int], List[str], List[float]]:
         """
@@ -99,15 +358,50 @@ class RewardGenerator:
             Tuple[List[int], List[str], List[float]]: Three lists, one containing the trial numbers,
             one containing the arms pulled, and the other containing the corresponding rewards.
         """
-        rounds: List[int] = []
-        arms_pulled: List[str] = []
-        rewards: List[float] = []
+        rounds, arm_codes, rewards, arm_ids = self.generate_trial_arrays(num_trials)
+        arms_pulled: np.ndarray = np.array(arm_ids, dtype=object)[arm_codes]
+
+        return rounds.tolist(), arms_pulled.tolist(), rewards.tolist()
+
+    def iter_trials(
+        self, num_trials: Optional[int] = None, chunk_size: int = 10000
+    ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Lazily generate trials in fixed-size chunks with constant memory.
 
-        for trial in range(num_trials):
-            arm_id = random.choice(list(self.arm_configs.keys()))
-            reward = self.pull_arm(arm_id)
-            rounds.append(trial)
-            arms_pulled.append(arm_id)
-            rewards.append(reward)
+        Args:
+            num_trials: The total number of trials to generate. None streams without end.
+            chunk_size: The number of trials per chunk; the last chunk may be shorter.
 
-        return rounds, arms_pulled, rewards
+        Yields:
+            Tuple[np.ndarray, np.ndarray]: The codes of the arms pulled (indices into arm_ids)
+            and the corresponding rewards.
+        """
+        remaining: float = np.inf if num_trials is None else num_trials
+        while remaining > 0:
+            size = int(min(chunk_size, remaining))
+            _, arm_codes, rewards, _ = self.generate_trial_arrays(size)
+            remaining -= size
+            yield arm_codes, rewards
+
+    def iter_arm(
+        self, arm_id: str, n_times: Optional[int] = None, chunk_size: int = 10000
+    ) -> Iterator[np.ndarray]:
+        """
+        Lazily pull a given arm in fixed-size chunks with constant memory, one pull per round.
+
+        Args:
+            arm_id: The identifier of the arm to pull.
+            n_times: The total number of pulls. None streams without end.
+            chunk_size: The number of pulls per chunk; the last chunk may be shorter.
+
+        Yields:
+            np.ndarray: The rewards of the next chunk of pulls.
+        """
+        remaining: float = np.inf if n_times is None else n_times
+        while remaining > 0:
+            size = int(min(chunk_size, remaining))
+            remaining -= size
+            rewards = self.sample(arm_id, size)
+            self.round += size
+            yield rewards
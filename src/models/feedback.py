@@ -0,0 +1,58 @@
+import heapq
+from itertools import count
+from typing import Any, List, Tuple
+
+
+class ArrivalQueue:
+    """
+    Heap-based queue of delayed rewards ordered by their arrival time.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty ArrivalQueue.
+        """
+        # entries are (arrival time, sequence number, arm, reward); the sequence number
+        # keeps rewards arriving at the same time in the order they were pushed
+        self.heap: List[Tuple[float, int, Any, float]] = []
+        self.counter = count()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, arrival_time: float, arm: Any, reward: float) -> None:
+        """
+        Add a pending reward to the queue.
+
+        Args:
+            arrival_time (float): The simulated time at which the reward arrives.
+            arm (Any): The arm the reward belongs to.
+            reward (float): The reward.
+        """
+        heapq.heappush(self.heap, (arrival_time, next(self.counter), arm, reward))
+
+    def pop_until(self, time: float) -> Tuple[List[Any], List[float]]:
+        """
+        Remove and return all rewards that arrived until the given time.
+
+        Args:
+            time (float): The current simulated time.
+
+        Returns:
+            Tuple[List[Any], List[float]]: The arms and rewards that arrived, in arrival order.
+        """
+        arms, rewards = [], []
+        while self.heap and self.heap[0][0] <= time:
+            _, _, arm, reward = heapq.heappop(self.heap)
+            arms.append(arm)
+            rewards.append(reward)
+        return arms, rewards
+
+    def next_arrival(self) -> float:
+        """
+        Return the arrival time of the earliest pending reward.
+
+        Returns:
+            float: The arrival time, or infinity if the queue is empty.
+        """
+        return self.heap[0][0] if self.heap else float("inf")
@@ -0,0 +1,109 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+
+
+# largest admissible difference of the mean pull shares of the engines per method;
+# softmax draws its decisions differently from mabwiser, so only the shares agree
+SHARE_TOLERANCES: Dict[str, float] = {"softmax": 0.02}
+DEFAULT_SHARE_TOLERANCE = 1e-9
+
+
+def compare_engines(
+    arms_config: Dict[str, Dict[str, Any]],
+    mab_config: Dict[str, Any],
+    num_fit_rounds: int = 200,
+    num_rounds: int = 2000,
+    seeds: Sequence[int] = tuple(range(10)),
+    tolerance: Optional[float] = None,
+) -> pd.DataFrame:
+    """
+    Compare the allocation statistics of the native engine with the mabwiser engine.
+
+    Both engines run the same method on the same seeded reward generators. The share
+    of pulls of every arm after the exploration phase is averaged over the seeds.
+
+    Two speeds are reported per engine: end to end, i.e. MultiArmedBandit.run_n_rounds
+    with its reward generation, logs and regret bookkeeping, and for the policy alone,
+    i.e. one decision and one update of the model per round with rewards drawn
+    beforehand. The bookkeeping dominates end to end, so the speed-up of the native
+    engine is much larger for the policy alone.
+
+    Args:
+        arms_config (Dict[str, Dict[str, Any]]): The configuration of the arms.
+        mab_config (Dict[str, Any]): The configuration of the bandit; its 'engine' is ignored.
+        num_fit_rounds (int): The number of exploration rounds.
+        num_rounds (int): The number of rounds run after the exploration phase.
+        seeds (Sequence[int]): The seeds of the runs.
+        tolerance (Optional[float]): The largest admissible difference of the mean shares,
+            by default the one of the method in SHARE_TOLERANCES.
+
+    Returns:
+        pd.DataFrame: Per arm and engine the mean and standard deviation of the share of
+        pulls, plus the difference between the engines and the rounds per second, end to
+        end and for the policy alone.
+
+    Raises:
+        ValueError: If the shares of the engines differ by more than the tolerance.
+
+    Example:
+        >>> compare_engines(cfg["arms_config"], {"method": "ucb", "method_params": {"alpha": 1.0}})
+    """
+    shares: Dict[str, List[np.ndarray]] = {"mabwiser": [], "native": []}
+    rounds_per_second: Dict[str, float] = {}
+    policy_rounds_per_second: Dict[str, float] = {}
+    for engine in shares:
+        elapsed, policy_elapsed = 0.0, 0.0
+        for seed in seeds:
+            bandit = MultiArmedBandit(
+                RewardGenerator(arms_config, seed=seed), {**mab_config, "engine": engine}, seed
+            )
+            bandit.fit(num_fit_rounds)
+            explored = bandit.stats.counts.copy()
+            start = time.perf_counter()
+            bandit.run_n_rounds(num_rounds)
+            elapsed += time.perf_counter() - start
+            shares[engine].append((bandit.stats.counts - explored) / num_rounds)
+
+            # the model alone, continued with the rewards just observed
+            model = bandit.bandit
+            rewards = bandit.trial_log.values[-num_rounds:, 1].tolist()
+            start = time.perf_counter()
+            for reward in rewards:
+                model.partial_fit([model.predict()], [reward])
+            policy_elapsed += time.perf_counter() - start
+        rounds_per_second[engine] = len(shares[engine]) * num_rounds / elapsed
+        policy_rounds_per_second[engine] = len(shares[engine]) * num_rounds / policy_elapsed
+
+    result = pd.DataFrame(index=pd.Index(list(arms_config), name="arm"))
+    for engine, engine_shares in shares.items():
+        result[f"{engine}_share_mean"] = np.mean(engine_shares, axis=0)
+        result[f"{engine}_share_std"] = np.std(engine_shares, axis=0)
+        result[f"{engine}_rounds_per_second"] = rounds_per_second[engine]
+        result[f"{engine}_policy_rounds_per_second"] = policy_rounds_per_second[engine]
+    result["share_difference"] = result["native_share_mean"] - result["mabwiser_share_mean"]
+
+    if tolerance is None:
+        tolerance = SHARE_TOLERANCES.get(mab_config["method"], DEFAULT_SHARE_TOLERANCE)
+    difference = float(result["share_difference"].abs().max())
+    if difference > tolerance:
+        raise ValueError(
+            f"Engines diverge for '{mab_config['method']}': share difference {difference:.4f} "
+            f"exceeds {tolerance}"
+        )
+    return result
+
+
+if __name__ == "__main__":
+    from src.general.io import read_yaml
+
+    cfg = read_yaml("src/visualization/streamlit/default.yml")
+    for method, params in cfg["mab_methods"].items():
+        print(method)
+        result = compare_engines(cfg["arms_config"], {"method": method, "method_params": params})
+        print(result.to_string())
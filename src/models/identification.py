@@ -0,0 +1,274 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+class BestArmIdentification:
+    """
+    Base class of fixed-confidence best-arm identification strategies.
+
+    Strategies pull arms until the best arm is identified with probability at least
+    1 - delta, assuming rewards are sigma-sub-Gaussian (rewards in [0, 1] are
+    0.5-sub-Gaussian). The confidence radius of an arm pulled n times is
+    sigma * sqrt(2 * log(4 * K * n^2 / delta) / n), valid for all arms and all n at once.
+    """
+
+    def __init__(self, num_arms: int, delta: float = 0.05, sigma: float = 0.5) -> None:
+        """
+        Initialize the strategy.
+
+        Args:
+            num_arms (int): The number of arms.
+            delta (float): The admissible probability of identifying a wrong arm.
+            sigma (float): The sub-Gaussian scale of the rewards.
+        """
+        self.num_arms = num_arms
+        self.delta = delta
+        self.sigma = sigma
+        self.counts = np.zeros(num_arms, dtype=np.int64)
+        self.sums = np.zeros(num_arms)
+
+    @property
+    def total(self) -> int:
+        """
+        The number of pulls so far.
+        """
+        return int(self.counts.sum())
+
+    @property
+    def means(self) -> np.ndarray:
+        """
+        The mean reward of every arm, 0 for arms not pulled yet.
+        """
+        return np.divide(
+            self.sums, self.counts, out=np.zeros_like(self.sums), where=self.counts > 0
+        )
+
+    def radius(self) -> np.ndarray:
+        """
+        The confidence radius of every arm, infinite for arms not pulled yet.
+
+        Returns:
+            np.ndarray: One radius per arm.
+        """
+        counts = np.maximum(self.counts, 1)
+        radius = self.sigma * np.sqrt(
+            2 * np.log(4 * self.num_arms * counts.astype(float) ** 2 / self.delta) / counts
+        )
+        return np.where(self.counts > 0, radius, np.inf)
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        """
+        Add observed rewards to the statistics.
+
+        Args:
+            arm_codes (np.ndarray): The codes of the arms pulled.
+            rewards (np.ndarray): The corresponding rewards.
+        """
+        self.counts += np.bincount(arm_codes, minlength=self.num_arms)
+        self.sums += np.bincount(arm_codes, weights=rewards, minlength=self.num_arms)
+
+    def next_arms(self) -> List[int]:
+        """
+        Return the codes of the arms to pull next.
+        """
+        raise NotImplementedError
+
+    def stopped(self) -> bool:
+        """
+        Whether the best arm has been identified at the requested confidence.
+        """
+        raise NotImplementedError
+
+    def best_arm(self) -> int:
+        """
+        The code of the arm recommended as the best one.
+        """
+        return int(np.argmax(self.means))
+
+
+class SuccessiveElimination(BestArmIdentification):
+    """
+    Pull all remaining arms in turn and eliminate every arm whose upper confidence bound
+    falls below the highest lower confidence bound, until a single arm remains.
+    """
+
+    def __init__(self, num_arms: int, delta: float = 0.05, sigma: float = 0.5) -> None:
+        super().__init__(num_arms, delta, sigma)
+        self.active = np.ones(num_arms, dtype=bool)
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        super().update(arm_codes, rewards)
+        if (self.counts[self.active] > 0).all():
+            means, radius = self.means, self.radius()
+            best_lower = (means - radius)[self.active].max()
+            self.active &= means + radius >= best_lower
+
+    def next_arms(self) -> List[int]:
+        return np.flatnonzero(self.active).tolist()
+
+    def stopped(self) -> bool:
+        return int(self.active.sum()) == 1
+
+    def best_arm(self) -> int:
+        means = np.where(self.active, self.means, -np.inf)
+        return int(np.argmax(means))
+
+
+class LUCB(BestArmIdentification):
+    """
+    Pull the empirical best arm and its strongest challenger, the other arm with the
+    highest upper confidence bound, until the lower bound of the first exceeds the
+    upper bound of the second.
+    """
+
+    def _pair(self) -> Tuple[int, int]:
+        """
+        Return the empirical best arm and its strongest challenger.
+        """
+        means, radius = self.means, self.radius()
+        leader = int(np.argmax(means))
+        upper = means + radius
+        upper[leader] = -np.inf
+        return leader, int(np.argmax(upper))
+
+    def next_arms(self) -> List[int]:
+        unpulled = np.flatnonzero(self.counts == 0)
+        if len(unpulled):
+            return unpulled.tolist()
+        return list(self._pair())
+
+    def stopped(self) -> bool:
+        if (self.counts == 0).any():
+            return False
+        leader, challenger = self._pair()
+        radius = self.radius()
+        means = self.means
+        return bool(means[leader] - radius[leader] > means[challenger] + radius[challenger])
+
+
+class TrackAndStop(BestArmIdentification):
+    """
+    Track-and-Stop style strategy for Gaussian rewards.
+
+    Pulls track plug-in allocation weights (w_a proportional to 1 / gap_a^2 for the
+    challengers and w_best = sqrt(sum of the squared challenger weights), the Gaussian
+    approximation of the optimal allocation) with forced exploration of arms pulled
+    fewer than sqrt(t) times. It stops when the generalized likelihood ratio of the
+    empirical best arm against every challenger exceeds log(K * (1 + log t) / delta).
+    """
+
+    def weights(self) -> np.ndarray:
+        """
+        The plug-in allocation weights of the arms.
+
+        Returns:
+            np.ndarray: Weights summing to one.
+        """
+        means = self.means
+        leader = int(np.argmax(means))
+        gaps = np.maximum(means[leader] - means, 1e-6)
+        weights = 1 / gaps**2
+        weights[leader] = 0.0
+        weights[leader] = np.sqrt(np.sum(weights**2))
+        return weights / weights.sum()
+
+    def next_arms(self) -> List[int]:
+        total = self.total
+        if (self.counts == 0).any() or self.counts.min() < np.sqrt(total) - self.num_arms / 2:
+            return [int(np.argmin(self.counts))]
+        return [int(np.argmax((total + 1) * self.weights() - self.counts))]
+
+    def stopped(self) -> bool:
+        if (self.counts == 0).any():
+            return False
+        means, counts = self.means, self.counts.astype(float)
+        leader = int(np.argmax(means))
+        others = np.arange(self.num_arms) != leader
+        statistics = (means[leader] - means[others]) ** 2 / (
+            2 * self.sigma**2 * (1 / counts[leader] + 1 / counts[others])
+        )
+        threshold = np.log(self.num_arms * (1 + np.log(self.total)) / self.delta)
+        return bool(statistics.min() > threshold)
+
+
+IDENTIFICATION_METHODS: Dict[str, type] = {
+    "successive_elimination": SuccessiveElimination,
+    "lucb": LUCB,
+    "track_and_stop": TrackAndStop,
+}
+
+
+def identify_best_arm(
+    reward_generator: Any,
+    method: str = "lucb",
+    delta: float = 0.05,
+    sigma: float = 0.5,
+    max_rounds: int = 100000,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Pull arms of a reward generator until the best arm is identified.
+
+    Args:
+        reward_generator (Any): A source of rewards with arm_configs and pull_arms, e.g. a
+            RewardGenerator.
+        method (str): The strategy, one of the keys of IDENTIFICATION_METHODS.
+        delta (float): The admissible probability of identifying a wrong arm.
+        sigma (float): The sub-Gaussian scale of the rewards.
+        max_rounds (int): The budget of pulls, e.g. a fixed exploration budget.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, Dict[str, Any]]: The codes of the arms pulled and the
+        rewards in the order of the rounds, and a summary with the identified arm, the
+        rounds used, whether the strategy stopped within the budget and the rounds saved
+        compared with the budget.
+
+    Raises:
+        ValueError: If the method is not supported.
+    """
+    if method not in IDENTIFICATION_METHODS:
+        raise ValueError(f"Unsupported identification method: '{method}'")
+    arm_ids = list(reward_generator.arm_configs)
+    strategy: BestArmIdentification = IDENTIFICATION_METHODS[method](len(arm_ids), delta, sigma)
+
+    codes: List[np.ndarray] = []
+    rewards: List[np.ndarray] = []
+    rounds = 0
+    while rounds < max_rounds and not strategy.stopped():
+        arm_codes = np.array(strategy.next_arms()[: max_rounds - rounds])
+        arm_rewards = reward_generator.pull_arms([arm_ids[code] for code in arm_codes])
+        strategy.update(arm_codes, arm_rewards)
+        codes.append(arm_codes)
+        rewards.append(arm_rewards)
+        rounds += len(arm_codes)
+
+    summary = {
+        "method": method,
+        "best_arm": arm_ids[strategy.best_arm()],
+        "stopped": strategy.stopped(),
+        "rounds": rounds,
+        "budget": max_rounds,
+        "rounds_saved": max_rounds - rounds,
+        "pulls": dict(zip(arm_ids, strategy.counts.tolist())),
+    }
+    if not codes:
+        return np.zeros(0, dtype=int), np.zeros(0), summary
+    return np.concatenate(codes), np.concatenate(rewards), summary
+
+
+if __name__ == "__main__":
+    from src.data.reward_generator import RewardGenerator
+    from src.general.io import read_yaml
+
+    cfg = read_yaml("src/visualization/streamlit/default.yml")
+    for method in IDENTIFICATION_METHODS:
+        for sigma in [0.5, 0.1]:
+            results = [
+                identify_best_arm(
+                    RewardGenerator(cfg["arms_config"], seed=seed), method, 0.05, sigma, 10000
+                )[2]
+                for seed in range(10)
+            ]
+            correct = np.mean([result["best_arm"] == "Blue bot" for result in results])
+            rounds = np.mean([result["rounds"] for result in results])
+            print(f"{method} sigma={sigma}: {rounds:.0f} rounds, {correct:.0%} correct")
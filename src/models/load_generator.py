@@ -0,0 +1,126 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from src.data.reward_generator import RewardGenerator
+
+
+async def _request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    method: str,
+    target: str,
+    body: Any = None,
+) -> Dict[str, Any]:
+    """
+    Send a request over a keep-alive connection and return the decoded JSON response.
+    """
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(
+        f"{method} {target} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(payload)}\r\n\r\n"
+        .encode()
+        + payload
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    length = next(
+        int(line.split(b":", 1)[1])
+        for line in head.split(b"\r\n")
+        if line.lower().startswith(b"content-length")
+    )
+    return json.loads(await reader.readexactly(length))
+
+
+async def _client(
+    host: str,
+    port: int,
+    num_requests: int,
+    reward_generator: RewardGenerator,
+    latencies: List[float],
+) -> None:
+    """
+    Run a closed-loop client: choose an arm, pull it and report the reward, repeatedly.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(num_requests):
+            start = time.perf_counter()
+            arm = (await _request(reader, writer, "GET", "/choose"))["arm"]
+            latencies.append(time.perf_counter() - start)
+            reward = reward_generator.pull_arm(arm)
+            await _request(reader, writer, "POST", "/reward", {"arm": arm, "reward": reward})
+    finally:
+        writer.close()
+
+
+async def run_load(
+    arms_config: Dict[str, Dict[str, Any]],
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    num_clients: int = 32,
+    num_requests: int = 1000,
+    seed: int = 42,
+) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """
+    Generate load on a running BanditService.
+
+    Every client keeps one connection open and loops over decision and reward requests;
+    rewards are drawn from a RewardGenerator configured like the served arms.
+
+    Args:
+        arms_config (Dict[str, Dict[str, Any]]): The configuration of the served arms.
+        host (str): The host of the service.
+        port (int): The port of the service.
+        num_clients (int): The number of concurrent clients.
+        num_requests (int): The number of decisions per client.
+        seed (int): Seed of the reward generator.
+
+    Returns:
+        Tuple[Dict[str, float], Dict[str, Any]]: The decisions per second and the
+        client-side latency percentiles in milliseconds, and the /stats of the service.
+    """
+    reward_generator = RewardGenerator(arms_config, seed=seed)
+    latencies: List[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _client(host, port, num_requests, reward_generator, latencies)
+            for _ in range(num_clients)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    service_stats = await _request(reader, writer, "GET", "/stats")
+    writer.close()
+
+    p50, p99 = np.percentile(np.array(latencies) * 1000, [50, 99])
+    client_stats = {
+        "decisions_per_second": len(latencies) / elapsed,
+        "client_latency_p50_ms": float(p50),
+        "client_latency_p99_ms": float(p99),
+    }
+    return client_stats, service_stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.general.io import read_yaml
+
+    parser = argparse.ArgumentParser(description="Generate load on a bandit service.")
+    parser.add_argument("--config", default="src/visualization/streamlit/default.yml")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    cfg = read_yaml(args.config)
+    client_stats, service_stats = asyncio.run(
+        run_load(cfg["arms_config"], args.host, args.port, args.clients, args.requests)
+    )
+    print(json.dumps({"client": client_stats, "service": service_stats}, indent=2))
@@ -0,0 +1,381 @@
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+class ArrayLog:
+    """
+    Growable array of per-round rows with one column per arm.
+
+    Rows are stored in a preallocated NumPy array whose capacity doubles when full,
+    so appending a row is O(1) amortized. Every round is kept.
+    """
+
+    def __init__(self, num_columns: int, dtype: type = float, capacity: int = 1024) -> None:
+        """
+        Initialize an empty ArrayLog.
+
+        Args:
+            num_columns (int): The number of columns, e.g. the number of arms.
+            dtype (type): The data type of the values.
+            capacity (int): The number of rows allocated up front.
+        """
+        self.data = np.zeros((max(capacity, 1), num_columns), dtype=dtype)
+        self.size = 0  # number of rows kept
+        self.count = 0  # number of rounds logged
+        self.last_row = np.zeros(num_columns, dtype=dtype)
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def values(self) -> np.ndarray:
+        """
+        The rows kept so far, in chronological order.
+        """
+        return self.data[: self.size]
+
+    @property
+    def rounds(self) -> np.ndarray:
+        """
+        The round of every row kept so far.
+        """
+        return np.arange(self.size)
+
+    def last(self) -> np.ndarray:
+        """
+        Return the last row, or a row of zeros if the log is empty.
+
+        Returns:
+            np.ndarray: The last row.
+        """
+        return self.last_row
+
+    def _reserve(self, num_rows: int) -> None:
+        """
+        Grow the capacity so that num_rows more rows fit.
+        """
+        required = self.size + num_rows
+        if required > len(self.data):
+            capacity = max(required, 2 * len(self.data))
+            data = np.zeros((capacity, self.data.shape[1]), dtype=self.data.dtype)
+            data[: self.size] = self.data[: self.size]
+            self.data = data
+
+    def _store(self, rows: np.ndarray) -> None:
+        """
+        Keep the given rows, which follow the rounds logged so far.
+        """
+        self._reserve(len(rows))
+        self.data[self.size : self.size + len(rows)] = rows
+        self.size += len(rows)
+
+    def append(self, row: np.ndarray) -> None:
+        """
+        Append a single row.
+
+        Args:
+            row (np.ndarray): The row to append.
+        """
+        self.extend(np.asarray(row)[None, :])
+
+    def extend(self, rows: np.ndarray) -> None:
+        """
+        Append several rows at once.
+
+        Args:
+            rows (np.ndarray): An array of shape (number of rows, number of columns).
+        """
+        if not len(rows):
+            return
+        self._store(rows)
+        self.count += len(rows)
+        self.last_row = np.array(rows[-1], dtype=self.data.dtype)
+
+
+class RingLog(ArrayLog):
+    """
+    Log keeping only the most recent rows in a fixed-size ring buffer.
+    """
+
+    def __init__(self, num_columns: int, dtype: type = float, size: int = 10000) -> None:
+        """
+        Initialize an empty RingLog.
+
+        Args:
+            num_columns (int): The number of columns, e.g. the number of arms.
+            dtype (type): The data type of the values.
+            size (int): The number of most recent rows kept.
+        """
+        super().__init__(num_columns, dtype, size)
+
+    @property
+    def values(self) -> np.ndarray:
+        if self.count <= len(self.data):
+            return self.data[: self.count]
+        position = self.count % len(self.data)
+        return np.concatenate([self.data[position:], self.data[:position]])
+
+    @property
+    def rounds(self) -> np.ndarray:
+        return np.arange(self.count - self.size, self.count)
+
+    def _store(self, rows: np.ndarray) -> None:
+        capacity = len(self.data)
+        first = self.count + max(len(rows) - capacity, 0)
+        rows = rows[-capacity:]
+        positions = (first + np.arange(len(rows))) % capacity
+        self.data[positions] = rows
+        self.size = min(self.count + len(rows), capacity)
+
+
+class StridedLog(ArrayLog):
+    """
+    Log keeping every stride-th row in a fixed-size buffer.
+
+    When the buffer is full the stride doubles and every other kept row is dropped,
+    so memory stays flat while the rows still span the whole history.
+    """
+
+    def __init__(
+        self, num_columns: int, dtype: type = float, size: int = 10000, stride: int = 1
+    ) -> None:
+        """
+        Initialize an empty StridedLog.
+
+        Args:
+            num_columns (int): The number of columns, e.g. the number of arms.
+            dtype (type): The data type of the values.
+            size (int): The maximal number of rows kept, rounded up to an even number.
+            stride (int): The initial distance in rounds between two kept rows.
+        """
+        super().__init__(num_columns, dtype, size + size % 2)
+        self.stride = stride
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: np.ndarray,
+        stride: int,
+        count: int,
+        last_row: np.ndarray,
+        size: int = 10000,
+    ) -> "StridedLog":
+        """
+        Rebuild a log from rows kept every stride-th round, e.g. a downsampled history.
+
+        Args:
+            rows (np.ndarray): The rows of the rounds 0, stride, 2 * stride, ...
+            stride (int): The distance in rounds between two rows.
+            count (int): The number of rounds logged.
+            last_row (np.ndarray): The row of the last round logged.
+            size (int): The maximal number of rows kept.
+
+        Returns:
+            StridedLog: The log, continuing after the last round logged.
+        """
+        log = cls(rows.shape[1], rows.dtype, max(size, len(rows)), stride)
+        log.data[: len(rows)] = rows
+        log.size = len(rows)
+        log.count = count
+        log.last_row = np.array(last_row, dtype=rows.dtype)
+        return log
+
+    @property
+    def rounds(self) -> np.ndarray:
+        return np.arange(self.size) * self.stride
+
+    def _compact(self) -> None:
+        """
+        Double the stride, dropping every other kept row.
+        """
+        kept = self.data[: self.size : 2].copy()
+        self.size = len(kept)
+        self.data[: self.size] = kept
+        self.stride *= 2
+
+    def _store(self, rows: np.ndarray) -> None:
+        rounds = self.count + np.arange(len(rows))
+        while True:
+            selected = rows[rounds % self.stride == 0]
+            if self.size + len(selected) <= len(self.data):
+                break
+            self._compact()
+        self.data[self.size : self.size + len(selected)] = selected
+        self.size += len(selected)
+
+
+class BucketLog(ArrayLog):
+    """
+    Log keeping the mean row of every time bucket in a fixed-size buffer.
+
+    When the buffer is full the bucket width doubles and adjacent buckets are merged,
+    so memory stays flat while the buckets still span the whole history.
+    """
+
+    def __init__(
+        self, num_columns: int, dtype: type = float, size: int = 10000, width: int = 1
+    ) -> None:
+        """
+        Initialize an empty BucketLog.
+
+        Args:
+            num_columns (int): The number of columns, e.g. the number of arms.
+            dtype (type): The data type of the values logged; bucket means are floats.
+            size (int): The maximal number of buckets kept, rounded up to an even number.
+            width (int): The initial number of rounds per bucket.
+        """
+        super().__init__(num_columns, float, size + size % 2)
+        self.last_row = np.zeros(num_columns, dtype=dtype)
+        self.bucket_counts = np.zeros(len(self.data), dtype=np.int64)
+        self.width = width
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.data[: self.size] / self.bucket_counts[: self.size, None]
+
+    @property
+    def rounds(self) -> np.ndarray:
+        """
+        The first round of every bucket kept so far.
+        """
+        return np.arange(self.size) * self.width
+
+    def _compact(self) -> None:
+        """
+        Double the bucket width, merging adjacent buckets.
+        """
+        half = len(self.data) // 2
+        self.data[:half] = self.data.reshape(half, 2, -1).sum(axis=1)
+        self.data[half:] = 0
+        self.bucket_counts[:half] = self.bucket_counts.reshape(half, 2).sum(axis=1)
+        self.bucket_counts[half:] = 0
+        self.size = -(-self.size // 2)
+        self.width *= 2
+
+    def _store(self, rows: np.ndarray) -> None:
+        while (self.count + len(rows) - 1) // self.width >= len(self.data):
+            self._compact()
+        buckets = (self.count + np.arange(len(rows))) // self.width
+        starts = np.flatnonzero(np.diff(buckets, prepend=-1))
+        self.data[buckets[starts]] += np.add.reduceat(rows, starts, axis=0)
+        self.bucket_counts[buckets[starts]] += np.diff(np.append(starts, len(rows)))
+        self.size = int(buckets[-1]) + 1
+
+
+class SufficientStats:
+    """
+    Exact per-arm sufficient statistics of the rewards: counts, sums and sums of squares.
+    """
+
+    def __init__(self, num_arms: int) -> None:
+        """
+        Initialize empty statistics.
+
+        Args:
+            num_arms (int): The number of arms.
+        """
+        self.counts = np.zeros(num_arms, dtype=np.int64)
+        self.sums = np.zeros(num_arms)
+        self.sq_sums = np.zeros(num_arms)
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        """
+        Add rewards to the statistics.
+
+        Args:
+            arm_codes (np.ndarray): The codes of the arms pulled.
+            rewards (np.ndarray): The corresponding rewards.
+        """
+        num_arms = len(self.counts)
+        rewards = np.asarray(rewards, dtype=float)
+        self.counts += np.bincount(arm_codes, minlength=num_arms)
+        self.sums += np.bincount(arm_codes, weights=rewards, minlength=num_arms)
+        self.sq_sums += np.bincount(arm_codes, weights=rewards**2, minlength=num_arms)
+
+    def add(self, arm_code: int, reward: float) -> None:
+        """
+        Add a single reward to the statistics in O(1).
+
+        Args:
+            arm_code (int): The code of the arm pulled.
+            reward (float): The reward.
+        """
+        self.counts[arm_code] += 1
+        self.sums[arm_code] += reward
+        self.sq_sums[arm_code] += reward * reward
+
+    @property
+    def means(self) -> np.ndarray:
+        """
+        The mean reward of every arm, 0 for arms not pulled yet.
+        """
+        return np.divide(
+            self.sums, self.counts, out=np.zeros_like(self.sums), where=self.counts > 0
+        )
+
+    @property
+    def variances(self) -> np.ndarray:
+        """
+        The (population) variance of the rewards of every arm, 0 for arms not pulled yet.
+        """
+        mean_squares = np.divide(
+            self.sq_sums, self.counts, out=np.zeros_like(self.sums), where=self.counts > 0
+        )
+        return np.maximum(mean_squares - self.means**2, 0)
+
+
+def point_history(history: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Adapt a history policy to logs with categorical columns, e.g. arm codes.
+
+    Bucket means of such columns are meaningless (the mean of arm codes 0 and 1 is no
+    arm), so the 'bucket' mode keeps every 'stride'-th row instead, like 'stride'.
+
+    Args:
+        history (Optional[Dict[str, Any]]): The history policy, see create_log.
+
+    Returns:
+        Optional[Dict[str, Any]]: The history policy for the categorical log.
+    """
+    if history and history.get("mode") == "bucket":
+        return {**history, "mode": "stride"}
+    return history
+
+
+def create_log(
+    num_columns: int,
+    dtype: type = float,
+    history: Optional[Dict[str, Any]] = None,
+    capacity: int = 1024,
+) -> ArrayLog:
+    """
+    Create a log following a history policy.
+
+    Args:
+        num_columns (int): The number of columns, e.g. the number of arms.
+        dtype (type): The data type of the values.
+        history (Optional[Dict[str, Any]]): The history policy, with 'mode' one of
+            'full' (keep every round, default), 'ring' (keep the last 'size' rounds),
+            'stride' (keep every 'stride'-th round in at most 'size' rows) or
+            'bucket' (keep means over buckets of 'stride' rounds in at most 'size' rows).
+        capacity (int): The number of rows allocated up front in the 'full' mode.
+
+    Returns:
+        ArrayLog: The log.
+
+    Raises:
+        ValueError: If the history mode is not supported.
+    """
+    history = history or {}
+    mode = history.get("mode", "full")
+    size = history.get("size", 10000)
+    if mode == "full":
+        return ArrayLog(num_columns, dtype, capacity)
+    if mode == "ring":
+        return RingLog(num_columns, dtype, size)
+    if mode == "stride":
+        return StridedLog(num_columns, dtype, size, history.get("stride", 1))
+    if mode == "bucket":
+        return BucketLog(num_columns, dtype, size, history.get("stride", 1))
+    raise ValueError(f"Unsupported history mode: '{mode}'")
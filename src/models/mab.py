@@ -1,14 +1,30 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 from mabwiser.mab import MAB, LearningPolicy
 
+from src.data.distributions import DISTRIBUTIONS
 from src.data.reward_generator import RewardGenerator
+from src.models.feedback import ArrivalQueue
+from src.models.identification import identify_best_arm
+from src.models.logs import SufficientStats, create_log, point_history
+from src.models.policies import NativeMAB, expectations_from_stats
+
+# methods without a mabwiser counterpart, always run on the native engine
+NATIVE_ONLY_METHODS = (
+    "beta_thompson",
+    "gaussian_thompson",
+    "sliding_window_ucb",
+    "discounted_ucb",
+    "sliding_window_thompson",
+    "discounted_thompson",
+)
 
 
 class MultiArmedBandit:
     """
-    Class to fit a multi-armed bandit model using the mabwiser package.
+    Class to fit a multi-armed bandit model using the mabwiser package
+    or the native NumPy engine.
     """
 
     def __init__(
@@ -19,43 +35,342 @@ class MultiArmedBandit:
 
         Args:
             reward_generator (RewardGenerator): An instance of RewardGenerator to generate rewards.
-            config (Dict[str, Any]): Configuration parameters for the bandit method.
+            config (Dict[str, Any]): Configuration parameters for the bandit method. The optional
+                'history' entry bounds the memory of the logs, e.g. {"mode": "ring", "size": 10000}
+                (see src.models.logs.create_log); by default every round is kept. The optional
+                'engine' entry selects "mabwiser" (default) or "native" (src.models.policies);
+                the conjugate Thompson variants 'beta_thompson' and 'gaussian_thompson' and
+                the sliding-window and discounted variants for non-stationary rewards
+                always use the native engine.
+                The optional 'expectations' entry controls the tracking of the expectations:
+                {"mode": "every", "every": N} evaluates the model every N rounds (default 1)
+                and repeats the last values in between, {"mode": "off"} skips them and
+                {"mode": "stats"} rebuilds them on demand from the cumulative logs.
+                The optional 'identification' entry, e.g. {"method": "lucb", "delta": 0.05,
+                "sigma": 0.5}, replaces the fixed exploration phase of fit by a best-arm
+                identification strategy (src.models.identification) that stops as soon as
+                the best arm is known with confidence 1 - delta.
             seed (int): Seed for random number generation (default is 42).
         """
         self.rg = reward_generator
         self.arm_ids = list(reward_generator.arm_configs.keys())
+        self.arm_codes = {arm: code for code, arm in enumerate(self.arm_ids)}
         self.config = config
         self.seed = seed
+        self.rng = np.random.default_rng(seed)
         self.bandit = None
+        self.identification: Optional[Dict[str, Any]] = None
+        # simulated time and rewards still in flight in the delayed-feedback mode
+        self.clock = 0.0
+        self.arrival_queue = ArrivalQueue()
 
-    def fit(self, num_rounds: int) -> None:
+    def fit(self, num_rounds: int, chunk_size: Optional[int] = None) -> None:
         """
         Fit a multi-armed bandit model using the provided reward generator.
 
         Args:
-            num_rounds (int): The number of rounds to run the bandit algorithm.
+            num_rounds (int): The number of rounds to run the bandit algorithm; the budget of
+                the exploration phase when an identification strategy is configured.
+            chunk_size (Optional[int]): If given, exploration trials are pulled lazily from
+                the reward generator in chunks of this size and fed to the model one chunk
+                at a time instead of being generated all at once. Memory then stays
+                constant only with a bounded history: without a 'history' entry the logs
+                keep at most chunk_size evenly spaced rounds (the 'stride' mode), and an
+                explicit 'full' history grows with the rounds instead of being
+                preallocated for the whole horizon.
+        """
+        self.bandit = self._create_bandit()
+        self.clock = 0.0
+        self.arrival_queue = ArrivalQueue()
+
+        # one column per arm (in order of arm_ids), one row per round kept by the history
+        # policy; the sufficient statistics are exact for all rounds regardless of it
+        history = self.config.get("history")
+        capacity = num_rounds
+        if chunk_size is not None:
+            # streamed exploration: nothing is allocated for the whole horizon
+            history = history or {"mode": "stride", "size": chunk_size}
+            capacity = min(num_rounds, chunk_size)
+        num_arms = len(self.arm_ids)
+        self.stats = SufficientStats(num_arms)
+        # arm code and reward; arm codes are never averaged into bucket means
+        self.trial_log = create_log(2, float, point_history(history), capacity)
+        self.expectation_log = create_log(num_arms, float, history, capacity)
+        self.pull_cum_log = create_log(num_arms, int, history, capacity)
+        self.reward_cum_log = create_log(num_arms, float, history, capacity)
+        self.reward_log = create_log(num_arms, float, history, capacity)
+        self.expectation_mode = self.config.get("expectations", {}).get("mode", "every")
+        if self.expectation_mode not in ("every", "off", "stats"):
+            raise ValueError(f"Unsupported expectations mode: '{self.expectation_mode}'")
+        self.expectation_every = self.config.get("expectations", {}).get("every", 1)
+        self.last_expectations: Optional[np.ndarray] = None
+        # cumulative pseudo-regret and best-arm share, maintained round by round
+        self.regret_cum_log = create_log(2, float, history, capacity)
+        self.cum_regret = 0.0
+        self.best_pulls = 0
+        self.lead_round: Optional[int] = None
+        self._init_means()
+
+        identification = self.config.get("identification")
+        self.identification = None
+        if identification is not None:
+            arm_codes, rewards, self.identification = identify_best_arm(
+                self.rg,
+                identification.get("method", "lucb"),
+                identification.get("delta", 0.05),
+                identification.get("sigma", 0.5),
+                max_rounds=num_rounds,
+            )
+            chunks = [(arm_codes, rewards)]
+        elif chunk_size is None:
+            _, arm_codes, rewards, _ = self.rg.generate_trial_arrays(num_rounds)
+            chunks = [(arm_codes, rewards)]
+        else:
+            chunks = self.rg.iter_trials(num_rounds, chunk_size)
+
+        arm_table = np.array(self.arm_ids, dtype=object)
+        for i, (arm_codes, rewards) in enumerate(chunks):
+            if i:
+                self.bandit.partial_fit(arm_table[arm_codes], rewards)
+            else:
+                self.bandit.fit(arm_table[arm_codes], rewards)
+            self._update_logs(arm_codes, rewards)
+
+        # the expectations of the trained model for all exploration rounds, appended chunk
+        # by chunk so a streamed exploration never materializes the whole horizon
+        num_rows = self.trial_log.count
+        step = min(chunk_size or num_rows, num_rows)
+        self._log_expectations(step, decimals=2, first_round=0)
+        if self.expectation_mode == "every":
+            for start in range(step, num_rows, step):
+                self.expectation_log.extend(
+                    np.broadcast_to(
+                        self.last_expectations, (min(step, num_rows - start), num_arms)
+                    )
+                )
+
+    def _init_means(self) -> None:
+        """
+        Choose where the arm means of the regret come from.
+
+        Reward generators with analytic means (arm_means_at) are used directly; the means
+        of stationary arms are computed once. Other sources, e.g. replayed logs, fall back
+        to the running estimates of the sufficient statistics.
+        """
+        self.means_source = "analytic" if hasattr(self.rg, "arm_means_at") else "estimated"
+        self.static_means: Optional[np.ndarray] = None
+        if self.means_source == "analytic" and not getattr(self.rg, "schedules", None):
+            self.static_means = self.rg.arm_means_at(np.zeros(1, dtype=int))[:, 0]
+
+    def _arm_means(self, rounds: np.ndarray) -> np.ndarray:
+        """
+        Return the means of all arms at the given rounds.
+
+        Returns:
+            np.ndarray: An array of shape (number of arms, number of rounds).
+        """
+        if self.static_means is not None:
+            return np.broadcast_to(self.static_means[:, None], (len(self.arm_ids), len(rounds)))
+        if self.means_source == "analytic":
+            return self.rg.arm_means_at(rounds)
+        return np.broadcast_to(self.stats.means[:, None], (len(self.arm_ids), len(rounds)))
+
+    def _update_regret(self, arm_codes: np.ndarray, pulls: np.ndarray, first_round: int) -> None:
+        """
+        Update the cumulative pseudo-regret, the best-arm share and the lead round.
+
+        The cost only depends on the number of new rounds, not on the history.
+
+        Args:
+            arm_codes (np.ndarray): Codes of the arms pulled in the new rounds.
+            pulls (np.ndarray): The cumulative pulls of every arm after each new round.
+            first_round (int): The round of the first new pull.
+        """
+        if len(arm_codes) == 1:
+            self._update_regret_round(int(arm_codes[0]), pulls[0], first_round)
+            return
+
+        num_rounds = len(arm_codes)
+        steps = np.arange(num_rounds)
+        rounds = first_round + steps
+        means = self._arm_means(rounds)
+        best_arms = means.argmax(axis=0)
+        regret = means.max(axis=0) - means[arm_codes, steps]
+
+        cum_regret = self.cum_regret + np.cumsum(regret)
+        best_pulls = self.best_pulls + np.cumsum(arm_codes == best_arms)
+        self.regret_cum_log.extend(np.column_stack([cum_regret, best_pulls / (rounds + 1)]))
+        self.cum_regret = float(cum_regret[-1])
+        self.best_pulls = int(best_pulls[-1])
+
+        # the best arm leads if it has strictly more pulls than every other arm
+        others = pulls.astype(float)
+        others[steps, best_arms] = -np.inf
+        leading = pulls[steps, best_arms] > others.max(axis=1)
+        if not leading[-1]:
+            self.lead_round = None
+        elif not leading.all():
+            self.lead_round = first_round + int(np.flatnonzero(~leading)[-1]) + 1
+        elif self.lead_round is None:
+            self.lead_round = first_round
+
+    def _update_regret_round(self, code: int, pulls: np.ndarray, round_: int) -> None:
+        """
+        Update the regret statistics with a single round in O(1), see _update_regret.
+        """
+        if self.static_means is not None:
+            means = self.static_means
+        else:
+            means = self._arm_means(np.array([round_]))[:, 0]
+        best_arm = int(means.argmax())
+        self.cum_regret += float(means[best_arm] - means[code])
+        self.best_pulls += int(code == best_arm)
+        self.regret_cum_log.append(np.array([self.cum_regret, self.best_pulls / (round_ + 1)]))
+
+        best_count = pulls[best_arm]
+        if best_count < pulls.max() or np.count_nonzero(pulls == best_count) > 1:
+            self.lead_round = None
+        elif self.lead_round is None:
+            self.lead_round = round_
+
+    @property
+    def cumulative_regret_log(self) -> np.ndarray:
+        """
+        The cumulative pseudo-regret after every round kept in the history.
+        """
+        return self.regret_cum_log.values[:, 0]
+
+    @property
+    def best_arm_share_log(self) -> np.ndarray:
+        """
+        The share of pulls of the best arm up to every round kept in the history.
+        """
+        return self.regret_cum_log.values[:, 1]
+
+    def regret_summary(self) -> Dict[str, Any]:
         """
-        self.rounds_log, self.arms_log, self.rewards_log = self.rg.generate_trials(num_rounds)
+        Summarize the pseudo-regret and best-arm statistics of all rounds so far.
+
+        Returns:
+            Dict[str, Any]: The number of rounds, the cumulative and mean pseudo-regret, the
+            current best arm, its number and share of pulls, the round since which it
+            leads the pull counts (None if it does not lead) and the source of the means.
+        """
+        rounds = self.trial_log.count
+        best_arm = int(np.argmax(self._arm_means(np.array([max(rounds - 1, 0)]))[:, 0]))
+        return {
+            "rounds": rounds,
+            "cumulative_regret": self.cum_regret,
+            "mean_regret": self.cum_regret / rounds if rounds else 0.0,
+            "best_arm": self.arm_ids[best_arm],
+            "best_arm_pulls": int(self.stats.counts[best_arm]),
+            "best_arm_share": self.best_pulls / rounds if rounds else 0.0,
+            "lead_round": self.lead_round,
+            "means": self.means_source,
+        }
+
+    @property
+    def rounds_log(self) -> List[int]:
+        """
+        The rounds kept in the history.
+        """
+        return self.trial_log.rounds.tolist()
+
+    @property
+    def arms_log(self) -> List[Any]:
+        """
+        The arm pulled in every round kept in the history.
+        """
+        arm_codes = self.trial_log.values[:, 0].astype(int)
+        return np.array(self.arm_ids, dtype=object)[arm_codes].tolist()
+
+    @property
+    def rewards_log(self) -> List[float]:
+        """
+        The reward received in every round kept in the history.
+        """
+        return self.trial_log.values[:, 1].tolist()
+
+    @property
+    def expectations_log(self) -> Dict[Any, np.ndarray]:
+        """
+        The expected reward of each arm after every round kept in the history.
+
+        In the 'stats' expectations mode the series is rebuilt from the cumulative logs,
+        in the 'off' mode it is empty.
+        """
+        if self.expectation_mode == "stats":
+            expectations = expectations_from_stats(
+                self.config["method"],
+                self.config.get("method_params"),
+                self.pull_cum_log.values,
+                self.reward_cum_log.values,
+            )
+            return dict(zip(self.arm_ids, expectations.T))
+        return dict(zip(self.arm_ids, self.expectation_log.values.T))
+
+    @property
+    def arm_pull_cum_log(self) -> Dict[Any, np.ndarray]:
+        """
+        How many times each arm was pulled up to every round.
+        """
+        return dict(zip(self.arm_ids, self.pull_cum_log.values.T))
+
+    @property
+    def arm_reward_cum_log(self) -> Dict[Any, np.ndarray]:
+        """
+        The cumulative reward each arm generated up to every round.
+        """
+        return dict(zip(self.arm_ids, self.reward_cum_log.values.T))
+
+    @property
+    def arm_reward_log(self) -> Dict[Any, np.ndarray]:
+        """
+        The reward each arm generated in every round (0 if it was not pulled).
+        """
+        return dict(zip(self.arm_ids, self.reward_log.values.T))
+
+    def _create_bandit(self) -> Union[MAB, NativeMAB]:
+        """
+        Create an untrained model for the configured method and engine.
+
+        Returns:
+            Union[MAB, NativeMAB]: The bandit model.
+
+        Raises:
+            ValueError: If the configured method or engine is not supported.
+        """
+        engine = self.config.get("engine", "mabwiser")
+        if engine == "native" or self.config["method"] in NATIVE_ONLY_METHODS:
+            return NativeMAB(
+                self.arm_ids, self.config["method"], self.config.get("method_params"), self.seed
+            )
+        if engine != "mabwiser":
+            raise ValueError(f"Unsupported bandit engine: '{engine}'")
 
         if self.config["method"] == "epsilon_greedy":
-            self.bandit = MAB(
+            bandit = MAB(
                 arms=self.arm_ids,
                 learning_policy=LearningPolicy.EpsilonGreedy(**self.config["method_params"]),
                 seed=self.seed,
             )
         elif self.config["method"] == "softmax":
-            self.bandit = MAB(
+            bandit = MAB(
                 arms=self.arm_ids,
                 learning_policy=LearningPolicy.Softmax(**self.config["method_params"]),
                 seed=self.seed,
             )
         elif self.config["method"] == "ucb":
-            self.bandit = MAB(
+            bandit = MAB(
                 arms=self.arm_ids,
                 learning_policy=LearningPolicy.UCB1(**self.config["method_params"]),
                 seed=self.seed,
             )
         elif self.config["method"] == "thompson_sampling":
+            # Thompson sampling in mabwiser expects Bernoulli rewards, hence rewards are
+            # binarized at a threshold; see 'beta_thompson' and 'gaussian_thompson'
+            # for variants using the rewards themselves
+            threshold = (self.config.get("method_params") or {}).get("threshold", 0.5)
 
             def binary_func(decision, reward):
                 """
@@ -68,64 +383,92 @@ class MultiArmedBandit:
                 Returns:
                     int: Binarized reward (1 for success, 0 for failure).
                 """
-                decision_to_threshold = {arm: 0.5 for arm in self.arm_ids}
-                return 1 if reward > decision_to_threshold[decision] else 0
+                return 1 if reward > threshold else 0
 
-            self.bandit = MAB(
+            bandit = MAB(
                 arms=self.arm_ids,
                 learning_policy=LearningPolicy.ThompsonSampling(binarizer=binary_func),
                 seed=self.seed,
             )
         else:
-            raise ValueError(f"Unsupported bandit method: '{self.method}'")
+            raise ValueError(f"Unsupported bandit method: '{self.config['method']}'")
 
-        self.bandit.fit(self.arms_log, self.rewards_log)
+        return bandit
 
-        # Keep logs
-        self.expectations_log = {
-            arm: [np.round(expectation, 2)] * num_rounds
-            for arm, expectation in self.bandit.predict_expectations().items()
-        }
-        self.arm_pull_cum_log = {arm: [] for arm in self.arm_ids}  # how many times arms was pulled
-        self.arm_reward_cum_log = {
-            arm: [] for arm in self.arm_ids
-        }  # cumulative reward it generated
-        self.arm_reward_log = {arm: [] for arm in self.arm_ids}  # reward it generated
+    def _log_expectations(
+        self, num_rows: int, decimals: int = 4, first_round: Optional[int] = None
+    ) -> None:
+        """
+        Append the expectations of the next rounds to the expectation log.
 
-        self._update_logs(self.arms_log, self.rewards_log)
+        The model is only evaluated if one of the rounds is a multiple of the configured
+        interval; otherwise the last evaluated expectations are repeated.
 
-    def _update_logs(self, arms_pulled: List[Any], rewards: List[float]) -> None:
+        Args:
+            num_rows (int): The number of rounds to log.
+            decimals (int): The number of decimals the expectations are rounded to.
+            first_round (Optional[int]): The first round to log, by default the next one.
+        """
+        if self.expectation_mode != "every" or not num_rows:
+            return
+
+        first = self.trial_log.count if first_round is None else first_round
+        last = first + num_rows - 1
+        if self.last_expectations is None or (
+            last // self.expectation_every != (first - 1) // self.expectation_every
+        ):
+            expectations = self.bandit.predict_expectations()
+            self.last_expectations = np.round([expectations[arm] for arm in self.arm_ids], decimals)
+        self.expectation_log.extend(
+            np.broadcast_to(self.last_expectations, (num_rows, len(self.arm_ids)))
+        )
+
+    def _update_logs(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
         """
         Update cumulative logs based on historical data.
 
-        This method updates the cumulative logs for each arm based on historical data.
+        This method updates the sufficient statistics and the cumulative logs for each arm
+        based on historical data: a single round is appended in O(1), several rounds are
+        added in bulk with a cumulative sum over their one-hot encoded arms.
 
         Args:
-            arms_pulled (List[Any]): List of arms pulled in each round.
-            rewards (List[float]): List of rewards received in each round.
+            arm_codes (np.ndarray): Codes (indices into arm_ids) of the arms pulled in each round.
+            rewards (np.ndarray): Rewards received in each round.
 
         """
-        for arm_pulled, reward in zip(arms_pulled, rewards):
-            for arm in self.arm_ids:
-
-                # take last value from history or 0 if there is no history (empty list)
-                prev_arm = self.arm_pull_cum_log[arm][-1] if self.arm_pull_cum_log[arm] else 0
-                prev_reward = (
-                    self.arm_reward_cum_log[arm][-1] if self.arm_reward_cum_log[arm] else 0
-                )
-
-                # increment value of pulled arm, for others use value of previous step;
-                # this is because at each step only 1 arm was pulled, but
-                # we need to keep timeline equal for all arms (to plot it on 1 graph),
-                # hence is usage of last value of unpulled arms
-                if arm == arm_pulled:
-                    self.arm_pull_cum_log[arm].append(prev_arm + 1)
-                    self.arm_reward_cum_log[arm].append(prev_reward + reward)
-                    self.arm_reward_log[arm].append(reward)
-                else:
-                    self.arm_pull_cum_log[arm].append(prev_arm)
-                    self.arm_reward_cum_log[arm].append(prev_reward)
-                    self.arm_reward_log[arm].append(0)
+        # at each step only 1 arm is pulled, but the timeline is kept equal for all arms
+        # (to plot it on 1 graph), hence unpulled arms repeat the value of the previous step
+        first_round = self.trial_log.count
+        if len(arm_codes) == 1:
+            code, reward = int(arm_codes[0]), float(rewards[0])
+            self.stats.add(code, reward)
+            self.trial_log.append(np.array([code, reward]))
+            pulls = self.pull_cum_log.last().copy()
+            pulls[code] += 1
+            cum_rewards = self.reward_cum_log.last().copy()
+            cum_rewards[code] += reward
+            round_rewards = np.zeros(len(self.arm_ids))
+            round_rewards[code] = reward
+            self.pull_cum_log.append(pulls)
+            self.reward_cum_log.append(cum_rewards)
+            self.reward_log.append(round_rewards)
+            self._update_regret(np.array([code]), pulls[None, :], first_round)
+            return
+
+        arm_codes = np.asarray(arm_codes, dtype=int)
+        rewards = np.asarray(rewards, dtype=float)
+        self.stats.update(arm_codes, rewards)
+        self.trial_log.extend(np.column_stack([arm_codes, rewards]))
+
+        one_hot = np.zeros((len(arm_codes), len(self.arm_ids)), dtype=int)
+        one_hot[np.arange(len(arm_codes)), arm_codes] = 1
+        round_rewards = one_hot * rewards[:, None]
+
+        pulls = self.pull_cum_log.last() + np.cumsum(one_hot, axis=0)
+        self.pull_cum_log.extend(pulls)
+        self.reward_cum_log.extend(self.reward_cum_log.last() + np.cumsum(round_rewards, axis=0))
+        self.reward_log.extend(round_rewards)
+        self._update_regret(arm_codes, pulls, first_round)
 
     def next_round(self) -> None:
         """
@@ -139,23 +482,124 @@ class MultiArmedBandit:
         chosen_arm = self.bandit.predict()
         reward = self.rg.pull_arm(chosen_arm)
         self.bandit.partial_fit([chosen_arm], [reward])
-        self.arms_log.append(chosen_arm)
-        self.rewards_log.append(reward)
+        self._log_round(chosen_arm, reward)
+
+    def _log_round(self, chosen_arm: Any, reward: float) -> None:
+        """
+        Append a single round to the logs.
+
+        Args:
+            chosen_arm (Any): The arm pulled in the round.
+            reward (float): The reward it generated.
+        """
+        self._log_expectations(1)
+        self._update_logs([self.arm_codes[chosen_arm]], [reward])
+
+    def next_batch(self, k: int) -> List[Any]:
+        """
+        Choose the arms of the next k rounds with a single evaluation of the policy.
+
+        The k decisions are taken as if none of their rewards were known yet, e.g. for
+        Thompson sampling from a single (k, number of arms) matrix of posterior draws.
+
+        Args:
+            k (int): The number of decisions.
+
+        Returns:
+            List[Any]: The chosen arms.
+        """
+        if self.bandit is None:
+            raise ValueError(
+                "Bandit model has not been trained yet. Please call fit() method first."
+            )
 
-        for arm, expectation in self.bandit.predict_expectations().items():
-            self.expectations_log[arm].append(np.round(expectation, 4))
+        if isinstance(self.bandit, NativeMAB):
+            return self.bandit.predict(k)
+        # context-free mabwiser policies take one decision per (dummy) context row
+        decisions = self.bandit.predict(np.zeros((k, 1)))
+        return decisions if isinstance(decisions, list) else [decisions]
+
+    def update(self, arms: List[Any], rewards: List[float]) -> None:
+        """
+        Pass the rewards of a batch of rounds to the model with a single partial_fit.
+
+        Every round of the batch is logged with the expectations after the update.
+
+        Args:
+            arms (List[Any]): The arms pulled, in the order of the rounds.
+            rewards (List[float]): The corresponding rewards.
+        """
+        if not len(arms):
+            return
+        self.bandit.partial_fit(list(arms), list(rewards))
 
-        self._update_logs([chosen_arm], [reward])
+        self._log_expectations(len(arms))
+        arm_codes = np.fromiter((self.arm_codes[arm] for arm in arms), int, len(arms))
+        self._update_logs(arm_codes, np.asarray(rewards, dtype=float))
 
-    def run_n_rounds(self, num_rounds: int) -> None:
+    def run_n_rounds(self, num_rounds: int, update_every: int = 1) -> None:
         """
         Run the bandit algorithm for a specified number of rounds.
 
         Args:
             num_rounds (int): The number of rounds to run the bandit algorithm.
+            update_every (int): The number of pulls between two updates of the model. With
+                the default of 1 the model learns from every reward before the next decision;
+                larger values choose and pull whole batches at once (see next_batch), which is
+                much faster, like a production system that retrains periodically.
+        """
+        if update_every == 1:
+            for _ in range(num_rounds):
+                self.next_round()
+            return
+
+        for start in range(0, num_rounds, update_every):
+            arms = self.next_batch(min(update_every, num_rounds - start))
+            self.update(arms, self.rg.pull_arms(arms))
+
+    def run_n_rounds_delayed(
+        self, num_rounds: int, delay_config: Dict[str, Any], round_duration: float = 1.0
+    ) -> None:
+        """
+        Run the bandit algorithm with rewards that arrive only after a delay.
+
+        Every pull gets a delay sampled from delay_config and its reward waits in the
+        arrival queue. Simulated time advances by round_duration per round and all rewards
+        that arrived by then are passed to the model in a single partial_fit. The logs
+        record rewards at decision time; rewards still in flight stay in the queue.
+
+        Args:
+            num_rounds (int): The number of rounds to run the bandit algorithm.
+            delay_config (Dict[str, Any]): The delay distribution, given like an arm config,
+                e.g. {"distribution": "lognormal", "params": [3.0, 1.0]}. Negative delays
+                are treated as zero.
+            round_duration (float): The simulated time between two decisions.
+        """
+        if self.bandit is None:
+            raise ValueError(
+                "Bandit model has not been trained yet. Please call fit() method first."
+            )
+
+        distribution = DISTRIBUTIONS[delay_config["distribution"]]
+        delays = distribution.sample(self.rng, *delay_config.get("params", []), size=num_rounds)
+
+        for delay in np.maximum(delays, 0):
+            chosen_arm = self.bandit.predict()
+            reward = self.rg.pull_arm(chosen_arm)
+            self.arrival_queue.push(self.clock + delay, chosen_arm, reward)
+            self.clock += round_duration
+
+            if self.arrival_queue.next_arrival() <= self.clock:
+                self.bandit.partial_fit(*self.arrival_queue.pop_until(self.clock))
+            self._log_round(chosen_arm, reward)
+
+    def flush_feedback(self) -> None:
+        """
+        Deliver all rewards still in flight to the model, regardless of their arrival time.
         """
-        for _ in range(num_rounds):
-            self.next_round()
+        arms, rewards = self.arrival_queue.pop_until(float("inf"))
+        if arms:
+            self.bandit.partial_fit(arms, rewards)
 
 
 # Example usage:
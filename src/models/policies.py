@@ -0,0 +1,692 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+class Policy:
+    """
+    Base class of the native bandit policies.
+
+    Policies keep per-arm sufficient statistics (counts and reward sums) in NumPy arrays,
+    so a decision costs O(arms) and an update O(1). Arms are referred to by their codes,
+    i.e. their indices in the list of arms.
+    """
+
+    # whether statistics aggregated elsewhere can be merged, and whether merging adds
+    # them up exactly, as if the rewards had been observed one by one
+    mergeable = True
+    additive = True
+
+    def __init__(self, num_arms: int, seed: Optional[int] = None) -> None:
+        """
+        Initialize the Policy.
+
+        Args:
+            num_arms (int): The number of arms.
+            seed (Optional[int]): Seed for random number generation.
+        """
+        self.num_arms = num_arms
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget all observed rewards.
+        """
+        self.counts = np.zeros(self.num_arms, dtype=np.int64)
+        self.sums = np.zeros(self.num_arms)
+        self.total = 0
+
+    def _transform(self, rewards: np.ndarray) -> np.ndarray:
+        """
+        Transform rewards before they enter the statistics, e.g. to binarize them.
+        """
+        return rewards
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        """
+        Add observed rewards to the statistics.
+
+        Args:
+            arm_codes (np.ndarray): The codes of the arms pulled.
+            rewards (np.ndarray): The corresponding rewards.
+        """
+        rewards = self._transform(np.asarray(rewards, dtype=float))
+        if len(rewards) == 1:
+            code = int(arm_codes[0])
+            self.counts[code] += 1
+            self.sums[code] += rewards[0]
+        else:
+            self.counts += np.bincount(arm_codes, minlength=self.num_arms)
+            self.sums += np.bincount(arm_codes, weights=rewards, minlength=self.num_arms)
+        self.total += len(rewards)
+
+    def merge(self, counts: np.ndarray, sums: np.ndarray, sq_sums: np.ndarray) -> None:
+        """
+        Add statistics aggregated elsewhere, e.g. by concurrent accumulators.
+
+        Args:
+            counts (np.ndarray): The number of pulls of every arm.
+            sums (np.ndarray): The sum of the transformed rewards of every arm.
+            sq_sums (np.ndarray): The sum of the squared rewards of every arm.
+        """
+        self.counts += counts.astype(self.counts.dtype)
+        self.sums += sums
+        self.total += int(counts.sum())
+
+    @property
+    def means(self) -> np.ndarray:
+        """
+        The mean reward of every arm, 0 for arms not pulled yet.
+        """
+        return np.divide(
+            self.sums, self.counts, out=np.zeros_like(self.sums), where=self.counts > 0
+        )
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        """
+        Return the expectation of every arm the next decision(s) are based on.
+
+        Args:
+            num (Optional[int]): If given, expectations for this many decisions are drawn
+                at once, as if they were taken before any of their rewards are known.
+
+        Returns:
+            np.ndarray: One value per arm, or an array of shape (num, number of arms).
+        """
+        raise NotImplementedError
+
+    def choose(self, num: Optional[int] = None) -> Union[int, np.ndarray]:
+        """
+        Choose the arm to pull next, or the arms of the next num pulls at once.
+
+        Args:
+            num (Optional[int]): The number of decisions taken with a single evaluation.
+
+        Returns:
+            Union[int, np.ndarray]: The code of the chosen arm, or an array of num codes.
+        """
+        if num is None:
+            return int(np.argmax(self.expectations()))
+        return np.argmax(self.expectations(num), axis=1)
+
+
+class EpsilonGreedy(Policy):
+    """
+    Pull the arm with the best mean reward, or a random arm with probability epsilon.
+    """
+
+    def __init__(self, num_arms: int, seed: Optional[int] = None, epsilon: float = 0.05) -> None:
+        super().__init__(num_arms, seed)
+        self.epsilon = epsilon
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        if num is None:
+            if self.rng.random() < self.epsilon:
+                return self.rng.random(self.num_arms)
+            return self.means
+        explore = self.rng.random(num) < self.epsilon
+        expectations = np.tile(self.means, (num, 1))
+        expectations[explore] = self.rng.random((int(explore.sum()), self.num_arms))
+        return expectations
+
+
+class Softmax(Policy):
+    """
+    Pull arms according to the softmax of their mean rewards with temperature tau.
+
+    Like mabwiser, the decision is the arm with the highest value of a Dirichlet draw
+    parameterized by the softmax probabilities.
+    """
+
+    def __init__(self, num_arms: int, seed: Optional[int] = None, tau: float = 1.0) -> None:
+        super().__init__(num_arms, seed)
+        self.tau = tau
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Return the softmax probabilities of the arms.
+
+        Returns:
+            np.ndarray: One probability per arm.
+        """
+        means = self.means
+        exponents = np.exp((means - means.max()) / self.tau)
+        return exponents / exponents.sum()
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        if num is None:
+            return self.probabilities()
+        return np.tile(self.probabilities(), (num, 1))
+
+    def choose(self, num: Optional[int] = None) -> Union[int, np.ndarray]:
+        # the argmax of a Dirichlet draw is the argmax of its unnormalized gamma draws
+        alpha = self.probabilities() + np.finfo(float).eps
+        if num is None:
+            return int(np.argmax(self.rng.standard_gamma(alpha)))
+        return np.argmax(self.rng.standard_gamma(alpha, size=(num, self.num_arms)), axis=1)
+
+
+class UCB1(Policy):
+    """
+    Pull the arm with the highest upper confidence bound of its mean reward.
+    """
+
+    def __init__(self, num_arms: int, seed: Optional[int] = None, alpha: float = 1.0) -> None:
+        super().__init__(num_arms, seed)
+        self.alpha = alpha
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        # arms not pulled yet have an expectation of 0, as in mabwiser
+        pulled = self.counts > 0
+        bonus = np.zeros(self.num_arms)
+        if self.total:
+            bonus[pulled] = self.alpha * np.sqrt(2 * np.log(self.total) / self.counts[pulled])
+        expectations = np.where(pulled, self.means + bonus, 0.0)
+        if num is None:
+            return expectations
+        return np.tile(expectations, (num, 1))
+
+
+class ThompsonSampling(Policy):
+    """
+    Pull the arm with the highest draw from its Beta posterior over binarized rewards.
+    """
+
+    def __init__(
+        self, num_arms: int, seed: Optional[int] = None, threshold: float = 0.5
+    ) -> None:
+        super().__init__(num_arms, seed)
+        self.threshold = threshold
+
+    def _transform(self, rewards: np.ndarray) -> np.ndarray:
+        return (rewards > self.threshold).astype(float)
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        size = None if num is None else (num, self.num_arms)
+        return self.rng.beta(1 + self.sums, 1 + self.counts - self.sums, size=size)
+
+
+class BetaThompsonSampling(ThompsonSampling):
+    """
+    Thompson sampling with a Beta posterior updated by fractional rewards.
+
+    A reward r in [0, 1] counts as r successes and 1 - r failures, which keeps the
+    information binarizing throws away; rewards outside [0, 1] are clipped.
+    """
+
+    def __init__(
+        self,
+        num_arms: int,
+        seed: Optional[int] = None,
+        prior_alpha: float = 1.0,
+        prior_beta: float = 1.0,
+    ) -> None:
+        super().__init__(num_arms, seed)
+        self.prior_alpha = prior_alpha
+        self.prior_beta = prior_beta
+
+    def _transform(self, rewards: np.ndarray) -> np.ndarray:
+        return np.clip(rewards, 0.0, 1.0)
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        size = None if num is None else (num, self.num_arms)
+        return self.rng.beta(
+            self.prior_alpha + self.sums, self.prior_beta + self.counts - self.sums, size=size
+        )
+
+
+class GaussianThompsonSampling(Policy):
+    """
+    Thompson sampling for Gaussian rewards of unknown mean and variance.
+
+    Every arm has a Normal-Inverse-Gamma posterior computed from its count, sum and sum
+    of squares. A draw samples the variance from its Inverse-Gamma posterior and then the
+    mean from its Normal posterior given that variance.
+    """
+
+    def __init__(
+        self,
+        num_arms: int,
+        seed: Optional[int] = None,
+        prior_mean: float = 0.5,
+        prior_count: float = 1.0,
+        prior_shape: float = 1.0,
+        prior_rate: float = 0.01,
+    ) -> None:
+        """
+        Initialize the GaussianThompsonSampling.
+
+        Args:
+            num_arms (int): The number of arms.
+            seed (Optional[int]): Seed for random number generation.
+            prior_mean (float): The prior mean of the rewards.
+            prior_count (float): The number of pseudo-observations behind the prior mean.
+            prior_shape (float): The shape of the Inverse-Gamma prior of the variance.
+            prior_rate (float): The rate of the Inverse-Gamma prior of the variance.
+        """
+        self.prior_mean = prior_mean
+        self.prior_count = prior_count
+        self.prior_shape = prior_shape
+        self.prior_rate = prior_rate
+        super().__init__(num_arms, seed)
+
+    def reset(self) -> None:
+        super().reset()
+        self.sq_sums = np.zeros(self.num_arms)
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        rewards = np.asarray(rewards, dtype=float)
+        super().update(arm_codes, rewards)
+        if len(rewards) == 1:
+            self.sq_sums[int(arm_codes[0])] += rewards[0] * rewards[0]
+        else:
+            self.sq_sums += np.bincount(arm_codes, weights=rewards**2, minlength=self.num_arms)
+
+    def merge(self, counts: np.ndarray, sums: np.ndarray, sq_sums: np.ndarray) -> None:
+        super().merge(counts, sums, sq_sums)
+        self.sq_sums += sq_sums
+
+    def posterior(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the parameters of the Normal-Inverse-Gamma posterior of every arm.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The posterior mean,
+            count, shape and rate, one value per arm each.
+        """
+        counts = self.prior_count + self.counts
+        means = (self.prior_count * self.prior_mean + self.sums) / counts
+        shapes = self.prior_shape + self.counts / 2
+        # squared deviations from the sample mean, plus the shift of the prior mean
+        deviations = np.maximum(self.sq_sums - self.sums * self.means, 0)
+        shift = self.prior_count * self.counts / counts * (self.means - self.prior_mean) ** 2
+        rates = self.prior_rate + (deviations + np.where(self.counts > 0, shift, 0)) / 2
+        return means, counts, shapes, rates
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        means, counts, shapes, rates = self.posterior()
+        size = self.num_arms if num is None else (num, self.num_arms)
+        variances = rates / self.rng.gamma(shapes, size=size)
+        return means + np.sqrt(variances / counts) * self.rng.standard_normal(size)
+
+
+class SlidingWindowStatistics(Policy):
+    """
+    Statistics over the last window pulls only, for non-stationary rewards.
+
+    The pulls of the window live in a ring buffer of arm codes and rewards; every update
+    adds the new pull to the counts and sums and subtracts the one it evicts, so it costs
+    O(1) whatever the window length. The sums are recomputed from the buffer once per
+    revolution of the ring, which bounds the rounding errors of the subtractions at
+    O(1) amortized cost.
+
+    Combined with a stationary policy, e.g. SlidingWindowUCB(SlidingWindowStatistics, UCB1),
+    which then bases its decisions on the windowed statistics.
+    """
+
+    window: int
+    mergeable = False
+
+    def reset(self) -> None:
+        super().reset()
+        self.sq_sums = np.zeros(self.num_arms)
+        self.window_codes = np.zeros(self.window, dtype=np.int64)
+        self.window_rewards = np.zeros(self.window)
+        self.position = 0
+
+    def _recompute(self) -> None:
+        """
+        Recompute the statistics from the pulls of the window.
+        """
+        codes, rewards = self.window_codes[: self.total], self.window_rewards[: self.total]
+        self.counts = np.bincount(codes, minlength=self.num_arms)
+        self.sums = np.bincount(codes, weights=rewards, minlength=self.num_arms)
+        self.sq_sums = np.bincount(codes, weights=rewards**2, minlength=self.num_arms)
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        rewards = self._transform(np.asarray(rewards, dtype=float))
+        num = len(rewards)
+        if num == 1:
+            code, reward = int(arm_codes[0]), float(rewards[0])
+            slot = self.position
+            if self.total == self.window:
+                evicted, evicted_reward = self.window_codes[slot], self.window_rewards[slot]
+                self.counts[evicted] -= 1
+                self.sums[evicted] -= evicted_reward
+                self.sq_sums[evicted] -= evicted_reward * evicted_reward
+            else:
+                self.total += 1
+            self.window_codes[slot], self.window_rewards[slot] = code, reward
+            self.counts[code] += 1
+            self.sums[code] += reward
+            self.sq_sums[code] += reward * reward
+            self.position = (slot + 1) % self.window
+            if self.position == 0:
+                self._recompute()
+            return
+
+        arm_codes = np.asarray(arm_codes, dtype=np.int64)
+        if num >= self.window:
+            # the batch alone fills the window
+            self.window_codes[:] = arm_codes[-self.window :]
+            self.window_rewards[:] = rewards[-self.window :]
+            self.position, self.total = 0, self.window
+            self._recompute()
+            return
+
+        slots = (self.position + np.arange(num)) % self.window
+        evicted = slots[slots < self.total]
+        evicted_codes, evicted_rewards = self.window_codes[evicted], self.window_rewards[evicted]
+        self.counts += np.bincount(arm_codes, minlength=self.num_arms) - np.bincount(
+            evicted_codes, minlength=self.num_arms
+        )
+        self.sums += np.bincount(arm_codes, weights=rewards, minlength=self.num_arms)
+        self.sums -= np.bincount(evicted_codes, weights=evicted_rewards, minlength=self.num_arms)
+        self.sq_sums += np.bincount(arm_codes, weights=rewards**2, minlength=self.num_arms)
+        self.sq_sums -= np.bincount(
+            evicted_codes, weights=evicted_rewards**2, minlength=self.num_arms
+        )
+        self.window_codes[slots], self.window_rewards[slots] = arm_codes, rewards
+        self.total = min(self.total + num, self.window)
+        wrapped = self.position + num >= self.window
+        self.position = (self.position + num) % self.window
+        if wrapped:
+            self._recompute()
+
+    def merge(self, counts: np.ndarray, sums: np.ndarray, sq_sums: np.ndarray) -> None:
+        raise ValueError("Sliding-window statistics need the order of the rewards to be merged")
+
+
+class DiscountedStatistics(Policy):
+    """
+    Exponentially discounted statistics, for non-stationary rewards.
+
+    Every round multiplies the counts and sums of all arms by gamma before the new pull
+    is added. Instead of touching every arm, the accumulators store the pulls weighted by
+    gamma^-round and are divided by that global scale when read, so an update costs O(1).
+    When the scale exceeds max_scale the accumulators are normalized at O(arms), i.e.
+    once every ln(max_scale) / -ln(gamma) rounds: about 23,000 rounds for gamma = 0.99
+    and 230,000 for gamma = 0.999. Batch updates always normalize.
+
+    Combined with a stationary policy, e.g. DiscountedUCB(DiscountedStatistics, UCB1),
+    which then bases its decisions on the discounted statistics.
+    """
+
+    gamma: float
+    max_scale = 1e100
+    additive = False
+
+    def reset(self) -> None:
+        self.scaled_counts = np.zeros(self.num_arms)
+        self.scaled_sums = np.zeros(self.num_arms)
+        self.scaled_sq_sums = np.zeros(self.num_arms)
+        self.scale = 1.0
+
+    @property
+    def counts(self) -> np.ndarray:
+        return self.scaled_counts / self.scale
+
+    @property
+    def sums(self) -> np.ndarray:
+        return self.scaled_sums / self.scale
+
+    @property
+    def sq_sums(self) -> np.ndarray:
+        return self.scaled_sq_sums / self.scale
+
+    @property
+    def total(self) -> float:
+        return float(self.scaled_counts.sum() / self.scale)
+
+    def _normalize(self) -> None:
+        """
+        Divide the accumulators by the scale and start over from a scale of one.
+        """
+        self.scaled_counts /= self.scale
+        self.scaled_sums /= self.scale
+        self.scaled_sq_sums /= self.scale
+        self.scale = 1.0
+
+    def _add(self, counts: np.ndarray, sums: np.ndarray, sq_sums: np.ndarray, num: int) -> None:
+        """
+        Discount the statistics by num rounds and add the given ones.
+        """
+        self._normalize()
+        decay = self.gamma**num
+        self.scaled_counts = self.scaled_counts * decay + counts
+        self.scaled_sums = self.scaled_sums * decay + sums
+        self.scaled_sq_sums = self.scaled_sq_sums * decay + sq_sums
+
+    def update(self, arm_codes: np.ndarray, rewards: np.ndarray) -> None:
+        rewards = self._transform(np.asarray(rewards, dtype=float))
+        num = len(rewards)
+        if num == 1:
+            code, reward = int(arm_codes[0]), float(rewards[0])
+            self.scale /= self.gamma
+            self.scaled_counts[code] += self.scale
+            self.scaled_sums[code] += self.scale * reward
+            self.scaled_sq_sums[code] += self.scale * reward * reward
+            if self.scale > self.max_scale:
+                self._normalize()
+            return
+
+        # the weight of every pull is its discount at the end of the batch
+        weights = self.gamma ** np.arange(num - 1, -1, -1, dtype=float)
+        self._add(
+            np.bincount(arm_codes, weights=weights, minlength=self.num_arms),
+            np.bincount(arm_codes, weights=weights * rewards, minlength=self.num_arms),
+            np.bincount(arm_codes, weights=weights * rewards**2, minlength=self.num_arms),
+            num,
+        )
+
+    def merge(self, counts: np.ndarray, sums: np.ndarray, sq_sums: np.ndarray) -> None:
+        # the aggregated rewards count as observed in the current round
+        self._add(counts.astype(float), sums, sq_sums, int(counts.sum()))
+
+
+class SlidingWindowUCB(SlidingWindowStatistics, UCB1):
+    """
+    UCB1 on the last window pulls (SW-UCB); arms without pulls in the window come first.
+    """
+
+    def __init__(
+        self, num_arms: int, seed: Optional[int] = None, alpha: float = 1.0, window: int = 1000
+    ) -> None:
+        self.window = window
+        super().__init__(num_arms, seed, alpha)
+
+    def expectations(self, num: Optional[int] = None) -> np.ndarray:
+        # unlike stationary UCB1, arms can drop out of the window and must be tried again
+        expectations = np.where(self.counts > 0, super().expectations(), np.inf)
+        if num is None:
+            return expectations
+        return np.tile(expectations, (num, 1))
+
+
+class DiscountedUCB(DiscountedStatistics, UCB1):
+    """
+    UCB1 on discounted statistics (D-UCB): the bonus of an arm grows as its pulls fade.
+    """
+
+    def __init__(
+        self, num_arms: int, seed: Optional[int] = None, alpha: float = 1.0, gamma: float = 0.99
+    ) -> None:
+        self.gamma = gamma
+        super().__init__(num_arms, seed, alpha)
+
+
+class SlidingWindowThompsonSampling(SlidingWindowStatistics, GaussianThompsonSampling):
+    """
+    Gaussian Thompson sampling on the last window pulls.
+    """
+
+    def __init__(
+        self,
+        num_arms: int,
+        seed: Optional[int] = None,
+        window: int = 1000,
+        prior_mean: float = 0.5,
+        prior_count: float = 1.0,
+        prior_shape: float = 1.0,
+        prior_rate: float = 0.01,
+    ) -> None:
+        self.window = window
+        super().__init__(num_arms, seed, prior_mean, prior_count, prior_shape, prior_rate)
+
+
+class DiscountedThompsonSampling(DiscountedStatistics, GaussianThompsonSampling):
+    """
+    Gaussian Thompson sampling on discounted statistics, i.e. with fractional pseudo-counts.
+    """
+
+    def __init__(
+        self,
+        num_arms: int,
+        seed: Optional[int] = None,
+        gamma: float = 0.99,
+        prior_mean: float = 0.5,
+        prior_count: float = 1.0,
+        prior_shape: float = 1.0,
+        prior_rate: float = 0.01,
+    ) -> None:
+        self.gamma = gamma
+        super().__init__(num_arms, seed, prior_mean, prior_count, prior_shape, prior_rate)
+
+
+POLICIES: Dict[str, type] = {
+    "epsilon_greedy": EpsilonGreedy,
+    "softmax": Softmax,
+    "ucb": UCB1,
+    "thompson_sampling": ThompsonSampling,
+    "beta_thompson": BetaThompsonSampling,
+    "gaussian_thompson": GaussianThompsonSampling,
+    "sliding_window_ucb": SlidingWindowUCB,
+    "discounted_ucb": DiscountedUCB,
+    "sliding_window_thompson": SlidingWindowThompsonSampling,
+    "discounted_thompson": DiscountedThompsonSampling,
+}
+
+
+def expectations_from_stats(
+    method: str, method_params: Optional[Dict[str, Any]], counts: np.ndarray, sums: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the deterministic part of the expectations of a policy from its statistics.
+
+    The statistics may have any number of leading dimensions, e.g. one row per round of
+    the cumulative logs, so whole expectation series are rebuilt in a single pass. The
+    random parts of the policies are left out: epsilon-greedy and Thompson sampling variants give
+    the mean rewards, softmax its probabilities and UCB1 its upper confidence bounds. The
+    sliding-window and discounted variants give the means of the cumulative statistics.
+
+    Args:
+        method (str): The policy, one of the keys of POLICIES.
+        method_params (Optional[Dict[str, Any]]): Parameters of the policy.
+        counts (np.ndarray): The number of pulls of every arm, arms along the last axis.
+        sums (np.ndarray): The sum of the rewards of every arm, in the same shape.
+
+    Returns:
+        np.ndarray: The expectations, in the shape of counts.
+
+    Raises:
+        ValueError: If the method is not supported.
+    """
+    if method not in POLICIES:
+        raise ValueError(f"Unsupported bandit method: '{method}'")
+    method_params = method_params or {}
+    counts = np.asarray(counts, dtype=float)
+    pulled = counts > 0
+    means = np.divide(sums, counts, out=np.zeros_like(counts), where=pulled)
+
+    if method == "softmax":
+        tau = method_params.get("tau", 1.0)
+        exponents = np.exp((means - means.max(axis=-1, keepdims=True)) / tau)
+        return exponents / exponents.sum(axis=-1, keepdims=True)
+    if method == "ucb":
+        total = counts.sum(axis=-1, keepdims=True)
+        log_total = np.log(total, out=np.zeros_like(total), where=total > 0)
+        bonus = np.sqrt(np.divide(2 * log_total, counts, out=np.zeros_like(counts), where=pulled))
+        return np.where(pulled, means + method_params.get("alpha", 1.0) * bonus, 0.0)
+    return means
+
+
+class NativeMAB:
+    """
+    Native bandit engine with the context-free interface of mabwiser's MAB.
+    """
+
+    def __init__(
+        self,
+        arms: List[Any],
+        method: str,
+        method_params: Optional[Dict[str, Any]] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Initialize the NativeMAB.
+
+        Args:
+            arms (List[Any]): The arms to choose from.
+            method (str): The policy, one of the keys of POLICIES.
+            method_params (Optional[Dict[str, Any]]): Parameters of the policy.
+            seed (Optional[int]): Seed for random number generation.
+
+        Raises:
+            ValueError: If the method is not supported.
+        """
+        if method not in POLICIES:
+            raise ValueError(f"Unsupported bandit method: '{method}'")
+        self.arms = list(arms)
+        self.arm_codes = {arm: code for code, arm in enumerate(self.arms)}
+        self.policy: Policy = POLICIES[method](len(self.arms), seed, **(method_params or {}))
+
+    def _encode(self, decisions: List[Any]) -> np.ndarray:
+        """
+        Map arms to their codes.
+        """
+        return np.fromiter((self.arm_codes[arm] for arm in decisions), np.int64, len(decisions))
+
+    def fit(self, decisions: List[Any], rewards: List[float]) -> None:
+        """
+        Train the policy from scratch.
+
+        Args:
+            decisions (List[Any]): The arms pulled.
+            rewards (List[float]): The corresponding rewards.
+        """
+        self.policy.reset()
+        self.partial_fit(decisions, rewards)
+
+    def partial_fit(self, decisions: List[Any], rewards: List[float]) -> None:
+        """
+        Update the policy with additional observations.
+
+        Args:
+            decisions (List[Any]): The arms pulled.
+            rewards (List[float]): The corresponding rewards.
+        """
+        self.policy.update(self._encode(decisions), rewards)
+
+    def predict(self, num: Optional[int] = None) -> Union[Any, List[Any]]:
+        """
+        Choose the arm to pull next, or the arms of the next num pulls at once.
+
+        Args:
+            num (Optional[int]): The number of decisions taken with a single evaluation.
+
+        Returns:
+            Union[Any, List[Any]]: The chosen arm, or a list of num chosen arms.
+        """
+        if num is None:
+            return self.arms[self.policy.choose()]
+        return [self.arms[code] for code in self.policy.choose(num)]
+
+    def predict_expectations(self) -> Dict[Any, float]:
+        """
+        Return the expectation of every arm.
+
+        Returns:
+            Dict[Any, float]: The expectations by arm.
+        """
+        return dict(zip(self.arms, self.policy.expectations().tolist()))
@@ -0,0 +1,180 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+
+# per-round metrics written by the workers, one (jobs, rounds) array each
+METRICS: Dict[str, type] = {"arm_code": np.int64, "reward": np.float64, "regret": np.float64}
+
+
+def job_seeds(num_jobs: int, seed: int = 42) -> List[int]:
+    """
+    Derive the seed of every job from a single SeedSequence.
+
+    The seed of a job only depends on its index, not on the number of workers.
+
+    Args:
+        num_jobs (int): The number of jobs.
+        seed (int): The root seed.
+
+    Returns:
+        List[int]: One seed per job.
+    """
+    children = np.random.SeedSequence(seed).spawn(num_jobs)
+    return [int(child.generate_state(1)[0]) for child in children]
+
+
+def _run_job(
+    job_index: int,
+    job: Dict[str, Any],
+    seed: int,
+    num_fit_rounds: int,
+    num_rounds: int,
+    update_every: int,
+    block_names: Dict[str, str],
+    num_jobs: int,
+) -> int:
+    """
+    Run a single job and write its per-round metrics into the shared-memory arrays.
+
+    Args:
+        job_index (int): The row of the job in the result arrays.
+        job (Dict[str, Any]): The 'mab_config' and 'arms_config' of the job.
+        seed (int): The seed of the job.
+        num_fit_rounds (int): The number of exploration rounds.
+        num_rounds (int): The number of rounds run after the exploration phase.
+        update_every (int): The number of pulls between two updates of the model.
+        block_names (Dict[str, str]): The name of the shared-memory block of every metric.
+        num_jobs (int): The total number of jobs.
+
+    Returns:
+        int: The index of the job.
+    """
+    reward_generator = RewardGenerator(job["arms_config"], seed=seed)
+    # every round has to be kept to fill the result rows
+    config = {**job["mab_config"], "history": {"mode": "full"}}
+    bandit = MultiArmedBandit(reward_generator, config, seed)
+    bandit.fit(num_fit_rounds)
+    bandit.run_n_rounds(num_rounds, update_every)
+
+    trials = bandit.trial_log.values
+    arm_codes = trials[:, 0].astype(np.int64)
+    means = reward_generator.arm_means_at(np.arange(len(arm_codes)))
+    metrics = {
+        "arm_code": arm_codes,
+        "reward": trials[:, 1],
+        "regret": means.max(axis=0) - means[arm_codes, np.arange(len(arm_codes))],
+    }
+
+    for name, dtype in METRICS.items():
+        block = shared_memory.SharedMemory(name=block_names[name])
+        values = np.ndarray((num_jobs, num_fit_rounds + num_rounds), dtype, buffer=block.buf)
+        values[job_index] = metrics[name]
+        del values
+        block.close()
+    return job_index
+
+
+def run_experiments(
+    jobs: List[Dict[str, Any]],
+    num_fit_rounds: int,
+    num_rounds: int,
+    seed: int = 42,
+    max_workers: Optional[int] = None,
+    update_every: int = 1,
+) -> Tuple[Dict[str, np.ndarray], List[int]]:
+    """
+    Run bandit experiments in parallel on a process pool.
+
+    Every job runs a MultiArmedBandit on its own RewardGenerator. Workers write their
+    per-round metrics directly into shared memory, so only the job descriptions travel
+    between processes. Seeds come from one SeedSequence, so the results are the same
+    for any number of workers.
+
+    Args:
+        jobs (List[Dict[str, Any]]): The jobs, each with a 'mab_config' and an 'arms_config'.
+        num_fit_rounds (int): The number of exploration rounds of every job.
+        num_rounds (int): The number of rounds run after the exploration phase.
+        seed (int): The root seed of the jobs.
+        max_workers (Optional[int]): The number of worker processes, by default one per CPU.
+        update_every (int): The number of pulls between two updates of the models.
+
+    Returns:
+        Tuple[Dict[str, np.ndarray], List[int]]: The (jobs, rounds) arrays of the arm codes
+        pulled, the rewards and the pseudo-regret per round, and the seeds of the jobs.
+
+    Raises:
+        ValueError: If a job configures a best-arm identification phase, whose variable
+            number of rounds does not fit the fixed-size result rows.
+
+    Example:
+        >>> jobs = [{"mab_config": mab_config, "arms_config": arms_config}] * 64
+        >>> metrics, seeds = run_experiments(jobs, num_fit_rounds=100, num_rounds=10000)
+        >>> metrics["regret"].cumsum(axis=1).mean(axis=0)
+    """
+    if any(job["mab_config"].get("identification") for job in jobs):
+        raise ValueError("Experiments with an 'identification' phase are not supported")
+    seeds = job_seeds(len(jobs), seed)
+    shape = (len(jobs), num_fit_rounds + num_rounds)
+    blocks = {
+        name: shared_memory.SharedMemory(
+            create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+        )
+        for name, dtype in METRICS.items()
+    }
+    try:
+        block_names = {name: block.name for name, block in blocks.items()}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _run_job,
+                    job_index,
+                    job,
+                    seeds[job_index],
+                    num_fit_rounds,
+                    num_rounds,
+                    update_every,
+                    block_names,
+                    len(jobs),
+                )
+                for job_index, job in enumerate(jobs)
+            ]
+            for future in futures:
+                future.result()
+
+        metrics = {
+            name: np.ndarray(shape, dtype, buffer=blocks[name].buf).copy()
+            for name, dtype in METRICS.items()
+        }
+    finally:
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+    return metrics, seeds
+
+
+if __name__ == "__main__":
+    import os
+
+    from src.general.io import read_yaml
+
+    cfg = read_yaml("src/visualization/streamlit/default.yml")
+    jobs = [
+        {
+            "mab_config": {"method": method, "method_params": params},
+            "arms_config": cfg["arms_config"],
+        }
+        for method, params in cfg["mab_methods"].items()
+        for _ in range(16)
+    ]
+    for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        start = time.perf_counter()
+        metrics, _ = run_experiments(jobs, 100, 2000, max_workers=workers)
+        elapsed = time.perf_counter() - start
+        regret = metrics["regret"].sum(axis=1).mean()
+        print(f"{workers} workers: {elapsed:.1f}s, mean cumulative regret {regret:.3f}")
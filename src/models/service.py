@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from src.models.logs import RingLog
+from src.models.mab import MultiArmedBandit
+
+logger = logging.getLogger(__name__)
+
+
+class BanditService:
+    """
+    Asyncio HTTP service serving decisions of a trained MultiArmedBandit.
+
+    Endpoints:
+        GET /choose[?n=k]  -> {"arm": arm} or {"arms": [...]} for k decisions at once
+        POST /reward       <- {"arm": arm, "reward": r} or {"arms": [...], "rewards": [...]}
+        GET /stats         -> decision latency percentiles and counters
+
+    Decisions are served from the model in memory, which only changes when the buffered
+    rewards are applied: every batch_interval seconds (or once max_batch rewards are
+    waiting) all of them are passed to the model in a single update, i.e. one
+    partial_fit. The event loop runs the update without yielding, so decisions always
+    see a consistent snapshot of the policy.
+    """
+
+    def __init__(
+        self,
+        bandit: MultiArmedBandit,
+        batch_interval: float = 0.05,
+        max_batch: int = 10000,
+        latency_window: int = 100000,
+    ) -> None:
+        """
+        Initialize the BanditService.
+
+        Args:
+            bandit (MultiArmedBandit): The trained bandit.
+            batch_interval (float): The seconds between two updates of the model.
+            max_batch (int): The number of buffered rewards that triggers an update early.
+            latency_window (int): The number of most recent decisions the latency
+                percentiles are computed over.
+
+        Raises:
+            ValueError: If the bandit has not been trained yet.
+        """
+        if bandit.bandit is None:
+            raise ValueError(
+                "Bandit model has not been trained yet. Please call fit() method first."
+            )
+        self.bandit = bandit
+        self.batch_interval = batch_interval
+        self.max_batch = max_batch
+        self.latencies = RingLog(1, float, latency_window)
+        self.pending_arms: List[Any] = []
+        self.pending_rewards: List[float] = []
+        self.num_decisions = 0
+        self.num_rewards = 0
+        self.num_updates = 0
+        self.num_dropped = 0
+
+    def choose(self, num: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Choose an arm, or num arms with a single evaluation of the policy.
+
+        Args:
+            num (Optional[int]): The number of decisions.
+
+        Returns:
+            Dict[str, Any]: The response body.
+        """
+        start = time.perf_counter()
+        if num is None:
+            body: Dict[str, Any] = {"arm": self.bandit.bandit.predict()}
+            self.num_decisions += 1
+        else:
+            body = {"arms": self.bandit.next_batch(num)}
+            self.num_decisions += num
+        self.latencies.append(np.array([time.perf_counter() - start]))
+        return body
+
+    def reward(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Buffer observed rewards until the next update of the model.
+
+        Args:
+            body (Dict[str, Any]): The request body with an 'arm' and a 'reward', or
+                lists of 'arms' and 'rewards'.
+
+        Returns:
+            Dict[str, Any]: The response body with the number of buffered rewards.
+
+        Raises:
+            ValueError: If an arm is unknown, a reward is not a finite number or the
+                numbers of arms and rewards differ. Nothing is buffered in that case.
+        """
+        arms = body["arms"] if "arms" in body else [body["arm"]]
+        rewards = body["rewards"] if "rewards" in body else [body["reward"]]
+        if not isinstance(arms, list) or not isinstance(rewards, list):
+            raise ValueError("'arms' and 'rewards' must be lists")
+        if len(arms) != len(rewards):
+            raise ValueError(f"Got {len(arms)} arms but {len(rewards)} rewards")
+        unknown = [arm for arm in arms if arm not in self.bandit.arm_codes]
+        if unknown:
+            raise ValueError(f"Arm '{unknown[0]}' not found in configuration")
+        values = [float(reward) for reward in rewards]
+        if not all(math.isfinite(value) for value in values):
+            raise ValueError("Rewards must be finite numbers")
+        # the request is valid as a whole, only now the buffers change
+        self.pending_arms.extend(arms)
+        self.pending_rewards.extend(values)
+        if len(self.pending_arms) >= self.max_batch:
+            self.flush()
+        return {"pending": len(self.pending_arms)}
+
+    def flush(self) -> None:
+        """
+        Apply all buffered rewards to the model in a single update.
+
+        A batch the model rejects is dropped and logged, so it cannot block later updates.
+        """
+        if not self.pending_arms:
+            return
+        arms, rewards = self.pending_arms, self.pending_rewards
+        self.pending_arms, self.pending_rewards = [], []
+        try:
+            self.bandit.update(arms, rewards)
+        except Exception:
+            self.num_dropped += len(arms)
+            logger.exception("Dropped a batch of %d rewards the model rejected", len(arms))
+            return
+        self.num_rewards += len(arms)
+        self.num_updates += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return the decision latency percentiles (in milliseconds) and counters.
+
+        Returns:
+            Dict[str, Any]: The response body.
+        """
+        latencies = self.latencies.values[:, 0] * 1000
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (0.0, 0.0)
+        return {
+            "decisions": self.num_decisions,
+            "rewards": self.num_rewards,
+            "pending": len(self.pending_arms),
+            "updates": self.num_updates,
+            "dropped": self.num_dropped,
+            "latency_p50_ms": float(p50),
+            "latency_p99_ms": float(p99),
+        }
+
+    def route(self, method: str, target: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        """
+        Dispatch a request to its endpoint.
+
+        Args:
+            method (str): The HTTP method.
+            target (str): The request target, path and query.
+            body (bytes): The request body.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: The status code and the response body.
+        """
+        url = urlsplit(target)
+        try:
+            if method == "GET" and url.path == "/choose":
+                num = parse_qs(url.query).get("n")
+                return 200, self.choose(int(num[0]) if num else None)
+            if method == "POST" and url.path == "/reward":
+                return 200, self.reward(json.loads(body))
+            if method == "GET" and url.path == "/stats":
+                return 200, self.stats()
+        except (KeyError, TypeError, ValueError) as error:
+            return 400, {"error": str(error)}
+        return 404, {"error": f"Unknown endpoint: {method} {url.path}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serve the requests of a (keep-alive) HTTP/1.1 connection.
+        """
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = lines[0].split(" ", 2)
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, value in (line.split(":", 1) for line in lines[1:] if ":" in line)
+                }
+                length = int(headers.get("content-length", 0))
+                body = await reader.readexactly(length) if length else b""
+
+                status, response = self.route(method, target, body)
+                payload = json.dumps(response).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+                    .encode()
+                    + payload
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _update_periodically(self) -> None:
+        """
+        Apply the buffered rewards every batch_interval seconds.
+        """
+        while True:
+            await asyncio.sleep(self.batch_interval)
+            try:
+                self.flush()
+            except Exception:
+                # one failing update must not stop the service from learning
+                logger.exception("Periodic update failed")
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080) -> None:
+        """
+        Run the service until cancelled.
+
+        Args:
+            host (str): The interface to listen on.
+            port (int): The port to listen on.
+        """
+        server = await asyncio.start_server(self.handle, host, port)
+        updater = asyncio.create_task(self._update_periodically())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            updater.cancel()
+            self.flush()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from src.data.reward_generator import RewardGenerator
+    from src.general.io import read_yaml
+
+    parser = argparse.ArgumentParser(description="Serve bandit decisions over HTTP.")
+    parser.add_argument("--config", default="src/visualization/streamlit/default.yml")
+    parser.add_argument("--method", default="ucb")
+    parser.add_argument("--engine", default="native")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--batch-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    cfg = read_yaml(args.config)
+    mab_config = {
+        "method": args.method,
+        "method_params": cfg["mab_methods"].get(args.method, {}),
+        "engine": args.engine,
+        # bounded memory and no per-round model evaluations while serving
+        "history": {"mode": "ring", "size": 10000},
+        "expectations": {"mode": "stats"},
+    }
+    service_bandit = MultiArmedBandit(RewardGenerator(cfg["arms_config"]), mab_config)
+    service_bandit.fit(100)
+    service = BanditService(service_bandit, batch_interval=args.batch_interval)
+    print(f"Serving {args.method} on http://{args.host}:{args.port}")
+    asyncio.run(service.serve(args.host, args.port))
@@ -0,0 +1,310 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.data.reward_generator import RewardGenerator
+from src.models.policies import POLICIES
+
+# stationary counterparts of the sliding-window and discounted methods, which decide the
+# same way from their windowed or discounted statistics
+NON_STATIONARY_BASES = {
+    "sliding_window_ucb": "ucb",
+    "discounted_ucb": "ucb",
+    "sliding_window_thompson": "gaussian_thompson",
+    "discounted_thompson": "gaussian_thompson",
+}
+
+
+class ReplicatedSimulation:
+    """
+    Monte Carlo engine running many independent replications of a bandit at once.
+
+    The state of the policy is kept as (replications, arms) arrays of counts and reward
+    sums, so every round is a single vectorized step across all replications. Arms are
+    configured like for RewardGenerator (including drift); arms of the same distribution
+    with scalar params are sampled together with per-replication params. Sliding-window
+    methods also keep the (replications, window) arms and rewards of the last rounds, and
+    discounted methods discount all statistics every round.
+    """
+
+    def __init__(
+        self,
+        arms_config: Dict[str, Dict[str, Any]],
+        mab_config: Dict[str, Any],
+        num_replications: int = 1000,
+        seed: int = 42,
+    ) -> None:
+        """
+        Initialize the ReplicatedSimulation.
+
+        Args:
+            arms_config (Dict[str, Dict[str, Any]]): The configuration of the arms.
+            mab_config (Dict[str, Any]): The 'method' and 'method_params' of the bandit.
+            num_replications (int): The number of independent replications.
+            seed (int): Seed for random number generation.
+
+        Raises:
+            ValueError: If the method is not supported.
+        """
+        if mab_config["method"] not in POLICIES:
+            raise ValueError(f"Unsupported bandit method: '{mab_config['method']}'")
+        self.method: str = mab_config["method"]
+        self.method_params: Dict[str, Any] = mab_config.get("method_params") or {}
+        self.base_method: str = NON_STATIONARY_BASES.get(self.method, self.method)
+        self.window: Optional[int] = None
+        self.gamma: Optional[float] = None
+        if self.method.startswith("sliding_window"):
+            self.window = self.method_params.get("window", 1000)
+        elif self.method.startswith("discounted"):
+            self.gamma = self.method_params.get("gamma", 0.99)
+        self.num_replications: int = num_replications
+        # the generator provides the distributions, drift schedules and analytic means
+        self.rg = RewardGenerator(arms_config, seed=seed)
+        self.arm_ids: List[str] = self.rg.arm_ids
+        policy_seed, reward_seed = np.random.SeedSequence(seed).spawn(2)
+        self.rng: np.random.Generator = np.random.default_rng(policy_seed)
+        self.reward_rng: np.random.Generator = np.random.default_rng(reward_seed)
+        # cumulative regret of every replication at the end of the last run
+        self.final_regret: Optional[np.ndarray] = None
+
+        # arms sharing a distribution with scalar params are stacked into one group
+        groups: Dict[Any, List[int]] = {}
+        for code, arm_id in enumerate(self.arm_ids):
+            arm_config = self.rg.arm_configs[arm_id]
+            params = arm_config.get("params", [])
+            stackable = all(np.isscalar(param) for param in params)
+            key = (arm_config["distribution"], len(params)) if stackable else code
+            groups.setdefault(key, []).append(code)
+        self.groups: List[List[int]] = list(groups.values())
+        self.group_of: np.ndarray = np.empty(len(self.arm_ids), dtype=int)
+        for index, codes in enumerate(self.groups):
+            self.group_of[codes] = index
+
+    def _param_tables(self, rounds: np.ndarray) -> List[Optional[np.ndarray]]:
+        """
+        Tabulate the params of every stackable group for a chunk of rounds.
+
+        Args:
+            rounds (np.ndarray): The rounds of the chunk.
+
+        Returns:
+            List[Optional[np.ndarray]]: Per group an array of shape (number of params,
+            number of arms, number of rounds), or None if its params are not scalars.
+        """
+        tables: List[Optional[np.ndarray]] = []
+        for codes in self.groups:
+            params = self.rg.arm_configs[self.arm_ids[codes[0]]].get("params", [])
+            if not all(np.isscalar(param) for param in params):
+                tables.append(None)
+                continue
+            table = np.zeros((len(params), len(self.arm_ids), len(rounds)))
+            for code in codes:
+                arm_id = self.arm_ids[code]
+                if arm_id in self.rg.schedules:
+                    table[:, code] = np.stack(self.rg.schedules[arm_id].params_at(rounds))
+                else:
+                    arm_params = self.rg.arm_configs[arm_id].get("params", [])
+                    table[:, code] = np.asarray(arm_params, dtype=float)[:, None]
+            tables.append(table)
+        return tables
+
+    def _sample(
+        self, arm_codes: np.ndarray, tables: List[Optional[np.ndarray]], step: int
+    ) -> np.ndarray:
+        """
+        Draw the reward of the arm pulled in every replication.
+
+        Args:
+            arm_codes (np.ndarray): The code of the arm pulled in every replication.
+            tables (List[Optional[np.ndarray]]): The param tables of the chunk.
+            step (int): The position of the round in the chunk.
+
+        Returns:
+            np.ndarray: One reward per replication.
+        """
+        rewards = np.empty(len(arm_codes))
+        for index, codes in enumerate(self.groups):
+            if len(self.groups) == 1:
+                replications = np.arange(len(arm_codes))
+            else:
+                replications = np.flatnonzero(self.group_of[arm_codes] == index)
+                if not len(replications):
+                    continue
+            distribution = self.rg._get_distribution(self.arm_ids[codes[0]])
+            if tables[index] is None:
+                params = self.rg.arm_configs[self.arm_ids[codes[0]]].get("params", [])
+            else:
+                params = tables[index][:, arm_codes[replications], step]
+            rewards[replications] = distribution.sample(
+                self.reward_rng, *params, size=len(replications)
+            )
+        return rewards
+
+    def _choose(self, counts: np.ndarray, sums: np.ndarray, sq_sums: np.ndarray) -> np.ndarray:
+        """
+        Choose the next arm of every replication, like the native policies do.
+
+        Args:
+            counts (np.ndarray): The (replications, arms) numbers of pulls.
+            sums (np.ndarray): The (replications, arms) sums of the (transformed) rewards.
+            sq_sums (np.ndarray): The (replications, arms) sums of the squared rewards.
+
+        Returns:
+            np.ndarray: The code of the chosen arm of every replication.
+        """
+        num_replications, num_arms = counts.shape
+        pulled = counts > 0
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=pulled)
+
+        if self.base_method == "epsilon_greedy":
+            arm_codes = np.argmax(means, axis=1)
+            explore = self.rng.random(num_replications) < self.method_params.get("epsilon", 0.05)
+            arm_codes[explore] = self.rng.integers(num_arms, size=int(explore.sum()))
+            return arm_codes
+        if self.base_method == "softmax":
+            exponents = np.exp(
+                (means - means.max(axis=1, keepdims=True)) / self.method_params.get("tau", 1.0)
+            )
+            alpha = exponents / exponents.sum(axis=1, keepdims=True) + np.finfo(float).eps
+            return np.argmax(self.rng.standard_gamma(alpha), axis=1)
+        if self.base_method == "ucb":
+            total = counts.sum(axis=1, keepdims=True)
+            log_total = np.log(np.maximum(total, 1))
+            bonus = np.sqrt(np.divide(2 * log_total, counts, out=np.zeros_like(sums), where=pulled))
+            # arms that dropped out of the window are tried again first
+            unpulled = np.inf if self.window is not None else 0
+            expectations = np.where(
+                pulled, means + self.method_params.get("alpha", 1.0) * bonus, unpulled
+            )
+            return np.argmax(expectations, axis=1)
+        if self.base_method == "gaussian_thompson":
+            prior_mean = self.method_params.get("prior_mean", 0.5)
+            prior_count = self.method_params.get("prior_count", 1.0)
+            posterior_counts = prior_count + counts
+            deviations = np.maximum(sq_sums - sums * means, 0)
+            shift = prior_count * counts / posterior_counts * (means - prior_mean) ** 2
+            rates = self.method_params.get("prior_rate", 0.01) + (deviations + shift) / 2
+            shapes = self.method_params.get("prior_shape", 1.0) + counts / 2
+            variances = rates / self.rng.gamma(shapes)
+            draws = (prior_count * prior_mean + sums) / posterior_counts + np.sqrt(
+                variances / posterior_counts
+            ) * self.rng.standard_normal(counts.shape)
+            return np.argmax(draws, axis=1)
+        # Thompson sampling on binarized or fractional rewards
+        prior_alpha = self.method_params.get("prior_alpha", 1.0)
+        prior_beta = self.method_params.get("prior_beta", 1.0)
+        return np.argmax(self.rng.beta(prior_alpha + sums, prior_beta + counts - sums), axis=1)
+
+    def run(
+        self,
+        num_rounds: int,
+        num_fit_rounds: int = 0,
+        quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+        chunk_size: int = 1000,
+    ) -> pd.DataFrame:
+        """
+        Run all replications and summarize their cumulative pseudo-regret.
+
+        The pseudo-regret of a round is the difference between the expected reward of the
+        best arm and that of the arm pulled, both taken from the analytic arm means.
+
+        Args:
+            num_rounds (int): The number of rounds after the exploration phase.
+            num_fit_rounds (int): The number of initial rounds pulling uniformly random arms,
+                like the exploration trials of MultiArmedBandit.fit.
+            quantiles (Sequence[float]): The quantiles of the regret bands.
+            chunk_size (int): The number of rounds whose params and means are tabulated
+                at a time.
+
+        Returns:
+            pd.DataFrame: Per round the mean cumulative regret over the replications, its
+            quantiles and the share of replications that pulled the best arm.
+        """
+        num_arms = len(self.arm_ids)
+        total_rounds = num_fit_rounds + num_rounds
+        counts = np.zeros((self.num_replications, num_arms))
+        sums = np.zeros((self.num_replications, num_arms))
+        sq_sums = np.zeros((self.num_replications, num_arms))
+        # flat views to update one entry per replication with a single fancy index
+        flat_counts, flat_sums = counts.reshape(-1), sums.reshape(-1)
+        flat_sq_sums = sq_sums.reshape(-1)
+        offsets = np.arange(self.num_replications) * num_arms
+        threshold = self.method_params.get("threshold", 0.5)
+        if self.window is not None:
+            # ring buffers of the arms and rewards of the last window rounds
+            window_codes = np.zeros((self.num_replications, self.window), dtype=int)
+            window_rewards = np.zeros((self.num_replications, self.window))
+
+        regret = np.zeros(self.num_replications)
+        cum_regret = np.empty((total_rounds, self.num_replications))
+        best_share = np.empty(total_rounds)
+        for start in range(0, total_rounds, chunk_size):
+            rounds = np.arange(start, min(start + chunk_size, total_rounds))
+            tables = self._param_tables(rounds)
+            means = self.rg.arm_means_at(rounds)
+            best_means, best_arms = means.max(axis=0), means.argmax(axis=0)
+            for step, t in enumerate(rounds):
+                if t < num_fit_rounds:
+                    arm_codes = self.rng.integers(num_arms, size=self.num_replications)
+                else:
+                    arm_codes = self._choose(counts, sums, sq_sums)
+                rewards = self._sample(arm_codes, tables, step)
+                if self.method == "thompson_sampling":
+                    rewards = (rewards > threshold).astype(float)
+                elif self.method == "beta_thompson":
+                    rewards = np.clip(rewards, 0.0, 1.0)
+                if self.window is not None:
+                    slot = t % self.window
+                    if t >= self.window:
+                        evicted = offsets + window_codes[:, slot]
+                        flat_counts[evicted] -= 1
+                        flat_sums[evicted] -= window_rewards[:, slot]
+                        if self.base_method == "gaussian_thompson":
+                            flat_sq_sums[evicted] -= window_rewards[:, slot] ** 2
+                    window_codes[:, slot], window_rewards[:, slot] = arm_codes, rewards
+                elif self.gamma is not None:
+                    counts *= self.gamma
+                    sums *= self.gamma
+                    sq_sums *= self.gamma
+                flat_counts[offsets + arm_codes] += 1
+                flat_sums[offsets + arm_codes] += rewards
+                if self.base_method == "gaussian_thompson":
+                    flat_sq_sums[offsets + arm_codes] += rewards**2
+
+                regret += best_means[step] - means[arm_codes, step]
+                cum_regret[t] = regret
+                best_share[t] = np.mean(arm_codes == best_arms[step])
+
+        result = pd.DataFrame(
+            {"regret_mean": cum_regret.mean(axis=1)},
+            index=pd.RangeIndex(total_rounds, name="round"),
+        )
+        bands = np.quantile(cum_regret, quantiles, axis=1)
+        for quantile, band in zip(quantiles, bands):
+            result[f"regret_q{round(quantile * 100):02d}"] = band
+        result["best_arm_share"] = best_share
+        self.final_regret = regret.copy()
+        return result
+
+
+if __name__ == "__main__":
+    arms_config = {
+        f"arm {i}": {"distribution": "gauss", "params": [0.5 + 0.02 * i, 0.1]} for i in range(10)
+    }
+    for method, params in [
+        ("epsilon_greedy", {"epsilon": 0.05}),
+        ("softmax", {"tau": 0.1}),
+        ("ucb", {"alpha": 1.0}),
+        ("thompson_sampling", {}),
+        ("beta_thompson", {}),
+        ("gaussian_thompson", {}),
+    ]:
+        simulation = ReplicatedSimulation(
+            arms_config, {"method": method, "method_params": params}, num_replications=1000
+        )
+        start = time.perf_counter()
+        result = simulation.run(num_rounds=10000, num_fit_rounds=100)
+        print(f"{method}: {time.perf_counter() - start:.1f}s")
+        print(result.iloc[[99, 999, 4999, -1]].to_string())
@@ -0,0 +1,282 @@
+import json
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from src.data.reward_generator import RewardGenerator
+from src.models.logs import (
+    ArrayLog,
+    RingLog,
+    StridedLog,
+    SufficientStats,
+    create_log,
+    point_history,
+)
+from src.models.mab import MultiArmedBandit
+from src.models.policies import NativeMAB
+
+LOG_NAMES = (
+    "trial_log",
+    "expectation_log",
+    "pull_cum_log",
+    "reward_cum_log",
+    "reward_log",
+    "regret_cum_log",
+)
+
+
+def _model_state(bandit: MultiArmedBandit) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """
+    Extract the per-arm statistics and RNG state of the model of a bandit.
+
+    For the native engine these are the arrays of the policy, for mabwiser the numeric
+    'arm_to_*' dictionaries of its learning policy, in the order of the arms.
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, np.ndarray]]: The JSON-serializable state and the
+        arrays of the model.
+    """
+    if isinstance(bandit.bandit, NativeMAB):
+        target, rng = bandit.bandit.policy, bandit.bandit.policy.rng
+    else:
+        target, rng = bandit.bandit._imp, bandit.bandit._imp.rng.rng
+
+    state: Dict[str, Any] = {"rng": rng.bit_generator.state, "scalars": {}}
+    arrays: Dict[str, np.ndarray] = {}
+    for name, value in vars(target).items():
+        if isinstance(value, np.ndarray):
+            arrays[name] = value
+        elif isinstance(value, (int, float)):
+            state["scalars"][name] = value
+        elif name.startswith("arm_to_") and isinstance(value, dict):
+            values = [value[arm] for arm in bandit.arm_ids]
+            if all(isinstance(v, (int, float, np.number)) for v in values):
+                arrays[name] = np.asarray(values)
+            else:
+                state[name] = [value[arm] for arm in bandit.arm_ids]
+    return state, arrays
+
+
+def _restore_model(
+    bandit: MultiArmedBandit, state: Dict[str, Any], arrays: Dict[str, np.ndarray]
+) -> None:
+    """
+    Create the model of a bandit and restore its statistics and RNG state.
+    """
+    bandit.bandit = bandit._create_bandit()
+    if isinstance(bandit.bandit, NativeMAB):
+        target, rng = bandit.bandit.policy, bandit.bandit.policy.rng
+        for name, values in arrays.items():
+            setattr(target, name, values.copy())
+    else:
+        bandit.bandit._is_initial_fit = True
+        target, rng = bandit.bandit._imp, bandit.bandit._imp.rng.rng
+        for name, values in arrays.items():
+            setattr(target, name, dict(zip(bandit.arm_ids, values.tolist())))
+        for name, values in state.items():
+            if name.startswith("arm_to_"):
+                setattr(target, name, dict(zip(bandit.arm_ids, values)))
+    for name, value in state["scalars"].items():
+        setattr(target, name, value)
+    rng.bit_generator.state = state["rng"]
+
+
+def _downsample_log(log: ArrayLog, history_size: int) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Keep at most history_size rows of a log, evenly spaced over its history.
+
+    Ring logs keep their most recent rows instead.
+
+    Returns:
+        Tuple[Dict[str, Any], np.ndarray]: The description and the rows kept.
+    """
+    rows = log.values
+    if isinstance(log, RingLog):
+        kind, stride = "ring", 1
+        rows = rows[len(rows) - history_size :] if history_size else rows[:0]
+    else:
+        kind, stride = "strided", getattr(log, "stride", getattr(log, "width", 1))
+        step = max(-(-len(rows) // history_size), 1) if history_size else 1
+        rows, stride = (rows[::step] if history_size else rows[:0]), stride * step
+    return {"kind": kind, "stride": stride, "count": log.count, "capacity": len(log.data)}, rows
+
+
+def _restore_log(
+    description: Dict[str, Any],
+    rows: np.ndarray,
+    last_row: np.ndarray,
+    history: Optional[Dict[str, Any]],
+) -> ArrayLog:
+    """
+    Rebuild a log from its downsampled rows.
+
+    Without rows a fresh log is created that only carries the last row, so cumulative
+    values continue while its rounds restart at zero.
+    """
+    if not len(rows):
+        log = create_log(len(last_row), last_row.dtype, history)
+        log.last_row = last_row.copy()
+        return log
+    if description["kind"] == "ring":
+        log = RingLog(rows.shape[1], rows.dtype, description["capacity"])
+        log.count = description["count"] - len(rows)
+        log.extend(rows)
+        return log
+    size = max((history or {}).get("size", 10000), len(rows))
+    return StridedLog.from_rows(rows, description["stride"], description["count"], last_row, size)
+
+
+def save_snapshot(bandit: MultiArmedBandit, path: str, history_size: int = 1000) -> None:
+    """
+    Save the state of a trained bandit in a compact .npz file.
+
+    The snapshot holds the config, the per-arm sufficient statistics of the model and
+    of the logs, the states of all random number generators (of the model, the bandit
+    and a RewardGenerator), rewards still in flight and at most history_size rows of
+    every log. Its size and the time to write it do not depend on the number of rounds.
+
+    Args:
+        bandit (MultiArmedBandit): The trained bandit.
+        path (str): The destination, '.npz' is appended if missing.
+        history_size (int): The maximal number of rows kept per log, 0 to keep none.
+
+    Raises:
+        ValueError: If the bandit has not been trained yet.
+    """
+    if bandit.bandit is None:
+        raise ValueError("Bandit model has not been trained yet. Please call fit() method first.")
+
+    model_state, model_arrays = _model_state(bandit)
+    arrays = {f"model_{name}": values for name, values in model_arrays.items()}
+    arrays.update(
+        stats_counts=bandit.stats.counts,
+        stats_sums=bandit.stats.sums,
+        stats_sq_sums=bandit.stats.sq_sums,
+    )
+    if bandit.last_expectations is not None:
+        arrays["last_expectations"] = bandit.last_expectations
+
+    logs: Dict[str, Dict[str, Any]] = {}
+    for name in LOG_NAMES:
+        log = getattr(bandit, name)
+        logs[name], arrays[f"{name}_rows"] = _downsample_log(log, history_size)
+        arrays[f"{name}_last"] = log.last()
+
+    # rewards in flight, in the order they were pushed
+    pending = sorted(bandit.arrival_queue.heap, key=lambda entry: entry[1])
+    arrays["queue_arrivals"] = np.array([entry[0] for entry in pending], dtype=float)
+    arrays["queue_arms"] = np.array([bandit.arm_codes[entry[2]] for entry in pending], dtype=int)
+    arrays["queue_rewards"] = np.array([entry[3] for entry in pending], dtype=float)
+
+    generator: Dict[str, Any] = {"round": getattr(bandit.rg, "round", 0)}
+    if isinstance(bandit.rg, RewardGenerator):
+        generator["rng"] = bandit.rg.rng.bit_generator.state
+        generator["arm_rngs"] = {
+            arm_id: rng.bit_generator.state for arm_id, rng in bandit.rg.arm_rngs.items()
+        }
+        if bandit.rg.data is not None:
+            generator["bank_positions"] = bandit.rg.bank_positions
+            for code, arm_id in enumerate(bandit.arm_ids):
+                arrays[f"bank_{code}"] = bandit.rg.reward_banks[arm_id]
+
+    meta = {
+        "config": bandit.config,
+        "arm_ids": bandit.arm_ids,
+        "seed": bandit.seed,
+        "rng": bandit.rng.bit_generator.state,
+        "clock": bandit.clock,
+        "expectation_mode": bandit.expectation_mode,
+        "expectation_every": bandit.expectation_every,
+        "regret": {
+            "cum_regret": bandit.cum_regret,
+            "best_pulls": bandit.best_pulls,
+            "lead_round": bandit.lead_round,
+        },
+        "identification": bandit.identification,
+        "model": model_state,
+        "logs": logs,
+        "generator": generator,
+    }
+    if not str(path).endswith(".npz"):
+        path = f"{path}.npz"
+    np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def load_snapshot(
+    path: str, reward_generator: Union[RewardGenerator, Any]
+) -> MultiArmedBandit:
+    """
+    Restore a bandit saved with save_snapshot.
+
+    The reward generator has to be configured like the one of the saved bandit; the
+    state of its random number generators is restored, so the restored bandit continues
+    the same sequence of decisions and rewards. Logs hold the downsampled history and
+    keep every stride-th round from then on (see StridedLog.from_rows).
+
+    Args:
+        path (str): The snapshot, '.npz' is appended if missing.
+        reward_generator (Union[RewardGenerator, Any]): The source of the rewards.
+
+    Returns:
+        MultiArmedBandit: The restored bandit.
+
+    Raises:
+        ValueError: If the arms of the reward generator differ from the saved ones.
+    """
+    if not str(path).endswith(".npz"):
+        path = f"{path}.npz"
+    with np.load(path) as snapshot:
+        arrays = {name: snapshot[name] for name in snapshot.files}
+    meta = json.loads(str(arrays.pop("meta")))
+
+    bandit = MultiArmedBandit(reward_generator, meta["config"], meta["seed"])
+    if bandit.arm_ids != meta["arm_ids"]:
+        raise ValueError(f"Arms {bandit.arm_ids} differ from the saved arms {meta['arm_ids']}")
+
+    model_arrays = {
+        name[len("model_") :]: values
+        for name, values in arrays.items()
+        if name.startswith("model_")
+    }
+    _restore_model(bandit, meta["model"], model_arrays)
+    bandit.rng.bit_generator.state = meta["rng"]
+    bandit.clock = meta["clock"]
+
+    bandit.stats = SufficientStats(len(bandit.arm_ids))
+    bandit.stats.counts = arrays["stats_counts"]
+    bandit.stats.sums = arrays["stats_sums"]
+    bandit.stats.sq_sums = arrays["stats_sq_sums"]
+    bandit.expectation_mode = meta["expectation_mode"]
+    bandit.expectation_every = meta["expectation_every"]
+    bandit.last_expectations = arrays.get("last_expectations")
+    bandit.cum_regret = meta["regret"]["cum_regret"]
+    bandit.best_pulls = meta["regret"]["best_pulls"]
+    bandit.lead_round = meta["regret"]["lead_round"]
+    bandit.identification = meta.get("identification")
+    bandit._init_means()
+
+    history = meta["config"].get("history")
+    for name in LOG_NAMES:
+        log_history = point_history(history) if name == "trial_log" else history
+        log = _restore_log(
+            meta["logs"][name], arrays[f"{name}_rows"], arrays[f"{name}_last"], log_history
+        )
+        setattr(bandit, name, log)
+
+    for arrival, code, reward in zip(
+        arrays["queue_arrivals"], arrays["queue_arms"], arrays["queue_rewards"]
+    ):
+        bandit.arrival_queue.push(float(arrival), bandit.arm_ids[code], float(reward))
+
+    generator = meta["generator"]
+    if hasattr(reward_generator, "round"):
+        reward_generator.round = generator["round"]
+    if "rng" in generator:
+        reward_generator.rng.bit_generator.state = generator["rng"]
+        for arm_id, state in generator["arm_rngs"].items():
+            reward_generator.arm_rngs[arm_id].bit_generator.state = state
+    if "bank_positions" in generator:
+        reward_generator.bank_positions = generator["bank_positions"]
+        for code, arm_id in enumerate(bandit.arm_ids):
+            reward_generator.reward_banks[arm_id] = arrays[f"bank_{code}"]
+    return bandit
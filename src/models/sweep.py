@@ -0,0 +1,233 @@
+import hashlib
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.models.simulation import ReplicatedSimulation
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    List every combination of the values of a parameter grid.
+
+    Args:
+        grid (Dict[str, List[Any]]): The candidate values of every parameter.
+
+    Returns:
+        List[Dict[str, Any]]: One parameter dictionary per combination.
+
+    Example:
+        >>> expand_grid({"epsilon": [0.01, 0.1]})
+        [{'epsilon': 0.01}, {'epsilon': 0.1}]
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def source_version() -> str:
+    """
+    Hash the sources of the policies and reward generators the simulations run.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the Python files of src/models and src/data.
+    """
+    digest = hashlib.sha256()
+    root = Path(__file__).resolve().parents[1]
+    for path in sorted([*root.glob("models/*.py"), *root.glob("data/*.py")]):
+        digest.update(path.relative_to(root).as_posix().encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def cache_key(point: Dict[str, Any], version: str = "") -> str:
+    """
+    Hash the content of a sweep point, i.e. everything its result depends on.
+
+    Args:
+        point (Dict[str, Any]): The method, params, arm config, seed, horizon and
+            number of replications of a simulation.
+        version (str): The version of the code, e.g. source_version(), so results of
+            older code are not reused.
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the canonical JSON of the point.
+    """
+    content = {**point, "version": version}
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def _simulate(point: Dict[str, Any]) -> np.ndarray:
+    """
+    Run the replicated simulation of a sweep point.
+
+    Returns:
+        np.ndarray: The final cumulative regret of every replication.
+    """
+    simulation = ReplicatedSimulation(
+        point["arms_config"],
+        {"method": point["method"], "method_params": point["method_params"]},
+        point["num_replications"],
+        point["seed"],
+    )
+    simulation.run(point["num_rounds"], point["num_fit_rounds"])
+    return simulation.final_regret
+
+
+def sweep(
+    grids: Dict[str, Dict[str, List[Any]]],
+    arms_config: Dict[str, Dict[str, Any]],
+    num_rounds: int = 2000,
+    num_fit_rounds: int = 100,
+    num_replications: int = 200,
+    seed: int = 42,
+    cache_dir: Optional[str] = "models/sweep_cache",
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Rank parameter settings of bandit methods by their mean regret.
+
+    Every combination of the grids is simulated with ReplicatedSimulation, in parallel
+    on a process pool. The final regret of every replication is cached on disk under
+    the content hash of the combination and of the simulation sources, so repeated
+    sweeps only simulate new settings, e.g. after an arm config or the code changed.
+
+    Args:
+        grids (Dict[str, Dict[str, List[Any]]]): Per method the candidate values of its
+            params, e.g. {"ucb": {"alpha": [0.5, 1.0, 2.0]}}.
+        arms_config (Dict[str, Dict[str, Any]]): The configuration of the arms.
+        num_rounds (int): The number of rounds after the exploration phase.
+        num_fit_rounds (int): The number of exploration rounds.
+        num_replications (int): The number of replications per setting, at least 2.
+        seed (int): Seed of the simulations.
+        cache_dir (Optional[str]): The directory of the cache, None to disable it.
+        max_workers (Optional[int]): The number of worker processes, by default one per CPU.
+
+    Returns:
+        pd.DataFrame: One row per setting, ranked by mean final regret, with the 95%
+        confidence interval of the mean and whether the result came from the cache.
+
+    Raises:
+        ValueError: If num_replications is below 2, too few for a confidence interval.
+
+    Example:
+        >>> sweep({"epsilon_greedy": {"epsilon": [0.01, 0.05, 0.1]}}, cfg["arms_config"])
+    """
+    if num_replications < 2:
+        raise ValueError("At least 2 replications are needed for a confidence interval")
+    points = [
+        {
+            "method": method,
+            "method_params": params,
+            "arms_config": arms_config,
+            "seed": seed,
+            "num_rounds": num_rounds,
+            "num_fit_rounds": num_fit_rounds,
+            "num_replications": num_replications,
+        }
+        for method, grid in grids.items()
+        for params in expand_grid(grid)
+    ]
+    version = source_version()
+    keys = [cache_key(point, version) for point in points]
+    cache = Path(cache_dir) if cache_dir is not None else None
+    if cache is not None:
+        cache.mkdir(parents=True, exist_ok=True)
+
+    regrets: Dict[str, np.ndarray] = {}
+    cached = set()
+    for key in keys:
+        if cache is not None and (cache / f"{key}.npy").exists():
+            regrets[key] = np.load(cache / f"{key}.npy")
+            cached.add(key)
+
+    missing = [(key, point) for key, point in zip(keys, points) if key not in regrets]
+    if missing:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(_simulate, [point for _, point in missing])
+            for (key, _), final_regret in zip(missing, results):
+                regrets[key] = final_regret
+                if cache is not None:
+                    np.save(cache / f"{key}.npy", final_regret)
+
+    rows = []
+    for key, point in zip(keys, points):
+        final_regret = regrets[key]
+        mean = final_regret.mean()
+        half_width = 1.96 * final_regret.std(ddof=1) / np.sqrt(len(final_regret))
+        rows.append(
+            {
+                "method": point["method"],
+                "method_params": json.dumps(point["method_params"], sort_keys=True),
+                "regret_mean": mean,
+                "regret_ci_low": mean - half_width,
+                "regret_ci_high": mean + half_width,
+                "cached": key in cached,
+            }
+        )
+    columns = [
+        "method",
+        "method_params",
+        "regret_mean",
+        "regret_ci_low",
+        "regret_ci_high",
+        "cached",
+    ]
+    result = pd.DataFrame(rows, columns=columns).sort_values("regret_mean", ignore_index=True)
+    result.index = pd.RangeIndex(1, len(result) + 1, name="rank")
+    return result
+
+
+if __name__ == "__main__":
+    from src.general.io import read_yaml
+
+    cfg = read_yaml("src/visualization/streamlit/default.yml")
+    grids = {
+        "epsilon_greedy": {"epsilon": [0.01, 0.02, 0.05, 0.1, 0.2]},
+        "softmax": {"tau": [0.01, 0.02, 0.05, 0.1, 0.5]},
+        "ucb": {"alpha": [0.05, 0.1, 0.25, 0.5, 1.0]},
+        "thompson_sampling": {},
+        "beta_thompson": {},
+        "gaussian_thompson": {"prior_rate": [0.001, 0.01, 0.1]},
+    }
+    for attempt in ["first", "repeated"]:
+        start = time.perf_counter()
+        ranking = sweep(grids, cfg["arms_config"])
+        print(f"{attempt} sweep: {time.perf_counter() - start:.1f}s")
+    print(ranking.to_string())
+
+    # drifting scenarios: stationary policies against their sliding-window and discounted
+    # variants, e.g. a bot that degrades after every deployment and recovers afterwards
+    deployments = {"type": "step", "param": 0, "rounds": [1000, 1500, 3000, 3500]}
+    scenarios = {
+        "deployments": {
+            **cfg["arms_config"],
+            "Blue bot": {
+                **cfg["arms_config"]["Blue bot"],
+                "drift": [{**deployments, "values": [0.6, 0.7, 0.6, 0.7]}],
+            },
+        },
+        "crossing": {
+            **cfg["arms_config"],
+            "Blue bot": {
+                **cfg["arms_config"]["Blue bot"],
+                "drift": [{"type": "sine", "param": 0, "amplitude": 0.08, "period": 2000}],
+            },
+        },
+    }
+    drift_grids = {
+        "ucb": {"alpha": [0.1, 1.0]},
+        "gaussian_thompson": {},
+        "sliding_window_ucb": {"alpha": [0.1, 1.0], "window": [200, 500]},
+        "discounted_ucb": {"alpha": [0.1, 1.0], "gamma": [0.99, 0.995]},
+        "sliding_window_thompson": {"window": [200, 500]},
+        "discounted_thompson": {"gamma": [0.99, 0.995]},
+    }
+    for scenario, arms_config in scenarios.items():
+        ranking = sweep(drift_grids, arms_config, num_rounds=4000)
+        print(f"{scenario}:\n{ranking.to_string()}")
@@ -0,0 +1,292 @@
+import copy
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.models.mab import MultiArmedBandit
+from src.models.policies import NativeMAB, Policy
+
+
+class _Shard:
+    """
+    Reward accumulator owned by a single thread.
+
+    Its lock is only ever contended by the merge, never by other request threads. The
+    owner is only referenced weakly, so the shard can be dropped once its thread is gone.
+    """
+
+    def __init__(self, num_arms: int) -> None:
+        self.owner = weakref.ref(threading.current_thread())
+        self.lock = threading.Lock()
+        self.counts = np.zeros(num_arms, dtype=np.int64)
+        self.sums = np.zeros(num_arms)
+        self.sq_sums = np.zeros(num_arms)
+
+    def drain(self) -> List[np.ndarray]:
+        """
+        Return the accumulated statistics and start over from zero.
+        """
+        with self.lock:
+            stats = [self.counts, self.sums, self.sq_sums]
+            self.counts = np.zeros_like(self.counts)
+            self.sums = np.zeros_like(self.sums)
+            self.sq_sums = np.zeros_like(self.sq_sums)
+        return stats
+
+    def orphaned(self) -> bool:
+        """
+        Whether the thread owning the shard has finished, so no reward can arrive anymore.
+        """
+        owner = self.owner()
+        return owner is None or not owner.is_alive()
+
+
+class ThreadSafeBandit:
+    """
+    Concurrent front end of a trained MultiArmedBandit shared by many threads.
+
+    Decisions read an immutable snapshot of the policy that is swapped atomically after
+    every merge; every thread decides with its own copy of the snapshot and its own
+    random number generator. Rewards go to per-thread accumulators of counts and sums
+    per arm, which are merged into the policy periodically. No lock is shared between
+    request threads.
+
+    Only the native engine is supported: mabwiser models cannot be copied into
+    snapshots cheaply. The per-round logs of the bandit are not updated in this mode.
+    """
+
+    def __init__(
+        self, bandit: MultiArmedBandit, merge_interval: float = 0.05, seed: int = 42
+    ) -> None:
+        """
+        Initialize the ThreadSafeBandit.
+
+        Args:
+            bandit (MultiArmedBandit): The trained bandit, on the native engine.
+            merge_interval (float): The seconds between two merges of the background thread.
+            seed (int): Seed of the random number generators of the threads.
+
+        Raises:
+            ValueError: If the bandit has not been trained, does not use the native engine
+                or its policy cannot merge statistics, e.g. a sliding-window policy.
+        """
+        if not isinstance(bandit.bandit, NativeMAB):
+            raise ValueError("Concurrent mode requires a trained bandit on the native engine")
+        if not bandit.bandit.policy.mergeable:
+            raise ValueError(
+                f"Concurrent mode requires a policy that can merge statistics, "
+                f"not '{bandit.config['method']}'"
+            )
+        self.bandit = bandit
+        self.policy: Policy = bandit.bandit.policy
+        self.merge_interval = merge_interval
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+        self.shards: List[_Shard] = []
+        self.registry_lock = threading.Lock()
+        self.merge_lock = threading.Lock()
+        self.local = threading.local()
+        self.snapshot = (0, copy.deepcopy(self.policy))
+        self.stop_event = threading.Event()
+        self.merger: Optional[threading.Thread] = None
+
+    def _local(self) -> threading.local:
+        """
+        Return the state of the calling thread, registering the thread on first use.
+        """
+        local = self.local
+        if not hasattr(local, "shard"):
+            with self.registry_lock:
+                local.shard = _Shard(self.policy.num_arms)
+                local.rng = np.random.default_rng(self.seed_sequence.spawn(1)[0])
+                self.shards.append(local.shard)
+            local.version, local.policy = -1, None
+        return local
+
+    def choose(self) -> Any:
+        """
+        Choose the arm to pull next from the current snapshot of the policy.
+
+        Returns:
+            Any: The chosen arm.
+        """
+        local = self._local()
+        version, policy = self.snapshot  # a single read of the atomically swapped tuple
+        if local.version != version:
+            # the snapshot is never mutated, so a shallow copy with its own rng suffices
+            local.policy = copy.copy(policy)
+            local.policy.rng = local.rng
+            local.version = version
+        return self.bandit.arm_ids[local.policy.choose()]
+
+    def reward(self, arm: Any, reward: float) -> None:
+        """
+        Add an observed reward to the accumulator of the calling thread.
+
+        Args:
+            arm (Any): The arm pulled.
+            reward (float): The reward.
+        """
+        shard = self._local().shard
+        code = self.bandit.arm_codes[arm]
+        value = float(self.policy._transform(np.array([reward], dtype=float))[0])
+        with shard.lock:
+            shard.counts[code] += 1
+            shard.sums[code] += value
+            shard.sq_sums[code] += reward * reward
+
+    def merge(self) -> int:
+        """
+        Merge all accumulated rewards into the policy and publish a new snapshot.
+
+        Shards of finished threads are dropped after their last merge, so thread churn
+        does not grow the registry.
+
+        Returns:
+            int: The number of rewards merged.
+        """
+        with self.merge_lock:
+            with self.registry_lock:
+                shards = list(self.shards)
+            # checked before draining: a finished thread cannot add rewards afterwards
+            orphans = [shard for shard in shards if shard.orphaned()]
+            num_arms = self.policy.num_arms
+            counts = np.zeros(num_arms, dtype=np.int64)
+            sums, sq_sums = np.zeros(num_arms), np.zeros(num_arms)
+            for shard in shards:
+                shard_counts, shard_sums, shard_sq_sums = shard.drain()
+                counts += shard_counts
+                sums += shard_sums
+                sq_sums += shard_sq_sums
+            if orphans:
+                with self.registry_lock:
+                    self.shards = [shard for shard in self.shards if shard not in orphans]
+
+            merged = int(counts.sum())
+            if merged:
+                self.policy.merge(counts, sums, sq_sums)
+                self.snapshot = (self.snapshot[0] + 1, copy.deepcopy(self.policy))
+            return merged
+
+    def _merge_periodically(self) -> None:
+        """
+        Merge every merge_interval seconds until stopped.
+        """
+        while not self.stop_event.wait(self.merge_interval):
+            self.merge()
+
+    def start(self) -> "ThreadSafeBandit":
+        """
+        Start merging in a background thread.
+
+        Returns:
+            ThreadSafeBandit: The bandit itself, so it can be used as a context manager.
+        """
+        self.stop_event.clear()
+        self.merger = threading.Thread(target=self._merge_periodically, daemon=True)
+        self.merger.start()
+        return self
+
+    def stop(self) -> None:
+        """
+        Stop the background merges and merge the remaining rewards.
+        """
+        self.stop_event.set()
+        if self.merger is not None:
+            self.merger.join()
+            self.merger = None
+        self.merge()
+
+    def __enter__(self) -> "ThreadSafeBandit":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+
+def stress_test(
+    bandit: MultiArmedBandit,
+    num_threads: int = 8,
+    num_rounds: int = 10000,
+    merge_interval: float = 0.001,
+) -> Dict[str, Any]:
+    """
+    Hammer a ThreadSafeBandit from many threads and check that no update is lost.
+
+    Every thread chooses arms and reports rewards drawn from its own generator while
+    the merges run concurrently with a short interval. Afterwards the counts and reward
+    sums of the policy must have grown by exactly what the threads reported.
+
+    Args:
+        bandit (MultiArmedBandit): A trained bandit on the native engine; its policy is
+            updated by the test.
+        num_threads (int): The number of concurrent threads.
+        num_rounds (int): The number of decisions and rewards per thread.
+        merge_interval (float): The seconds between two merges.
+
+    Returns:
+        Dict[str, Any]: The number of rewards reported and lost, the largest difference
+        of the reward sums and the decisions per second.
+
+    Raises:
+        ValueError: If the policy does not add merged statistics up exactly, e.g. a
+            discounted policy, so lost updates cannot be told apart.
+        RuntimeError: If updates were lost.
+    """
+    if not bandit.bandit.policy.additive:
+        raise ValueError(f"Merges of '{bandit.config['method']}' are not additive")
+    concurrent = ThreadSafeBandit(bandit, merge_interval)
+    policy = concurrent.policy
+    counts_before, sums_before = policy.counts.copy(), policy.sums.copy()
+    reported = np.zeros((num_threads, policy.num_arms))
+    reported_sums = np.zeros((num_threads, policy.num_arms))
+
+    def work(thread_index: int) -> None:
+        rng = np.random.default_rng(thread_index)
+        for reward in rng.random(num_rounds):
+            arm = concurrent.choose()
+            concurrent.reward(arm, reward)
+            code = bandit.arm_codes[arm]
+            reported[thread_index, code] += 1
+            reported_sums[thread_index, code] += policy._transform(np.array([reward]))[0]
+
+    threads = [threading.Thread(target=work, args=(index,)) for index in range(num_threads)]
+    start = time.perf_counter()
+    with concurrent:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - start
+
+    lost = int(reported.sum() - (policy.counts - counts_before).sum())
+    sum_error = float(np.abs(policy.sums - sums_before - reported_sums.sum(axis=0)).max())
+    counts_match = np.allclose(policy.counts - counts_before, reported.sum(axis=0))
+    if lost or not counts_match or sum_error >= 1e-6 * max(1.0, float(reported_sums.sum())):
+        raise RuntimeError(f"Updates were lost: {lost} rewards, sum error {sum_error}")
+    return {
+        "reported": int(reported.sum()),
+        "lost": lost,
+        "sum_error": sum_error,
+        "decisions_per_second": reported.sum() / elapsed,
+    }
+
+
+if __name__ == "__main__":
+    from src.data.reward_generator import RewardGenerator
+    from src.general.io import read_yaml
+
+    cfg = read_yaml("src/visualization/streamlit/default.yml")
+    for method in ["ucb", "thompson_sampling", "gaussian_thompson"]:
+        for threads in [1, 2, 4, 8]:
+            mab_config = {
+                "method": method,
+                "method_params": cfg["mab_methods"].get(method, {}),
+                "engine": "native",
+            }
+            stress_bandit = MultiArmedBandit(RewardGenerator(cfg["arms_config"]), mab_config)
+            stress_bandit.fit(100)
+            print(method, threads, stress_test(stress_bandit, threads, 5000))
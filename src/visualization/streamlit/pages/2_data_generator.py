@@ -1,9 +1,11 @@
+import json
 import os
 
 import numpy as np
 import plotly.graph_objects as go
 import streamlit as st
 
+from src.data.distributions import DISTRIBUTIONS
 from src.general.io import read_yaml
 
 st.set_page_config(page_title="Data", page_icon="📊", layout="wide")
@@ -19,55 +21,55 @@ def display_arm_configuration() -> dict:
     Display the configuration options for each arm in the left column.
 
     This function creates an expander for all arms, where the user can select
-    the distribution type (gauss or uniform) and set the corresponding parameters
-    (mean and std for gauss, lower and upper bounds for uniform).
+    any distribution from the registry and set its parameters. Scalar parameters
+    get a number input, list parameters (e.g. categorical values and probabilities
+    or mixture components) are edited as JSON.
 
     Returns:
-        dict: A dictionary containing the updated configuration for all arms.
+        dict: A dictionary containing the updated configuration for all arms, without
+            the arms whose parameters are invalid.
     """
     new_arms_config = {}
     i = 0
+    options = list(DISTRIBUTIONS.keys())
 
     columns = st.columns(spec=len(st.session_state["cfg"]["arms_config"]), gap="large")
     for arm_id, config in st.session_state["cfg"]["arms_config"].items():
         with columns[i]:
-            dist = st.radio(
+            dist = st.selectbox(
                 label=arm_id,
-                options=["gauss", "uniform"],
-                index=["gauss", "uniform"].index(config["distribution"]),
+                options=options,
+                index=options.index(config["distribution"]),
                 key=f"dist_{arm_id}",
-                horizontal=True,
             )
-            if dist == "gauss":
-                mean = st.number_input(
-                    "Mean",
-                    value=config["params"][0],
-                    key=f"mean_{arm_id}",
-                )
-                std = st.number_input(
-                    "Standard Deviation",
-                    value=config["params"][1],
-                    key=f"std_{arm_id}",
-                )
-                new_arms_config[arm_id] = {
-                    "distribution": dist,
-                    "params": [mean, std],
-                }
-            elif dist == "uniform":
-                lower = st.number_input(
-                    "Lower Bound",
-                    value=config["params"][0],
-                    key=f"low_{arm_id}",
-                )
-                upper = st.number_input(
-                    "Upper Bound",
-                    value=config["params"][1],
-                    key=f"up_{arm_id}",
-                )
+            distribution = DISTRIBUTIONS[dist]
+            params = (
+                config["params"] if dist == config["distribution"] else distribution.default_params
+            )
+            try:
+                new_params = []
+                for j, (param_name, value) in enumerate(zip(distribution.param_names, params)):
+                    if isinstance(value, list):
+                        text = st.text_input(
+                            param_name, value=json.dumps(value), key=f"{dist}_{j}_{arm_id}"
+                        )
+                        new_params.append(json.loads(text))
+                    else:
+                        new_params.append(
+                            st.number_input(param_name, value=value, key=f"{dist}_{j}_{arm_id}")
+                        )
+                mean = distribution.mean(*new_params)
+                variance = distribution.variance(*new_params)
+                # a test draw catches parameters the sampler rejects before they are plotted
+                distribution.sample(np.random.default_rng(0), *new_params, size=1)
+            except (json.JSONDecodeError, ValueError, TypeError) as error:
+                st.error(f"Invalid parameters of {arm_id}: {error}")
+            else:
                 new_arms_config[arm_id] = {
                     "distribution": dist,
-                    "params": [lower, upper],
+                    "params": new_params,
                 }
+                st.caption(f"mean {mean:.4f}, variance {variance:.4f}")
         i += 1
     return new_arms_config
 
@@ -76,10 +78,14 @@ def plot_distributions(distributions: dict) -> None:
     """
     Plot all distributions on the same graph using Plotly.
 
+    Gauss and uniform densities are drawn analytically, other distributions are
+    shown as a density histogram of a batch of samples.
+
     Args:
         distributions (dict): The configuration for all arms.
     """
     fig = go.Figure()
+    rng = np.random.default_rng(0)
     for arm_id, config in distributions.items():
         dist = config["distribution"]
         params = config["params"]
@@ -93,8 +99,13 @@ def plot_distributions(distributions: dict) -> None:
             x = np.linspace(lower - 1, upper + 1, 1000)
             y = np.where((x >= lower) & (x <= upper), 1 / (upper - lower), 0)
             fig.add_trace(go.Scatter(x=x, y=y, mode="lines", name=arm_id))
+        else:
+            x = DISTRIBUTIONS[dist].sample(rng, *params, size=10000)
+            fig.add_trace(
+                go.Histogram(x=x, histnorm="probability density", opacity=0.5, name=arm_id)
+            )
 
-    fig.update_layout(xaxis_title="Value", yaxis_title="Density")
+    fig.update_layout(xaxis_title="Value", yaxis_title="Density", barmode="overlay")
     st.plotly_chart(fig, use_container_width=True)
 
 
@@ -126,7 +137,9 @@ with st.expander("Generated data", expanded=False):
     plot_distributions(new_arms_config)
 
     # Sidebar buttons for updating configuration and resetting to defaults
-if st.sidebar.button("Update Configuration"):
+# arms with invalid parameters are left out, so only a configuration of valid arms is applied
+valid = len(new_arms_config) == len(st.session_state["cfg"]["arms_config"])
+if st.sidebar.button("Update Configuration", disabled=not valid):
     update_configuration(new_arms_config)
 
 if st.sidebar.button("Reset to defaults"):
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.data.contextual_generator import ContextualRewardGenerator
+
+CONFIG = {
+    "features": {
+        "channel": {"values": ["web", "app"], "probs": [0.7, 0.3]},
+        "session_length": {"distribution": "uniform", "params": [0.0, 1.0]},
+    },
+    "model": "linear",
+    "arms": {
+        "A": {"intercept": 0.5, "weights": {"channel=app": 0.4}},
+        "B": {"intercept": 0.6, "weights": {"session_length": -0.2}},
+    },
+}
+
+
+def test_contexts_are_one_hot_encoded_and_numeric_columns_sampled():
+    generator = ContextualRewardGenerator(CONFIG, seed=0)
+    assert generator.feature_names == ["channel=web", "channel=app", "session_length"]
+    contexts = generator.sample_contexts(1000)
+    np.testing.assert_array_equal(contexts[:, :2].sum(axis=1), 1.0)
+    assert 0.25 < contexts[:, 1].mean() < 0.35
+    assert contexts[:, 2].min() >= 0.0 and contexts[:, 2].max() <= 1.0
+
+
+def test_expected_rewards_and_oracle_arm_follow_the_linear_model():
+    generator = ContextualRewardGenerator(CONFIG)
+    contexts = np.array([[1.0, 0.0, 0.5], [0.0, 1.0, 0.5]])
+    np.testing.assert_allclose(generator.expected_rewards(contexts), [[0.5, 0.5], [0.9, 0.5]])
+    np.testing.assert_array_equal(generator.best_arm(contexts[1:]), [0])
+    rewards = generator.rewards(contexts, np.array([1, 0]))
+    np.testing.assert_allclose(rewards, [0.5, 0.9])
+
+
+def test_invalid_configs_are_rejected():
+    with pytest.raises(ValueError, match="Unsupported reward model"):
+        ContextualRewardGenerator({**CONFIG, "model": "probit"})
+    arms = {"A": {"weights": {"channel=phone": 1.0}}}
+    with pytest.raises(ValueError, match="Unknown feature column"):
+        ContextualRewardGenerator({**CONFIG, "arms": arms})
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from src.data import distributions
+from src.data.distributions import DISTRIBUTIONS, Distribution, register_distribution
+
+
+@pytest.mark.parametrize("name", sorted(DISTRIBUTIONS))
+def test_sample_moments_match_analytic_moments(name):
+    distribution = DISTRIBUTIONS[name]
+    params = distribution.default_params
+    samples = distribution.sample(np.random.default_rng(0), *params, size=200000)
+    std = np.sqrt(distribution.variance(*params))
+    assert samples.shape == (200000,)
+    assert abs(samples.mean() - distribution.mean(*params)) < 0.02 * std + 1e-9
+    assert abs(samples.std() / std - 1) < 0.02
+
+
+def test_moments_broadcast_over_array_params():
+    means = DISTRIBUTIONS["gauss"].mean(np.array([0.1, 0.2]), np.array([1.0, 2.0]))
+    np.testing.assert_array_equal(means, [0.1, 0.2])
+
+
+def test_register_distribution_adds_new_and_rejects_taken_names(monkeypatch):
+    monkeypatch.setattr(distributions, "DISTRIBUTIONS", dict(DISTRIBUTIONS))
+    constant = Distribution(
+        sampler=lambda rng, value, size: np.full(size, float(value)),
+        mean=lambda value: value,
+        variance=lambda value: 0.0,
+        param_names=["Value"],
+        default_params=[1.0],
+    )
+    register_distribution("constant", constant)
+    assert distributions.DISTRIBUTIONS["constant"] is constant
+    with pytest.raises(ValueError, match="already registered"):
+        register_distribution("gauss", constant)
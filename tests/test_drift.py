@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.data.drift import DriftSchedule
+from src.data.reward_generator import RewardGenerator
+
+
+def schedule(drifts, params=(0.5, 0.1), chunk_size=64):
+    return DriftSchedule(list(params), drifts, np.random.SeedSequence(0), chunk_size=chunk_size)
+
+
+def test_linear_step_and_sine_drifts_with_bounds():
+    rounds = np.array([0, 10, 99, 100, 250])
+    linear = schedule([{"type": "linear", "param": 0, "slope": 0.01, "bounds": [0, 1.2]}])
+    np.testing.assert_allclose(linear.params_at(rounds)[0], [0.5, 0.6, 1.2, 1.2, 1.2])
+    step = schedule([{"type": "step", "param": 0, "rounds": [100, 200], "values": [0.3, 0.9]}])
+    np.testing.assert_allclose(step.params_at(rounds)[0], [0.5, 0.5, 0.5, 0.3, 0.9])
+    sine = schedule([{"type": "sine", "param": 1, "amplitude": 0.1, "period": 40}])
+    np.testing.assert_allclose(sine.params_at(np.array([0, 10, 30]))[1], [0.1, 0.2, 0.0])
+
+
+def test_random_walk_is_reproducible_in_any_query_order():
+    drift = [{"type": "random_walk", "param": 0, "scale": 0.01}]
+    rounds = np.arange(300)
+    forward = schedule(drift).params_at(rounds)[0]
+    backward = schedule(drift)
+    late = backward.params_at(rounds[200:])[0]
+    early = backward.params_at(rounds[:200])[0]
+    np.testing.assert_allclose(np.concatenate([early, late]), forward)
+    assert not np.allclose(forward, 0.5)
+
+
+def test_invalid_drifts_are_rejected():
+    with pytest.raises(ValueError, match="Unsupported drift"):
+        schedule([{"type": "jump", "param": 0}])
+    with pytest.raises(ValueError, match="scalar"):
+        schedule([{"type": "linear", "param": 1, "slope": 0.1}], params=([1, 2], [0.5, 0.5]))
+
+
+def test_drifting_arms_follow_the_round_of_every_pull():
+    config = {
+        "A": {
+            "distribution": "gauss",
+            "params": [0.0, 0.001],
+            "drift": [{"type": "step", "param": 0, "rounds": [10], "values": [1.0]}],
+        },
+        "B": {"distribution": "gauss", "params": [0.5, 0.001]},
+    }
+    generator = RewardGenerator(config)
+    assert np.allclose(generator.pull_arm_n_times("A", 10), 0.0, atol=0.01)
+    assert np.allclose(generator.pull_arm_n_times("A", 10), 1.0, atol=0.01)
+    np.testing.assert_array_equal(generator.best_arm_at(np.array([5, 15])), [1, 0])
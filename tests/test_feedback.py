@@ -0,0 +1,12 @@
+from src.models.feedback import ArrivalQueue
+
+
+def test_arrival_queue_pops_in_arrival_order_and_keeps_ties_in_push_order():
+    queue = ArrivalQueue()
+    for arrival_time, arm, reward in [(3.0, "A", 0.3), (1.0, "B", 0.1), (1.0, "C", 0.2)]:
+        queue.push(arrival_time, arm, reward)
+    assert queue.next_arrival() == 1.0
+    assert queue.pop_until(2.0) == (["B", "C"], [0.1, 0.2])
+    assert len(queue) == 1
+    assert queue.pop_until(float("inf")) == (["A"], [0.3])
+    assert queue.next_arrival() == float("inf")
@@ -0,0 +1,27 @@
+import pytest
+
+from src.models.harness import compare_engines
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.05]},
+    "B": {"distribution": "uniform", "params": [0.6, 0.75]},
+}
+
+
+@pytest.mark.parametrize(
+    "method, params", [("epsilon_greedy", {"epsilon": 0.1}), ("ucb", {"alpha": 1.0})]
+)
+def test_native_engine_allocates_like_mabwiser(method, params):
+    result = compare_engines(
+        ARMS, {"method": method, "method_params": params}, 50, 200, seeds=range(3)
+    )
+    assert list(result.index) == ["A", "B"]
+    assert (result["share_difference"] == 0).all()
+    assert (result["native_policy_rounds_per_second"] > 0).all()
+
+
+def test_diverging_engines_raise():
+    with pytest.raises(ValueError, match="Engines diverge"):
+        compare_engines(
+            ARMS, {"method": "softmax", "method_params": {"tau": 0.1}}, 50, 200, range(3), 1e-9
+        )
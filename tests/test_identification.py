@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+from src.models.identification import IDENTIFICATION_METHODS, LUCB, identify_best_arm
+from src.models.mab import MultiArmedBandit
+from src.models.snapshot import load_snapshot, save_snapshot
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.4, 0.05]},
+    "B": {"distribution": "gauss", "params": [0.6, 0.05]},
+    "C": {"distribution": "gauss", "params": [0.5, 0.05]},
+}
+
+
+@pytest.mark.parametrize("method", sorted(IDENTIFICATION_METHODS))
+def test_identification_stops_early_on_the_best_arm(method):
+    arm_codes, rewards, summary = identify_best_arm(
+        RewardGenerator(ARMS, seed=0), method, delta=0.05, sigma=0.1, max_rounds=5000
+    )
+    assert summary["best_arm"] == "B"
+    assert summary["stopped"] is True
+    assert summary["rounds"] == len(arm_codes) == len(rewards) < 5000
+    assert summary["rounds_saved"] == 5000 - summary["rounds"]
+    assert list(summary["pulls"].values()) == np.bincount(arm_codes, minlength=3).tolist()
+    json.dumps(summary)
+
+
+@pytest.mark.parametrize("method", sorted(IDENTIFICATION_METHODS))
+def test_identification_respects_the_budget_of_indistinguishable_arms(method):
+    arms = {"A": ARMS["A"], "B": ARMS["A"]}
+    arm_codes, _, summary = identify_best_arm(
+        RewardGenerator(arms, seed=0), method, 0.05, 0.1, max_rounds=301
+    )
+    assert summary["stopped"] is False
+    assert summary["rounds"] == len(arm_codes) == 301
+
+
+def test_lucb_stops_once_the_confidence_intervals_separate():
+    strategy = LUCB(2, delta=0.05, sigma=0.1)
+    strategy.update(np.array([0, 1]), np.array([0.4, 0.6]))
+    assert not strategy.stopped()
+    while not strategy.stopped():
+        arms = np.array(strategy.next_arms())
+        strategy.update(arms, np.where(arms == 1, 0.6, 0.4))
+    means, radius = strategy.means, strategy.radius()
+    assert means[1] - radius[1] > means[0] + radius[0]
+    assert strategy.best_arm() == 1
+
+
+def test_fit_with_identification_replaces_the_exploration_phase(tmp_path):
+    config = {
+        "method": "ucb",
+        "method_params": {"alpha": 1.0},
+        "identification": {"method": "lucb", "delta": 0.05, "sigma": 0.1},
+    }
+    bandit = MultiArmedBandit(RewardGenerator(ARMS), config)
+    bandit.fit(5000)
+    assert bandit.identification["best_arm"] == "B"
+    assert bandit.trial_log.count == bandit.identification["rounds"] < 5000
+
+    save_snapshot(bandit, str(tmp_path / "bandit"))
+    restored = load_snapshot(str(tmp_path / "bandit"), RewardGenerator(ARMS))
+    assert restored.identification == bandit.identification
+
+
+def test_unknown_identification_methods_are_rejected():
+    with pytest.raises(ValueError, match="Unsupported identification method"):
+        identify_best_arm(RewardGenerator(ARMS), "racing")
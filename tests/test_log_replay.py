@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.log_replay import LogReplayRewardSource
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    # rewards are the positions of the events, so every replayed event can be identified
+    path = tmp_path / "events.csv"
+    pd.DataFrame({"arm": ["A", "B", "C"] * 10, "reward": np.arange(30.0)}).to_csv(
+        path, index=False
+    )
+    return path
+
+
+def test_replays_events_of_configured_arms_in_log_order(log_path):
+    source = LogReplayRewardSource(str(log_path), ["A", "B"], chunk_size=7, loop=False)
+    rounds, arms, rewards = source.generate_trials(4)
+    assert rounds == [0, 1, 2, 3]
+    assert arms == ["A", "B", "A", "B"]
+    assert rewards == [0.0, 1.0, 3.0, 4.0]
+    assert source.pull_arm_n_times("B", 2) == [7.0, 10.0]
+    assert source.round == 6
+
+
+def test_every_event_is_replayed_at_most_once_across_cursors(log_path):
+    source = LogReplayRewardSource(str(log_path), ["A", "B"], chunk_size=4, loop=False)
+    replayed = list(source.sample("A", 3))
+    replayed += source.generate_trials(5)[2]
+    replayed += list(source.pull_arms(["A", "B", "B"]))
+    replayed += source.generate_trials(3)[2]
+    assert len(replayed) == len(set(replayed)) == 14
+    assert source.generate_trials(0) == ([], [], [])
+
+
+def test_exhausted_log_raises_without_loop_and_restarts_with_loop(log_path):
+    source = LogReplayRewardSource(str(log_path), ["A"], loop=False)
+    source.sample("A", 10)
+    with pytest.raises(ValueError, match="exhausted"):
+        source.sample("A", 1)
+    looped = LogReplayRewardSource(str(log_path), ["A"])
+    np.testing.assert_array_equal(looped.sample("A", 12)[9:], [27.0, 0.0, 3.0])
+
+
+def test_timestamps_are_only_read_when_configured(log_path, tmp_path):
+    events = LogReplayRewardSource(str(log_path), ["A", "B"]).next_events(2)
+    assert set(events) == {"arm", "reward"}
+
+    path = tmp_path / "events.npy"
+    log = np.zeros(4, dtype=[("arm", "U1"), ("reward", float), ("timestamp", float)])
+    log["arm"], log["reward"], log["timestamp"] = ["A", "B", "A", "B"], 1.0, np.arange(4)
+    np.save(path, log)
+    source = LogReplayRewardSource(str(path), ["A", "B"], timestamp_column="timestamp")
+    np.testing.assert_array_equal(source.next_events(3)["timestamp"], [0.0, 1.0, 2.0])
+
+
+def test_unsupported_formats_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported log format"):
+        LogReplayRewardSource(str(tmp_path / "events.json"), ["A"])
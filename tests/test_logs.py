@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src.models.logs import (
+    ArrayLog,
+    BucketLog,
+    RingLog,
+    StridedLog,
+    SufficientStats,
+    create_log,
+    point_history,
+)
+
+ROWS = np.arange(100.0).reshape(50, 2)
+
+
+def test_full_log_grows_beyond_its_capacity():
+    log = ArrayLog(2, float, capacity=4)
+    log.extend(ROWS[:30])
+    for row in ROWS[30:]:
+        log.append(row)
+    np.testing.assert_array_equal(log.values, ROWS)
+    np.testing.assert_array_equal(log.last(), ROWS[-1])
+
+
+def test_ring_log_keeps_the_latest_rows():
+    log = RingLog(2, float, size=8)
+    log.extend(ROWS[:5])
+    log.extend(ROWS[5:47])
+    for row in ROWS[47:]:
+        log.append(row)
+    np.testing.assert_array_equal(log.values, ROWS[-8:])
+    np.testing.assert_array_equal(log.rounds, np.arange(42, 50))
+
+
+def test_strided_log_keeps_rows_spanning_the_history_in_bounded_memory():
+    log = StridedLog(2, float, size=8)
+    for start in range(0, 50, 7):
+        log.extend(ROWS[start : start + 7])
+    assert len(log.values) <= 8
+    assert log.stride == 8
+    np.testing.assert_array_equal(log.values, ROWS[log.rounds])
+    np.testing.assert_array_equal(log.last(), ROWS[-1])
+
+
+def test_bucket_log_keeps_bucket_means():
+    log = BucketLog(2, float, size=8)
+    log.extend(ROWS[:13])
+    for row in ROWS[13:]:
+        log.append(row)
+    assert log.width == 8
+    expected = [ROWS[start : start + 8].mean(axis=0) for start in range(0, 50, 8)]
+    np.testing.assert_allclose(log.values, expected)
+    np.testing.assert_array_equal(log.rounds, np.arange(0, 50, 8))
+
+
+def test_point_history_keeps_rows_instead_of_bucket_means():
+    assert point_history({"mode": "bucket", "size": 8}) == {"mode": "stride", "size": 8}
+    assert point_history({"mode": "ring", "size": 8}) == {"mode": "ring", "size": 8}
+    assert point_history(None) is None
+    assert isinstance(create_log(2, float, point_history({"mode": "bucket"})), StridedLog)
+
+
+def test_create_log_rejects_unknown_modes():
+    with pytest.raises(ValueError, match="Unsupported history mode"):
+        create_log(2, float, {"mode": "sample"})
+
+
+def test_sufficient_stats_match_the_rewards():
+    stats = SufficientStats(2)
+    stats.update(np.array([0, 1, 1]), np.array([1.0, 2.0, 4.0]))
+    stats.add(0, 3.0)
+    np.testing.assert_array_equal(stats.counts, [2, 2])
+    np.testing.assert_allclose(stats.means, [2.0, 3.0])
+    np.testing.assert_allclose(stats.sq_sums, [10.0, 20.0])
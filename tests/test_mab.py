@@ -0,0 +1,133 @@
+import numpy as np
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.05]},
+    "B": {"distribution": "uniform", "params": [0.6, 0.75]},
+}
+CONFIG = {"exploration_share": 0.2, "method": "epsilon_greedy", "method_params": {"epsilon": 0.1}}
+
+
+def fit_bandit(num_rounds, config=None, arms=None, chunk_size=None, seed=1):
+    bandit = MultiArmedBandit(RewardGenerator(arms or ARMS, seed=seed), config or CONFIG)
+    bandit.fit(num_rounds, chunk_size=chunk_size)
+    return bandit
+
+
+def test_chunked_fit_keeps_exact_stats_in_bounded_logs():
+    chunked = fit_bandit(5000, chunk_size=100)
+    whole = fit_bandit(5000)
+    np.testing.assert_array_equal(chunked.stats.counts, whole.stats.counts)
+    np.testing.assert_allclose(chunked.stats.sums, whole.stats.sums)
+    assert chunked.trial_log.count == 5000
+    assert len(chunked.rounds_log) <= 100
+    assert len(whole.rounds_log) == 5000
+
+
+def test_delayed_rewards_wait_in_the_queue_until_they_arrive():
+    bandit = fit_bandit(100)
+    bandit.run_n_rounds_delayed(50, {"distribution": "uniform", "params": [5.0, 10.0]})
+    assert bandit.trial_log.count == 150
+    assert 0 < len(bandit.arrival_queue) <= 10
+    assert bandit.arrival_queue.next_arrival() > bandit.clock
+    bandit.flush_feedback()
+    assert len(bandit.arrival_queue) == 0
+
+
+def test_cumulative_logs_agree_with_round_logs_and_stats():
+    bandit = fit_bandit(200)
+    bandit.run_n_rounds(50)
+    pulls = np.column_stack(list(bandit.arm_pull_cum_log.values()))
+    rewards = np.column_stack(list(bandit.arm_reward_log.values()))
+    cum_rewards = np.column_stack(list(bandit.arm_reward_cum_log.values()))
+    assert pulls.shape == (250, 2)
+    np.testing.assert_array_equal(pulls[-1], bandit.stats.counts)
+    np.testing.assert_allclose(cum_rewards, np.cumsum(rewards, axis=0))
+    arm_codes = np.array([bandit.arm_codes[arm] for arm in bandit.arms_log])
+    np.testing.assert_array_equal(np.diff(pulls, axis=0).argmax(axis=1), arm_codes[1:])
+    np.testing.assert_allclose(rewards.sum(axis=1), bandit.rewards_log)
+
+
+def test_bucket_history_never_averages_arm_codes():
+    bandit = fit_bandit(1000, config={**CONFIG, "history": {"mode": "bucket", "size": 64}})
+    bandit.run_n_rounds(100)
+    assert len(bandit.rounds_log) <= 64
+    assert set(bandit.arms_log) <= set(ARMS)
+    np.testing.assert_array_equal(bandit.stats.counts.sum(), 1100)
+    pulls = np.column_stack(list(bandit.arm_pull_cum_log.values()))
+    assert len(pulls) <= 64
+
+
+@pytest.mark.parametrize("engine", ["mabwiser", "native"])
+def test_batched_decisions_and_updates(engine):
+    bandit = fit_bandit(100, config={**CONFIG, "engine": engine})
+    arms = bandit.next_batch(16)
+    assert len(arms) == 16 and set(arms) <= set(ARMS)
+    bandit.update([], [])
+    bandit.run_n_rounds(250, update_every=32)
+    assert bandit.trial_log.count == 350
+    assert len(bandit.expectations_log["A"]) == 350
+
+
+def test_decisions_before_fit_raise():
+    bandit = MultiArmedBandit(RewardGenerator(ARMS), CONFIG)
+    with pytest.raises(ValueError, match="fit"):
+        bandit.next_batch(4)
+
+
+def expectation_matrix(bandit):
+    return np.column_stack(list(bandit.expectations_log.values()))
+
+
+def test_expectation_modes():
+    config = {"method": "ucb", "method_params": {"alpha": 1.0}, "engine": "native"}
+    every = fit_bandit(100, config=config)
+    every.run_n_rounds(50)
+    stats = fit_bandit(100, config={**config, "expectations": {"mode": "stats"}})
+    stats.run_n_rounds(50)
+    np.testing.assert_allclose(
+        expectation_matrix(stats)[100:], expectation_matrix(every)[100:], atol=1e-4
+    )
+
+    strided = fit_bandit(100, config={**config, "expectations": {"mode": "every", "every": 10}})
+    strided.run_n_rounds(50)
+    blocks = expectation_matrix(strided)[100:].reshape(5, 10, 2)
+    np.testing.assert_array_equal(blocks, np.repeat(blocks[:, :1], 10, axis=1))
+
+    off = fit_bandit(100, config={**config, "expectations": {"mode": "off"}})
+    off.run_n_rounds(50)
+    assert expectation_matrix(off).size == 0
+    with pytest.raises(ValueError, match="Unsupported expectations mode"):
+        fit_bandit(10, config={**config, "expectations": {"mode": "lazy"}})
+
+
+@pytest.mark.parametrize("update_every", [1, 16])
+def test_regret_summary_matches_a_recomputation_from_the_logs(update_every):
+    drift = [{"type": "step", "param": 0, "rounds": [150], "values": [0.6]}]
+    arms = {**ARMS, "A": {**ARMS["A"], "drift": drift}}
+    bandit = fit_bandit(100, arms=arms)
+    bandit.run_n_rounds(200, update_every=update_every)
+
+    rounds = np.arange(300)
+    means = bandit.rg.arm_means_at(rounds)
+    arm_codes = np.array([bandit.arm_codes[arm] for arm in bandit.arms_log])
+    regret = np.cumsum(means.max(axis=0) - means[arm_codes, rounds])
+    best_pulls = np.cumsum(arm_codes == means.argmax(axis=0))
+    np.testing.assert_allclose(bandit.cumulative_regret_log, regret)
+    np.testing.assert_allclose(bandit.best_arm_share_log, best_pulls / (rounds + 1))
+
+    pulls = np.column_stack(list(bandit.arm_pull_cum_log.values()))
+    best = pulls[rounds, means.argmax(axis=0)]
+    leading = best > np.sort(pulls, axis=1)[:, -2]
+    lead_round = None
+    if leading[-1]:
+        lead_round = int(np.flatnonzero(~leading)[-1]) + 1 if not leading.all() else 0
+    summary = bandit.regret_summary()
+    assert summary["rounds"] == 300 and summary["means"] == "analytic"
+    assert summary["best_arm"] == "B"
+    assert summary["cumulative_regret"] == pytest.approx(regret[-1])
+    assert summary["best_arm_share"] == pytest.approx(best_pulls[-1] / 300)
+    assert summary["lead_round"] == lead_round
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from src.models.policies import POLICIES, NativeMAB
+
+
+def test_native_mab_fits_from_scratch_and_predicts_known_arms():
+    model = NativeMAB(["A", "B"], "epsilon_greedy", {"epsilon": 0.0}, seed=0)
+    model.fit(["A", "B", "B"], [0.2, 0.9, 0.7])
+    assert model.predict() == "B"
+    assert model.predict_expectations() == pytest.approx({"A": 0.2, "B": 0.8})
+    model.fit(["A"], [1.0])
+    np.testing.assert_array_equal(model.policy.counts, [1, 0])
+
+
+def test_native_mab_rejects_unknown_methods():
+    with pytest.raises(ValueError, match="Unsupported bandit method"):
+        NativeMAB(["A", "B"], "exp3")
+
+
+@pytest.mark.parametrize(
+    "method, params",
+    [
+        ("epsilon_greedy", {"epsilon": 0.5}),
+        ("softmax", {"tau": 0.1}),
+        ("ucb", {"alpha": 1.0}),
+        ("thompson_sampling", {"threshold": 0.5}),
+    ],
+)
+def test_batched_choices_return_one_arm_per_decision(method, params):
+    policy = POLICIES[method](3, 0, **params)
+    policy.update(np.array([0, 1, 2, 2]), np.array([0.2, 0.9, 0.4, 0.6]))
+    assert policy.expectations(8).shape == (8, 3)
+    choices = policy.choose(8)
+    assert choices.shape == (8,) and set(choices) <= {0, 1, 2}
+
+
+def test_gaussian_thompson_posterior_matches_the_conjugate_update():
+    rewards = np.random.default_rng(0).normal(0.7, 0.1, size=40)
+    policy = POLICIES["gaussian_thompson"](2, 0, prior_mean=0.5, prior_count=2.0)
+    policy.update(np.zeros(30, dtype=int), rewards[:30])
+    for reward in rewards[30:]:
+        policy.update(np.array([0]), np.array([reward]))
+    means, counts, shapes, rates = policy.posterior()
+
+    n, mean = len(rewards), rewards.mean()
+    assert means[0] == pytest.approx((2.0 * 0.5 + n * mean) / (2.0 + n))
+    assert counts[0] == 2.0 + n and shapes[0] == 1.0 + n / 2
+    expected_rate = 0.01 + ((rewards - mean) ** 2).sum() / 2 + n * (mean - 0.5) ** 2 / (2.0 + n)
+    assert rates[0] == pytest.approx(expected_rate)
+    assert (means[1], counts[1], shapes[1], rates[1]) == (0.5, 2.0, 1.0, 0.01)
+    assert policy.expectations(2000)[:, 0].mean() == pytest.approx(means[0], abs=0.01)
+
+
+def test_beta_thompson_counts_fractional_rewards_as_partial_successes():
+    policy = POLICIES["beta_thompson"](2, 0, prior_alpha=2.0)
+    policy.update(np.array([0, 0, 1, 1]), np.array([0.25, 1.5, -1.0, 0.5]))
+    np.testing.assert_allclose(policy.sums, [1.25, 0.5])
+    draws = policy.expectations(20000)
+    np.testing.assert_allclose(draws.mean(axis=0), [3.25 / 5, 2.5 / 5], atol=0.01)
+
+
+def random_pulls(num, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(3, size=num), rng.random(num)
+
+
+def test_sliding_window_statistics_match_the_last_window_pulls():
+    arm_codes, rewards = random_pulls(500)
+    policy = POLICIES["sliding_window_ucb"](3, 0, window=50)
+    start = 0
+    # single pulls, batches within the window, wrapping it and longer than it
+    for size in [1, 1, 7, 30, 1, 49, 50, 120, 1, 13, 64, 1, 1]:
+        stop = start + size
+        policy.update(arm_codes[start:stop], rewards[start:stop])
+        first = max(stop - 50, 0)
+        window_codes, window_rewards = arm_codes[first:stop], rewards[first:stop]
+        np.testing.assert_array_equal(policy.counts, np.bincount(window_codes, minlength=3))
+        np.testing.assert_allclose(
+            policy.sums, np.bincount(window_codes, weights=window_rewards, minlength=3)
+        )
+        np.testing.assert_allclose(
+            policy.sq_sums, np.bincount(window_codes, weights=window_rewards**2, minlength=3)
+        )
+        start = stop
+
+
+def test_sliding_window_ucb_retries_arms_that_left_the_window():
+    policy = POLICIES["sliding_window_ucb"](2, 0, window=4)
+    policy.update(np.array([0, 1, 1, 1, 1]), np.full(5, 0.5))
+    assert policy.expectations()[0] == np.inf
+    assert policy.choose() == 0
+
+
+@pytest.mark.parametrize("gamma", [0.9, 0.5])
+def test_discounted_statistics_match_the_discounted_pulls(gamma):
+    arm_codes, rewards = random_pulls(1200)
+    policy = POLICIES["discounted_thompson"](3, 0, gamma=gamma)
+    start = 0
+    # with gamma = 0.5 the scale exceeds max_scale and is normalized every 333 rounds
+    for size in [1] * 400 + [5, 100, 1, 1, 300] + [1] * 393:
+        stop = start + size
+        policy.update(arm_codes[start:stop], rewards[start:stop])
+        start = stop
+    weights = gamma ** np.arange(start - 1, -1, -1, dtype=float)
+    np.testing.assert_allclose(policy.counts, np.bincount(arm_codes, weights, minlength=3))
+    np.testing.assert_allclose(
+        policy.sums, np.bincount(arm_codes, weights * rewards, minlength=3)
+    )
+    np.testing.assert_allclose(
+        policy.sq_sums, np.bincount(arm_codes, weights * rewards**2, minlength=3)
+    )
+    assert policy.total == pytest.approx(weights.sum())
+
+
+def test_discounted_statistics_normalize_every_log_max_scale_over_log_gamma_rounds():
+    policy = POLICIES["discounted_ucb"](2, 0, gamma=0.99)
+    normalized = []
+    for round_ in range(1, 23001):
+        policy.update(np.array([0]), np.array([1.0]))
+        if policy.scale == 1.0:
+            normalized.append(round_)
+    assert normalized == [int(np.ceil(np.log(policy.max_scale) / -np.log(0.99)))]
+    assert normalized == [22911]
+    assert policy.counts[0] == pytest.approx(100.0)
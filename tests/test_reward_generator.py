@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+
+CONFIG = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.05]},
+    "B": {"distribution": "uniform", "params": [0.6, 0.75]},
+}
+
+
+def test_sample_returns_n_rewards_of_the_arm():
+    generator = RewardGenerator(CONFIG, seed=1)
+    rewards = generator.sample("B", 1000)
+    assert rewards.shape == (1000,)
+    assert rewards.min() >= 0.6 and rewards.max() <= 0.75
+
+
+def test_sample_matches_sequential_pulls():
+    batched = RewardGenerator(CONFIG, seed=1).sample("A", 50)
+    generator = RewardGenerator(CONFIG, seed=1)
+    sequential = [generator.pull_arm("A") for _ in range(50)]
+    np.testing.assert_array_equal(batched, sequential)
+
+
+def test_sample_rejects_unknown_arm():
+    with pytest.raises(ValueError, match="not found"):
+        RewardGenerator(CONFIG).sample("C", 1)
+
+
+def test_pull_arm_n_times_advances_the_round():
+    generator = RewardGenerator(CONFIG)
+    assert len(generator.pull_arm_n_times("A", 5)) == 5
+    assert generator.round == 5
+
+
+def test_arm_streams_are_independent_of_other_arms():
+    alone = RewardGenerator(CONFIG, seed=3).pull_arm_n_times("A", 20)
+    generator = RewardGenerator(CONFIG, seed=3)
+    interleaved = []
+    for _ in range(20):
+        generator.pull_arm("B")
+        interleaved.append(generator.pull_arm("A"))
+    np.testing.assert_array_equal(alone, interleaved)
+
+
+def test_same_seed_reproduces_rewards_and_other_seeds_do_not():
+    first = RewardGenerator(CONFIG, seed=7).sample("A", 10)
+    np.testing.assert_array_equal(first, RewardGenerator(CONFIG, seed=7).sample("A", 10))
+    assert not np.array_equal(first, RewardGenerator(CONFIG, seed=8).sample("A", 10))
+
+
+def test_generate_trial_arrays_codes_index_arm_ids():
+    rounds, arm_codes, rewards, arm_ids = RewardGenerator(CONFIG).generate_trial_arrays(500)
+    np.testing.assert_array_equal(rounds, np.arange(500))
+    assert arm_ids == ["A", "B"]
+    assert set(np.unique(arm_codes)) == {0, 1}
+    uniform = rewards[arm_codes == 1]
+    assert uniform.min() >= 0.6 and uniform.max() <= 0.75
+
+
+def test_generate_trials_matches_arrays():
+    _, arm_codes, rewards, arm_ids = RewardGenerator(CONFIG).generate_trial_arrays(100)
+    rounds, arms_pulled, reward_list = RewardGenerator(CONFIG).generate_trials(100)
+    assert rounds == list(range(100))
+    assert arms_pulled == [arm_ids[code] for code in arm_codes]
+    assert reward_list == rewards.tolist()
+
+
+def test_generate_trials_of_zero_rounds_is_empty():
+    assert RewardGenerator(CONFIG).generate_trials(0) == ([], [], [])
+
+
+def test_empirical_rewards_are_bootstrap_means_served_across_bank_refills():
+    data = pd.Series(np.linspace(0.0, 1.0, 101))
+    generator = RewardGenerator(CONFIG, seed=5, data=data, bootstrap_size=50, bank_size=64)
+    rewards = np.concatenate([generator.sample("A", 40) for _ in range(5)])
+    assert rewards.shape == (200,)
+    assert abs(rewards.mean() - 0.5) < 0.05
+    assert rewards.std() < data.std()
+
+    again = RewardGenerator(CONFIG, seed=5, data=data, bootstrap_size=50, bank_size=64)
+    np.testing.assert_array_equal(rewards[:40], again.sample("A", 40))
+
+
+def test_iter_trials_chunks_concatenate_to_one_batch():
+    chunks = list(RewardGenerator(CONFIG, seed=1).iter_trials(1000, chunk_size=300))
+    assert [len(arm_codes) for arm_codes, _ in chunks] == [300, 300, 300, 100]
+    _, arm_codes, rewards, _ = RewardGenerator(CONFIG, seed=1).generate_trial_arrays(1000)
+    np.testing.assert_array_equal(np.concatenate([codes for codes, _ in chunks]), arm_codes)
+    np.testing.assert_array_equal(np.concatenate([values for _, values in chunks]), rewards)
+
+
+def test_iter_arm_advances_the_round():
+    generator = RewardGenerator(CONFIG)
+    assert [len(rewards) for rewards in generator.iter_arm("A", 25, chunk_size=10)] == [10, 10, 5]
+    assert generator.round == 25
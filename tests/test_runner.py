@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+from src.models.runner import job_seeds, run_experiments
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.05]},
+    "B": {"distribution": "uniform", "params": [0.6, 0.75]},
+}
+MAB = {"method": "ucb", "method_params": {"alpha": 1.0}}
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    jobs = [{"mab_config": MAB, "arms_config": ARMS}] * 3
+    metrics, seeds = run_experiments(jobs, 20, 30, seed=1, max_workers=1)
+    again, _ = run_experiments(jobs, 20, 30, seed=1, max_workers=2)
+    assert seeds == job_seeds(3, seed=1)
+    for name, values in metrics.items():
+        assert values.shape == (3, 50)
+        np.testing.assert_array_equal(values, again[name])
+
+    # every job matches a sequential run with its seed
+    bandit = MultiArmedBandit(RewardGenerator(ARMS, seed=seeds[2]), MAB, seeds[2])
+    bandit.fit(20)
+    bandit.run_n_rounds(30)
+    np.testing.assert_array_equal(metrics["reward"][2], bandit.rewards_log)
+    assert (metrics["regret"] >= 0).all()
+
+
+def test_identification_jobs_are_rejected():
+    mab_config = {**MAB, "identification": {"method": "lucb"}}
+    with pytest.raises(ValueError, match="identification"):
+        run_experiments([{"mab_config": mab_config, "arms_config": ARMS}], 20, 30)
@@ -0,0 +1,95 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+from src.models.service import BanditService
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.05]},
+    "B": {"distribution": "uniform", "params": [0.6, 0.75]},
+}
+
+
+@pytest.fixture
+def service():
+    bandit = MultiArmedBandit(
+        RewardGenerator(ARMS), {"method": "ucb", "method_params": {}, "engine": "native"}
+    )
+    bandit.fit(50)
+    return BanditService(bandit, max_batch=4)
+
+
+def post(service, body):
+    return service.route("POST", "/reward", json.dumps(body).encode())
+
+
+def test_decisions_and_micro_batched_updates(service):
+    assert service.route("GET", "/choose", b"")[1]["arm"] in ARMS
+    status, body = service.route("GET", "/choose?n=3", b"")
+    assert status == 200 and len(body["arms"]) == 3
+    assert post(service, {"arm": "A", "reward": 0.5}) == (200, {"pending": 1})
+    assert post(service, {"arms": ["A", "B"], "rewards": [0.1, 0.2]}) == (200, {"pending": 3})
+    counts = service.bandit.stats.counts.copy()
+    # the fourth reward reaches max_batch and triggers a single update
+    assert post(service, {"arm": "B", "reward": 1}) == (200, {"pending": 0})
+    np.testing.assert_array_equal(service.bandit.stats.counts - counts, [2, 2])
+    stats = service.route("GET", "/stats", b"")[1]
+    assert (stats["decisions"], stats["rewards"], stats["updates"]) == (4, 4, 1)
+    assert service.route("GET", "/unknown", b"")[0] == 404
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {"arm": "C", "reward": 0.5},
+        {"arms": ["A", "B"], "rewards": [0.5]},
+        {"arms": "AB", "rewards": [0.5, 0.5]},
+        {"arm": "A", "reward": float("nan")},
+        {"arm": "A", "reward": "high"},
+        {"arm": "A"},
+    ],
+)
+def test_invalid_rewards_are_rejected_without_buffering(service, body):
+    status, response = post(service, body)
+    assert status == 400 and "error" in response
+    assert service.pending_arms == [] and service.pending_rewards == []
+
+
+def test_batches_the_model_rejects_are_dropped(service, monkeypatch):
+    def reject(arms, rewards):
+        raise ValueError("rejected")
+
+    post(service, {"arm": "A", "reward": 0.5})
+    monkeypatch.setattr(service.bandit, "update", reject)
+    service.flush()
+    monkeypatch.undo()
+    post(service, {"arm": "B", "reward": 0.5})
+    service.flush()
+    stats = service.stats()
+    assert (stats["dropped"], stats["rewards"], stats["pending"]) == (1, 1, 0)
+
+
+def test_serves_http_requests(service):
+    async def exchange():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        payload = json.dumps({"arm": "A", "reward": 0.5}).encode()
+        writer.write(
+            b"POST /reward HTTP/1.1\r\nContent-Length: %d\r\nConnection: close\r\n\r\n"
+            % len(payload)
+            + payload
+        )
+        response = await reader.read()
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    head, body = asyncio.run(exchange()).split(b"\r\n\r\n", 1)
+    assert head.startswith(b"HTTP/1.1 200")
+    assert json.loads(body) == {"pending": 1}
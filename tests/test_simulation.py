@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.models.simulation import ReplicatedSimulation
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.5, 0.1]},
+    "B": {"distribution": "gauss", "params": [0.7, 0.1]},
+}
+
+
+def test_regret_curves_of_all_replications():
+    simulation = ReplicatedSimulation(
+        ARMS, {"method": "ucb", "method_params": {"alpha": 1.0}}, num_replications=200
+    )
+    result = simulation.run(500, num_fit_rounds=100, chunk_size=128)
+    assert list(result.columns) == [
+        "regret_mean", "regret_q05", "regret_q50", "regret_q95", "best_arm_share"
+    ]
+    assert len(result) == 600
+    assert (np.diff(result["regret_mean"]) >= 0).all()
+    assert (result["regret_q05"] <= result["regret_q95"]).all()
+    # uniformly random arms lose half the gap per round during exploration
+    assert result["regret_mean"].iloc[99] == pytest.approx(10.0, rel=0.1)
+    assert result["best_arm_share"].iloc[-50:].mean() > 0.9
+    np.testing.assert_allclose(simulation.final_regret.mean(), result["regret_mean"].iloc[-1])
+
+
+@pytest.mark.parametrize(
+    "method", ["epsilon_greedy", "softmax", "thompson_sampling", "gaussian_thompson"]
+)
+def test_replications_are_reproducible(method):
+    config = {"method": method}
+    first = ReplicatedSimulation(ARMS, config, num_replications=50, seed=3).run(100, 20)
+    second = ReplicatedSimulation(ARMS, config, num_replications=50, seed=3).run(100, 20)
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_unknown_methods_are_rejected():
+    with pytest.raises(ValueError, match="Unsupported bandit method"):
+        ReplicatedSimulation(ARMS, {"method": "exp3"})
+
+
+def test_non_stationary_methods_track_a_changing_best_arm():
+    drift = [{"type": "step", "param": 0, "rounds": [500], "values": [0.3]}]
+    arms = {**ARMS, "B": {**ARMS["B"], "drift": drift}}
+    regrets = {
+        method: ReplicatedSimulation(
+            arms, {"method": method, "method_params": params}, num_replications=50
+        )
+        .run(1500, 50)["regret_mean"]
+        .iloc[-1]
+        for method, params in [
+            ("ucb", {"alpha": 0.2}),
+            ("sliding_window_ucb", {"alpha": 0.2, "window": 200}),
+            ("discounted_ucb", {"alpha": 0.2, "gamma": 0.99}),
+            ("sliding_window_thompson", {"window": 200}),
+            ("discounted_thompson", {"gamma": 0.99}),
+        ]
+    }
+    for method, regret in regrets.items():
+        if method != "ucb":
+            assert regret < regrets["ucb"] / 2, method
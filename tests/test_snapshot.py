@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+from src.models.snapshot import load_snapshot, save_snapshot
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.1]},
+    "B": {"distribution": "uniform", "params": [0.55, 0.85]},
+}
+
+
+@pytest.mark.parametrize(
+    "config",
+    [
+        {"method": "epsilon_greedy", "method_params": {"epsilon": 0.2}},
+        {"method": "softmax", "method_params": {"tau": 0.1}},
+        {"method": "ucb", "method_params": {"alpha": 1.0}, "engine": "native"},
+        {"method": "gaussian_thompson"},
+    ],
+)
+def test_restored_bandit_continues_the_same_rounds(config, tmp_path):
+    bandit = MultiArmedBandit(RewardGenerator(ARMS, seed=4), config, seed=4)
+    bandit.fit(100)
+    bandit.run_n_rounds(50)
+    save_snapshot(bandit, str(tmp_path / "bandit"), history_size=20)
+
+    restored = load_snapshot(str(tmp_path / "bandit"), RewardGenerator(ARMS, seed=0))
+    assert len(restored.rounds_log) <= 20
+    np.testing.assert_array_equal(restored.stats.counts, bandit.stats.counts)
+    assert restored.regret_summary() == bandit.regret_summary()
+
+    bandit.run_n_rounds(30)
+    restored.run_n_rounds(30)
+    # the restored logs are downsampled, the statistics cover every round
+    np.testing.assert_array_equal(restored.stats.counts, bandit.stats.counts)
+    np.testing.assert_array_equal(restored.stats.sums, bandit.stats.sums)
+    assert restored.regret_summary() == bandit.regret_summary()
+    assert restored.bandit.predict_expectations() == bandit.bandit.predict_expectations()
+
+
+def test_bucketed_trial_logs_stay_categorical_after_restore(tmp_path):
+    config = {
+        "method": "ucb",
+        "method_params": {"alpha": 1.0},
+        "history": {"mode": "bucket", "size": 16},
+    }
+    bandit = MultiArmedBandit(RewardGenerator(ARMS), config)
+    bandit.fit(200)
+    save_snapshot(bandit, str(tmp_path / "bandit.npz"), history_size=8)
+    restored = load_snapshot(str(tmp_path / "bandit.npz"), RewardGenerator(ARMS))
+    restored.run_n_rounds(100)
+    assert set(restored.arms_log) <= set(ARMS)
+
+
+def test_snapshots_need_a_trained_bandit_and_matching_arms(tmp_path):
+    bandit = MultiArmedBandit(RewardGenerator(ARMS), {"method": "ucb", "method_params": {}})
+    with pytest.raises(ValueError, match="fit"):
+        save_snapshot(bandit, str(tmp_path / "bandit"))
+    bandit.fit(10)
+    save_snapshot(bandit, str(tmp_path / "bandit"))
+    other = RewardGenerator({"C": ARMS["A"], "D": ARMS["B"]})
+    with pytest.raises(ValueError, match="differ"):
+        load_snapshot(str(tmp_path / "bandit"), other)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.models import sweep as sweep_module
+from src.models.sweep import cache_key, expand_grid, source_version, sweep
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.5, 0.1]},
+    "B": {"distribution": "gauss", "params": [0.7, 0.1]},
+}
+SIZES = {"num_rounds": 50, "num_fit_rounds": 10, "num_replications": 20, "max_workers": 1}
+
+
+def test_expand_grid_lists_every_combination():
+    assert expand_grid({"alpha": [1, 2], "window": [10]}) == [
+        {"alpha": 1, "window": 10},
+        {"alpha": 2, "window": 10},
+    ]
+    assert expand_grid({}) == [{}]
+
+
+def test_cache_keys_depend_on_content_and_version_only():
+    point = {"method": "ucb", "method_params": {"alpha": 1.0}, "seed": 1}
+    reordered = {"seed": 1, "method_params": {"alpha": 1.0}, "method": "ucb"}
+    assert cache_key(point, "v1") == cache_key(reordered, "v1")
+    assert cache_key(point, "v1") != cache_key(point, "v2")
+    assert cache_key(point, "v1") != cache_key({**point, "seed": 2}, "v1")
+    assert len(source_version()) == 64
+
+
+def test_sweep_ranks_settings_and_reuses_cached_results(tmp_path, monkeypatch):
+    grids = {"ucb": {"alpha": [0.1, 1.0]}, "epsilon_greedy": {"epsilon": [0.1]}}
+    first = sweep(grids, ARMS, cache_dir=str(tmp_path), **SIZES)
+    assert len(first) == 3 and list(first.index) == [1, 2, 3]
+    assert first["regret_mean"].is_monotonic_increasing
+    assert (first["regret_ci_low"] <= first["regret_ci_high"]).all()
+    assert not first["cached"].any()
+
+    again = sweep(grids, ARMS, cache_dir=str(tmp_path), **SIZES)
+    assert again["cached"].all()
+    np.testing.assert_array_equal(again["regret_mean"], first["regret_mean"])
+
+    # results of other sources are not reused
+    monkeypatch.setattr(sweep_module, "source_version", lambda: "changed")
+    assert not sweep(grids, ARMS, cache_dir=str(tmp_path), **SIZES)["cached"].any()
+
+
+def test_sweep_validates_inputs():
+    with pytest.raises(ValueError, match="2 replications"):
+        sweep({"ucb": {}}, ARMS, cache_dir=None, **{**SIZES, "num_replications": 1})
+    empty = sweep({}, ARMS, cache_dir=None, **SIZES)
+    assert empty.empty and "regret_mean" in empty.columns
@@ -0,0 +1,67 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src.data.reward_generator import RewardGenerator
+from src.models.mab import MultiArmedBandit
+from src.models.threaded import ThreadSafeBandit, stress_test
+
+ARMS = {
+    "A": {"distribution": "gauss", "params": [0.7, 0.05]},
+    "B": {"distribution": "uniform", "params": [0.6, 0.75]},
+}
+
+
+def trained_bandit(method, engine="native"):
+    bandit = MultiArmedBandit(
+        RewardGenerator(ARMS), {"method": method, "method_params": {}, "engine": engine}
+    )
+    bandit.fit(50)
+    return bandit
+
+
+@pytest.mark.parametrize("method", ["ucb", "thompson_sampling", "gaussian_thompson"])
+def test_no_update_is_lost_under_concurrency(method):
+    bandit = trained_bandit(method)
+    result = stress_test(bandit, num_threads=4, num_rounds=500)
+    assert result["reported"] == 2000 and result["lost"] == 0
+    assert bandit.bandit.policy.counts.sum() == 2050
+
+
+def test_lost_updates_raise(monkeypatch):
+    bandit = trained_bandit("ucb")
+    monkeypatch.setattr(bandit.bandit.policy, "merge", lambda counts, sums, sq_sums: None)
+    with pytest.raises(RuntimeError, match="Updates were lost: 200 rewards"):
+        stress_test(bandit, num_threads=2, num_rounds=100)
+
+
+def test_shards_of_finished_threads_are_dropped_after_their_last_merge():
+    concurrent = ThreadSafeBandit(trained_bandit("ucb"))
+
+    def work():
+        for _ in range(10):
+            concurrent.reward(concurrent.choose(), 1.0)
+
+    for _ in range(20):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+    assert len(concurrent.shards) == 20
+    assert concurrent.merge() == 200
+    assert concurrent.shards == []
+    version, snapshot = concurrent.snapshot
+    assert version == 1
+    np.testing.assert_array_equal(snapshot.counts, concurrent.policy.counts)
+
+
+def test_only_the_native_engine_is_supported():
+    with pytest.raises(ValueError, match="native engine"):
+        ThreadSafeBandit(trained_bandit("ucb", engine="mabwiser"))
+
+
+def test_non_stationary_policies_that_cannot_merge_exactly_are_rejected():
+    with pytest.raises(ValueError, match="merge statistics"):
+        ThreadSafeBandit(trained_bandit("sliding_window_ucb"))
+    with pytest.raises(ValueError, match="not additive"):
+        stress_test(trained_bandit("discounted_ucb"), num_threads=2, num_rounds=10)